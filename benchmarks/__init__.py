@@ -0,0 +1,2 @@
+
+# 벤치마크 스크립트 패키지
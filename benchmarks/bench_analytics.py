@@ -0,0 +1,100 @@
+"""판매 분석의 실시간 집계 비용과 함대 기록 배치 집계 시간 측정.
+
+컨트롤러에 :class:`SalesAnalytics`를 붙였을 때 구매 한 번(투입, 판매, 반환)의
+추가 비용을 재고, 가상 함대의 판매 기록 파일을 만든 뒤 줄마다 파싱하는 단순
+집계와 :func:`build_report`의 묶음 파싱·다중 프로세스 집계를 비교한다. 저장소
+루트에서 ``python -m benchmarks.bench_analytics``로 실행한다.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from package.analytics import DEPOSIT, REFUND, SALE, SalesAnalytics, SalesReport, build_report
+from package.catalog import DRINK_INFOS, default_drinks
+from package.controller import Controller
+
+
+def purchase_rate(analytics: bool, sessions: int) -> float:
+    controller = Controller()
+    controller.extend_drinks(default_drinks(stock=10**9))
+    if analytics:
+        SalesAnalytics(controller)
+    drinks = controller.drinks
+    started = time.perf_counter()
+    for index in range(sessions):
+        controller.input_cash({1000: 1, 500: 1})
+        controller.dispense(drinks[index % len(drinks)])
+        controller.refund_cash()
+    return (time.perf_counter() - started) / sessions * 1e6
+
+
+def write_history(path: str, sessions: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = 1.7e9
+    with open(path, "w", encoding="utf-8") as fp:
+        for _ in range(sessions):
+            now += rng.random() * 120
+            slot = rng.randrange(len(DRINK_INFOS))
+            name, price, _ = DRINK_INFOS[slot]
+            fp.write(json.dumps([round(now, 3), DEPOSIT, None, None, 2000]) + "\n")
+            fp.write(json.dumps([round(now, 3), SALE, slot, name, price], ensure_ascii=False) + "\n")
+            fp.write(json.dumps([round(now, 3), REFUND, None, None, 2000 - price]) + "\n")
+
+
+def naive_report(paths: List[str]) -> SalesReport:
+    """줄마다 ``json.loads``를 부르는 단순 집계."""
+    report = SalesReport()
+    for path in paths:
+        with open(path, encoding="utf-8") as fp:
+            for line in fp:
+                _, kind, slot, product, amount = json.loads(line)
+                report.events += 1
+                if kind == SALE:
+                    report.add_sale(slot, product, amount)
+                elif kind == DEPOSIT:
+                    report.cash_in += amount
+                elif kind == REFUND:
+                    report.cash_out += amount
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50000, help="실시간 측정 구매 수")
+    parser.add_argument("--machines", type=int, default=16)
+    parser.add_argument("--history", type=int, default=200000, help="자판기별 기록 구매 수")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    base = purchase_rate(False, args.sessions)
+    live = purchase_rate(True, args.sessions)
+    print(f"purchase without analytics  {base:6.2f} us")
+    print(f"purchase with analytics     {live:6.2f} us  (3 windows)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"machine-{i}.jsonl") for i in range(args.machines)]
+        for seed, path in enumerate(paths):
+            write_history(path, args.history, seed)
+        size = sum(os.path.getsize(path) for path in paths)
+        events = args.machines * args.history * 3
+        print(f"fleet history               {args.machines} machines, {events:,} events, {size / 2**20:.0f} MB")
+
+        started = time.perf_counter()
+        expected = naive_report(paths)
+        print(f"naive per-line report       {time.perf_counter() - started:6.2f} s")
+
+        for processes in (1, args.processes or os.cpu_count() or 1):
+            started = time.perf_counter()
+            report = build_report(paths, processes=processes)
+            elapsed = time.perf_counter() - started
+            assert (report.sales, report.revenue, report.cash_in, report.cash_out) == (
+                expected.sales, expected.revenue, expected.cash_in, expected.cash_out)
+            print(f"build_report processes={processes:<3d} {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""제어 API 서버 부하 테스트 클라이언트.
+
+여러 개의 keep-alive HTTP 연결에서 슬롯 조회(``GET``)와 가격 변경(``PUT``)을
+섞어 보내며 초당 요청 수와 p50/p99 지연 시간을 재고, 동시에 연결한 WebSocket
+구독자들이 모든 가격 변경 알림을 받았는지와 알림 지연을 확인한다. ``--port``를
+주면 이미 실행 중인 서버(``python -m package.api``)에, 생략하면 같은 프로세스의
+작업 스레드에서 띄운 서버에 요청한다. 저장소 루트에서
+``python -m benchmarks.bench_api``로 실행한다.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from package.api import ControlServer, _read_frame
+from package.catalog import default_drinks
+from package.controller import Controller
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str,
+                  host: str, token: Optional[str], body: Optional[dict] = None) -> Tuple[int, bytes]:
+    data = json.dumps(body).encode() if body is not None else b""
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n{auth}Content-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(line.split(":")[1]) for line in lines if line.lower().startswith("content-length"))
+    return status, await reader.readexactly(length)
+
+
+async def client(host: str, port: int, token: Optional[str], deadline: float, slots: int, write_ratio: float,
+                 seed: int, latencies: List[float], sent: Dict[str, float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+    errors = 0
+    while time.perf_counter() < deadline:
+        slot = rng.randrange(slots)
+        started = time.perf_counter()
+        if rng.random() < write_ratio:
+            price = rng.randrange(500, 3000, 10)
+            # 알림 지연을 재기 위해 보낸 시각을 기록한다
+            sent[f"{slot}:{price}"] = started
+            status, _ = await request(reader, writer, "PUT", f"/slots/{slot}", host, token, {"price": price})
+        else:
+            status, _ = await request(reader, writer, "GET", f"/slots/{slot}", host, token)
+        latencies.append(time.perf_counter() - started)
+        errors += status != 200
+    writer.close()
+    return errors
+
+
+async def subscriber(host: str, port: int, token: Optional[str], sent: Dict[str, float],
+                     delays: List[float], received: List[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    writer.write(
+        f"GET /ws HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n{auth}"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    await reader.readuntil(b"\r\n\r\n")
+    index = len(received)
+    received.append(0)
+    try:
+        while True:
+            opcode, payload = await _read_frame(reader)
+            message = json.loads(payload)
+            if message["event"] == "price":
+                received[index] += 1
+                started = sent.get(f"{message['slot']}:{message['price']}")
+                if started is not None:
+                    delays.append(time.perf_counter() - started)
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+async def run(args: argparse.Namespace, port: int, slots: int) -> None:
+    latencies: List[float] = []
+    delays: List[float] = []
+    sent: Dict[str, float] = {}
+    received: List[int] = []
+    subscribers = [asyncio.ensure_future(subscriber(args.host, port, args.token, sent, delays, received))
+                   for _ in range(args.subscribers)]
+    await asyncio.sleep(0.2)
+    started = time.perf_counter()
+    deadline = started + args.duration
+    errors = await asyncio.gather(*(
+        client(args.host, port, args.token, deadline, slots, args.write_ratio, seed, latencies, sent)
+        for seed in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.5)
+    for task in subscribers:
+        task.cancel()
+    await asyncio.gather(*subscribers, return_exceptions=True)
+
+    print(f"connections        {args.connections} HTTP, {args.subscribers} WebSocket")
+    print(f"requests           {len(latencies):,} in {elapsed:.1f} s  ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"errors             {sum(errors)}")
+    print(f"latency p50 / p99  {percentile(latencies, 0.5) * 1e3:.2f} / {percentile(latencies, 0.99) * 1e3:.2f} ms")
+    if args.subscribers:
+        print(f"push per client    {min(received):,} - {max(received):,} price events ({len(sent):,} distinct writes)")
+        print(f"push p50 / p99     {percentile(delays, 0.5) * 1e3:.2f} / {percentile(delays, 0.99) * 1e3:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="실행 중인 서버 포트. 생략하면 서버를 직접 띄운다")
+    parser.add_argument("--token")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--subscribers", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="요청 중 가격 변경 비율")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    slots = 24
+    if port is None:
+        controller = Controller()
+        controller.extend_drinks(default_drinks(slots))
+        server = ControlServer(controller, args.host, 0, args.token).start()
+        port = server.port
+    try:
+        asyncio.run(run(args, port, slots))
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""카드 승인 캐시의 적중률과 구매당 승인 대기 시간 측정.
+
+몇 장의 사원증이 번갈아 음료를 사는 상황을 흉내 내어, 승인 캐시 없이 매번
+백엔드에 묻는 경우와 :class:`ApprovalCache`를 쓰는 경우의 구매당 승인 대기
+시간과 적중률을 비교한다. 도중에 카드 하나를 차단하여 그 카드의 캐시 항목이
+즉시 지워지는지도 확인하며, 차단된 카드는 이후 삽입이 거부된 것으로 본다.
+저장소 루트에서 ``python -m benchmarks.bench_approvals``로 실행한다.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional
+
+from package.auth import ApprovalCache, AuthPipeline, AuthResult, StubAuthorizer
+from package.controller import Controller
+
+
+def purchase(pipeline: AuthPipeline, number: str, amount: int) -> AuthResult:
+    """승인 결과가 나올 때까지 화면 스레드처럼 ``poll``을 반복한다."""
+    results: List[AuthResult] = []
+    pipeline.submit(number, amount, results.append)
+    pipeline.poll()
+    while not results:
+        time.sleep(0.001)
+        pipeline.poll()
+    return results[0]
+
+
+def run(args: argparse.Namespace, cache: Optional[ApprovalCache]) -> float:
+    controller = Controller()
+    if cache is not None:
+        cache.watch(controller)
+    pipeline = AuthPipeline(StubAuthorizer(latency=(args.latency * 0.5, args.latency * 1.5), seed=0), cache=cache)
+    rng = random.Random(args.seed)
+    cards = [f"CARD{index:06d}" for index in range(args.cards)]
+    denied = cards[0]
+    waited = 0.0
+    purchases = 0
+    try:
+        for index in range(args.purchases):
+            if index == args.purchases // 2:
+                purchase(pipeline, denied, 0)
+                controller.deny_card(denied)
+                if cache is not None and cache.invalidate(denied):
+                    print("차단된 카드의 승인이 캐시에 남아 있습니다", file=sys.stderr)
+                    sys.exit(1)
+            # 자주 오는 사람이 더 자주 산다
+            number = cards[min(int(rng.expovariate(1 / (args.cards / 4))), args.cards - 1)]
+            if number in (controller.card.denied or ()):
+                continue
+            started = time.perf_counter()
+            purchase(pipeline, number, rng.choice((800, 1200, 1500)))
+            waited += time.perf_counter() - started
+            purchases += 1
+    finally:
+        pipeline.shutdown()
+    return waited / purchases * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--purchases", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.03, help="평균 승인 지연(초)")
+    parser.add_argument("--ttl", type=float, default=300.0)
+    parser.add_argument("--spend-limit", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base = run(args, None)
+    print(f"no cache     {base:8.2f} ms per purchase")
+    cache = ApprovalCache(ttl=args.ttl, spend_limit=args.spend_limit)
+    cached = run(args, cache)
+    stats = cache.stats()
+    print(f"with cache   {cached:8.2f} ms per purchase   hit rate {stats['hit_rate']:.1%} "
+          f"({stats['hits']} hits, {stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""카탈로그 적재 방식과 변경분 재적용 비용 비교.
+
+큰 CSV 카탈로그를 ``add_drinks``로 한 줄씩 넣을 때와 :func:`iter_catalog`를
+``extend_drinks``로 한 번에 넣을 때의 시간, 그리고 일부 행만 바뀐 카탈로그를
+:func:`apply_catalog`로 다시 적용할 때의 시간과 알림 수를 잰다. 저장소
+루트에서 ``python -m benchmarks.bench_catalog``로 실행한다.
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from package.catalog import DRINK_INFOS, apply_catalog, iter_catalog
+from package.controller import Controller
+
+
+def write_catalog(path: str, slots: int, changed_every: int = 0) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp, lineterminator="\n")
+        writer.writerow(["name", "price", "count", "image_path"])
+        for slot in range(slots):
+            name, price, image = DRINK_INFOS[slot % len(DRINK_INFOS)]
+            if changed_every and slot % changed_every == 0:
+                price += 100
+            writer.writerow([name, price, 10, image])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=100000)
+    parser.add_argument("--changed-every", type=int, default=100, help="가격을 바꿀 행 간격")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.csv")
+        write_catalog(path, args.slots)
+
+        events = []
+        controller = Controller()
+        controller.subscribe(lambda event, payload: events.append(event))
+        started = time.perf_counter()
+        for drink in iter_catalog(path):
+            controller.add_drinks(drink)
+        one_by_one = time.perf_counter() - started
+        per_row_events = len(events)
+
+        events.clear()
+        controller = Controller()
+        controller.subscribe(lambda event, payload: events.append(event))
+        started = time.perf_counter()
+        controller.extend_drinks(iter_catalog(path))
+        bulk = time.perf_counter() - started
+        bulk_events = len(events)
+
+        write_catalog(path, args.slots, args.changed_every)
+        events.clear()
+        started = time.perf_counter()
+        diff = apply_catalog(controller, iter_catalog(path))
+        reload = time.perf_counter() - started
+
+    print(f"slots                   {args.slots}")
+    print(f"add_drinks per row      {one_by_one * 1e3:8.1f} ms  ({per_row_events} events)")
+    print(f"extend_drinks           {bulk * 1e3:8.1f} ms  ({bulk_events} events)")
+    print(f"apply_catalog (diff)    {reload * 1e3:8.1f} ms  ({len(events)} events, {len(diff.repriced)} repriced)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""거스름돈 계산 마이크로벤치마크.
+
+기존 탐욕 방식과 :func:`package.change.make_change`의 실행 시간을 비교하고,
+동전 투입마다 잔돈 없음 여부를 확인하는 비용을 측정한다. 완전 탐색과의
+비교는 ``tests/test_change.py``에 있다. 저장소 루트에서
+``python -m benchmarks.bench_change``로 실행한다.
+"""
+import argparse
+import timeit
+from typing import Dict
+
+from package.change import make_change
+from package.controller import Controller
+from package.drink import Drink
+
+
+def greedy_refund(amount: int, cashes: Dict[int, int]) -> Dict[int, int]:
+    """기존 ``Controller.refund_cash``의 탐욕 알고리즘."""
+    cashes = dict(cashes)
+    refunds: Dict[int, int] = {}
+    for currency in sorted(cashes.keys(), reverse=True):
+        while cashes[currency] > 0 and amount >= currency:
+            cashes[currency] -= 1
+            refunds[currency] = refunds.get(currency, 0) + 1
+            amount -= currency
+    return refunds
+
+
+def bench_feasibility(number: int) -> None:
+    """동전 한 개 투입 후 모든 음료의 잔돈 없음 여부를 확인하는 시간을 잰다."""
+    currencies = [5000, 1000, 500, 100, 50, 10]
+    controller = Controller()
+    for currency in currencies:
+        controller.set_cash(currency, 5000)
+    for slot in range(24):
+        controller.add_drinks(Drink(f"drink{slot}", 800 + 50 * slot, 10, ""))
+
+    def insert_and_check() -> None:
+        controller.input_cash({50: 1})
+        for drink in controller.drinks:
+            controller.exact_change_only(drink)
+
+    elapsed = timeit.timeit(insert_and_check, number=number)
+    print(
+        f"{'coin insert + 24 checks':24s} {elapsed / number * 1e6:8.1f} us"
+        f"   ({len(currencies)} denominations, 5000 coins each)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = {
+        "default float, 3750": (3750, {1000: 10, 500: 10, 100: 10, 50: 10}),
+        "large float, 9950": (9950, {1000: 5000, 500: 5000, 100: 5000, 50: 5000}),
+        "no 100s, 1300": (1300, {1000: 1, 500: 0, 100: 0, 50: 30}),
+        "non-multiple units, 600": (600, {500: 5, 300: 5, 200: 5}),
+    }
+    for name, (amount, cashes) in cases.items():
+        greedy = timeit.timeit(lambda: greedy_refund(amount, cashes), number=args.number)
+        solver = timeit.timeit(lambda: make_change(amount, cashes), number=args.number)
+        print(
+            f"{name:24s} greedy {greedy / args.number * 1e6:8.1f} us"
+            f"   make_change {solver / args.number * 1e6:8.1f} us"
+        )
+    bench_feasibility(args.number)
+
+
+if __name__ == "__main__":
+    main()
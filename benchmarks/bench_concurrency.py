@@ -0,0 +1,146 @@
+"""여러 입력 장치 스레드가 한 컨트롤러를 동시에 쓰는 스트레스 테스트와 처리량 비교.
+
+동전 투입 스레드, 구매 스레드, 반환 스레드를 함께 돌린 뒤 돈과 재고가 보존되는지
+확인한다. 시재 총액은 처음 시재 + 투입 - 반환, 남은 투입 금액은 투입 - 반환 -
+판매 금액, 재고 감소량은 판매 수와 같아야 한다. ``unlocked`` 행은 잠금을 빈
+컨텍스트로 바꾸어 이전의 동기화 없는 컨트롤러를 흉내 낸다. 보존 법칙이 깨지면
+종료 코드 1로 끝난다. 저장소 루트에서 ``python -m benchmarks.bench_concurrency``로
+실행한다.
+"""
+import argparse
+import contextlib
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from package.catalog import default_drinks
+from package.controller import Controller
+
+COINS = (1000, 500, 100, 50)
+
+
+def make_controller(stock: int, locked: bool) -> Controller:
+    controller = Controller()
+    for currency in COINS:
+        controller.set_cash(currency, 1000)
+    controller.extend_drinks(default_drinks(stock=stock))
+    if not locked:
+        controller.lock = contextlib.nullcontext()  # type: ignore[assignment]
+    return controller
+
+
+def run(controller: Controller, producers: int, operations: int, seed: int) -> Dict[str, int]:
+    """장치 스레드를 실행하고 스레드별 집계를 합쳐 반환한다."""
+    totals: List[Dict[str, int]] = []
+    start = threading.Barrier(producers * 3)
+
+    def coin_acceptor(rng: random.Random, tally: Dict[str, int]) -> None:
+        start.wait()
+        for _ in range(operations):
+            currency = rng.choice(COINS)
+            controller.input_cash({currency: 1})
+            tally["inserted"] += currency
+
+    def buyer(rng: random.Random, tally: Dict[str, int]) -> None:
+        start.wait()
+        drinks = controller.drinks
+        for _ in range(operations):
+            drink = drinks[rng.randrange(len(drinks))]
+            if controller.dispense(drink) == "음료 제공":
+                tally["sold"] += 1
+                tally["revenue"] += drink.price
+
+    def refunder(rng: random.Random, tally: Dict[str, int]) -> None:
+        start.wait()
+        for _ in range(operations // 20):
+            coins = controller.refund_cash()
+            tally["refunded"] += sum(currency * count for currency, count in coins.items())
+
+    threads = []
+    for index in range(producers):
+        for offset, target in enumerate((coin_acceptor, buyer, refunder)):
+            tally = {"inserted": 0, "sold": 0, "revenue": 0, "refunded": 0}
+            totals.append(tally)
+            rng = random.Random(seed + index * 3 + offset)
+            threads.append(threading.Thread(target=target, args=(rng, tally)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: sum(tally[key] for tally in totals) for key in totals[0]}
+
+
+def violations(controller: Controller, totals: Dict[str, int], cash: int, stock: int) -> List[str]:
+    found = []
+    held = sum(currency * count for currency, count in controller.cashes.items())
+    if held != cash + totals["inserted"] - totals["refunded"]:
+        found.append(f"시재 {held} != {cash + totals['inserted'] - totals['refunded']}")
+    credit = totals["inserted"] - totals["refunded"] - totals["revenue"]
+    if controller.inserted_cash != credit or controller.inserted_cash < 0:
+        found.append(f"투입 금액 {controller.inserted_cash} != {credit}")
+    sold = stock - sum(controller.drinks.counts)
+    if sold != totals["sold"]:
+        found.append(f"판매 수 {sold} != {totals['sold']}")
+    for product in controller.products.products():
+        counted = sum(controller.drinks.counts[slot] for slot in controller.products.slots_of(product))
+        if controller.products.stock(product) != counted:
+            found.append(f"{product} 총 재고 {controller.products.stock(product)} != {counted}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--producers", type=int, default=4, help="장치 묶음(투입·구매·반환 스레드) 수")
+    parser.add_argument("--operations", type=int, default=20000, help="스레드당 연산 수")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--switch-interval", type=float, default=1e-6,
+                        help="경쟁 상태가 잘 드러나도록 줄인 스레드 전환 간격(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failed = False
+    single = {}
+    for label, locked in (("unlocked", False), ("locked", True)):
+        controller = make_controller(10**9, locked)
+        drinks = controller.drinks
+        started = time.perf_counter()
+        for index in range(args.operations):
+            controller.input_cash({1000: 1})
+            controller.dispense(drinks[index % len(drinks)])
+        single[label] = 2 * args.operations / (time.perf_counter() - started)
+    print(f"single thread  unlocked {single['unlocked']:>10,.0f} ops/s   locked {single['locked']:>10,.0f} ops/s")
+
+    default_interval = sys.getswitchinterval()
+    sys.setswitchinterval(args.switch_interval)
+    try:
+        for label, locked in (("unlocked", False), ("locked", True)):
+            broken = 0
+            rates = []
+            for round_ in range(args.rounds):
+                stock = 10**6
+                controller = make_controller(stock, locked)
+                cash = sum(currency * count for currency, count in controller.cashes.items())
+                stock *= len(controller.drinks)
+                started = time.perf_counter()
+                totals = run(controller, args.producers, args.operations, args.seed + round_)
+                elapsed = time.perf_counter() - started
+                operations = args.producers * (2 * args.operations + args.operations // 20)
+                rates.append(operations / elapsed)
+                found = violations(controller, totals, cash, stock)
+                if found:
+                    broken += 1
+                    print(f"  {label} round {round_}: {'; '.join(found[:3])}")
+            print(f"{args.producers * 3:2d} threads     {label:8s} {max(rates):>10,.0f} ops/s   "
+                  f"conservation broken in {broken}/{args.rounds} rounds")
+            if locked and broken:
+                failed = True
+    finally:
+        sys.setswitchinterval(default_interval)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
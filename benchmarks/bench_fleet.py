@@ -0,0 +1,37 @@
+"""함대 재생 처리량 벤치마크.
+
+같은 가상 함대를 프로세스 수를 바꿔가며 재생하고 초당 이벤트 수와 단일
+프로세스 대비 배율을 출력한다. 저장소 루트에서
+``python -m benchmarks.bench_fleet``으로 실행한다.
+"""
+import argparse
+import os
+import time
+
+from package.fleet import MachineJob, run_fleet
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=64)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = [MachineJob(i, sessions=args.sessions, seed=i) for i in range(args.machines)]
+    counts = sorted({1, 2, 4, 8, 16, 32, args.max_processes})
+    single = None
+    for processes in (n for n in counts if n <= args.max_processes):
+        started = time.perf_counter()
+        report = run_fleet(jobs, processes)
+        elapsed = time.perf_counter() - started
+        rate = report.events / elapsed
+        single = single or rate
+        print(
+            f"processes={processes:3d}  {report.events} events in {elapsed:6.2f}s"
+            f"  {rate:12,.0f} events/s  x{rate / single:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
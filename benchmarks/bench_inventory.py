@@ -0,0 +1,67 @@
+"""``List[Drink]``와 :class:`package.inventory.Inventory`의 메모리와 일괄 연산 비교.
+
+저장소 루트에서 ``python -m benchmarks.bench_inventory``로 실행한다.
+"""
+import argparse
+import sys
+import timeit
+
+from package.catalog import default_drinks
+from package.drink import Drink
+from package.inventory import Inventory
+
+
+def deep_size(drinks) -> int:
+    # 문자열은 카탈로그와 공유되므로 세지 않는다
+    size = sys.getsizeof(drinks)
+    for drink in drinks:
+        size += sys.getsizeof(drink) + sys.getsizeof(drink.__dict__)
+        size += sys.getsizeof(drink.count) + sys.getsizeof(drink.price)
+    return size
+
+
+def inventory_size(inventory: Inventory) -> int:
+    arrays = (inventory.counts, inventory.prices, inventory._name_ids, inventory._image_ids)
+    views = sys.getsizeof(inventory._views) + sum(sys.getsizeof(view) for view in inventory)
+    return sum(sys.getsizeof(values) for values in arrays) + views
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=100000)
+    args = parser.parse_args()
+
+    catalog = default_drinks()
+    drinks = [Drink(d.name, d.price, d.count, d.image_path)
+              for d in (catalog[i % len(catalog)] for i in range(args.slots))]
+    inventory = Inventory(drinks)
+
+    print(f"slots                      {args.slots}")
+    print(f"List[Drink] bytes          {deep_size(drinks):,}")
+    print(f"Inventory bytes            {inventory_size(inventory):,}")
+
+    def restock_list() -> None:
+        for drink in drinks:
+            drink.count = 10
+
+    def empty_list() -> None:
+        [slot for slot, drink in enumerate(drinks) if drink.count <= 0]
+
+    subset = range(0, args.slots, 3)
+
+    def reprice_list() -> None:
+        for slot in subset:
+            drinks[slot].price = 900
+
+    for label, list_op, inventory_op in (
+        ("restock all", restock_list, lambda: inventory.restock_all(10)),
+        ("reprice 1/3", reprice_list, lambda: inventory.set_prices(subset, 900)),
+        ("empty slots", empty_list, inventory.empty_slots),
+    ):
+        base = min(timeit.repeat(list_op, number=5, repeat=3)) / 5 * 1e3
+        fast = min(timeit.repeat(inventory_op, number=5, repeat=3)) / 5 * 1e3
+        print(f"{label:12s} list {base:8.2f} ms   inventory {fast:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""트랜잭션 로그 오버헤드와 복구 시간 벤치마크.
+
+같은 가상 세션을 로그 없이, 그리고 :class:`package.journal.Journal`을 붙여
+재생하여 이벤트당 추가 비용을 비교하고, ``--records``개의 레코드가 쌓인 로그를
+:func:`package.journal.recover`로 복구하는 시간을 잰다. 저장소 루트에서
+``python -m benchmarks.bench_journal``로 실행한다.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.engine import Engine
+from package.fleet import synthetic_sessions
+from package.journal import JOURNAL_FILE, Journal, recover
+
+
+def make_controller() -> Controller:
+    controller = Controller()
+    for drink in default_drinks(stock=10**6):
+        controller.add_drinks(drink)
+    return controller
+
+
+def bench_overhead(sessions: int, directory: str) -> None:
+    plain = Engine(make_controller())
+    started = time.perf_counter()
+    events = sum(plain.replay(synthetic_sessions(0, sessions, 24)).values())
+    base = time.perf_counter() - started
+
+    controller = make_controller()
+    journal = Journal(controller, directory, snapshot_every=100000)
+    engine = Engine(controller)
+    started = time.perf_counter()
+    engine.replay(synthetic_sessions(0, sessions, 24))
+    hot = time.perf_counter() - started
+    journal.flush()
+    durable = time.perf_counter() - started
+    journal.close()
+
+    print(f"events                 {events}")
+    print(f"without journal        {base / events * 1e6:8.2f} us/event")
+    print(f"with journal (hot)     {hot / events * 1e6:8.2f} us/event")
+    print(f"with journal (synced)  {durable / events * 1e6:8.2f} us/event")
+
+
+def bench_recovery(records: int, directory: str) -> None:
+    path = os.path.join(directory, JOURNAL_FILE)
+    cashes = {"1000": 10, "500": 10, "100": 10, "50": 10}
+    with open(path, "w", encoding="utf-8") as fp:
+        for seq in range(1, records + 1):
+            if seq % 2:
+                record = {"t": "c", "c": cashes, "i": seq % 3000, "q": seq}
+            else:
+                record = {"t": "s", "s": seq % 24, "n": seq % 10, "q": seq}
+            fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+    size = os.path.getsize(path)
+
+    controller = make_controller()
+    started = time.perf_counter()
+    seq = recover(controller, directory)
+    elapsed = time.perf_counter() - started
+    print(f"recovered {seq} records ({size / 1e6:.1f} MB) in {elapsed:.2f}s"
+          f"  ({records / elapsed:,.0f} records/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--records", type=int, default=2_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        bench_overhead(args.sessions, directory)
+    with tempfile.TemporaryDirectory() as directory:
+        bench_recovery(args.records, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""음료 칸 렌더러 벤치마크.
+
+버튼 렌더러와 캔버스 렌더러로 같은 자판기 화면을 띄우고, 페이지 전체를 다시
+그리는 시간(페이지 넘김)과 슬롯 하나의 가격이 바뀌었을 때 그 칸만 갱신하는
+시간을 잰다. 두 측정 모두 Tk가 화면을 다시 그리는 ``update_idletasks``까지
+포함한다. 스프라이트 아틀라스를 새로 만드는 시간과 저장된 파일을 읽는 시간도
+함께 잰다. 화면이 없으면 렌더러 측정은 건너뛴다.
+
+저장소 루트에서 ``python -m benchmarks.bench_render``로 실행한다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.run import measure, virtual_display
+from package.atlas import SpriteAtlas, sources_in
+from package.catalog import default_drinks
+from package.slot_grid import RENDERERS
+
+
+def bench_atlas(path: str, number: int) -> None:
+    sources = sources_in("src/drinks")
+    started = time.perf_counter()
+    SpriteAtlas.build(sources).save(path)
+    print(f"atlas build           {(time.perf_counter() - started) * 1e3:8.1f} ms  ({len(sources)} images)")
+    load = measure(lambda: SpriteAtlas.load(path).is_fresh(sources), number)
+    print(f"atlas load            {load / 1e3:8.2f} ms")
+
+
+def bench_renderer(renderer: str, atlas: SpriteAtlas, slots: int, number: int, display: str) -> None:
+    import tkinter as tk
+
+    from package.machine import Machine
+
+    root = tk.Tk(screenName=display)
+    try:
+        machine = Machine(root, renderer=renderer, atlas=atlas)
+        machine.controller.extend_drinks(default_drinks(slots, stock=10**9))
+        machine.refresh_gui()
+        root.update()
+
+        def turn_page() -> None:
+            machine.show_page((machine.page + 1) % machine.page_count())
+            root.update_idletasks()
+
+        drink = machine.controller.drinks[0]
+        prices = [drink.price, drink.price + 100]
+
+        def change_price() -> None:
+            prices.reverse()
+            # 가격 알림이 on_change를 거쳐 그 칸만 갱신한다
+            machine.controller.set_price(drink, prices[0])
+            root.update_idletasks()
+
+        full = measure(turn_page, number, repeat=3)
+        single = measure(change_price, number, repeat=3)
+        print(f"{renderer:8s} full redraw  {full:9.1f} us   single-slot update {single:8.1f} us")
+    finally:
+        root.destroy()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=48, help="페이지 넘김이 모든 칸을 바꾸도록 두 페이지 분량")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "drinks.atlas")
+        bench_atlas(path, args.number)
+        atlas = SpriteAtlas.load(path)
+
+    with virtual_display() as display:
+        if not display:
+            print("화면이 없어 렌더러 측정을 건너뜁니다 (Xvfb 또는 DISPLAY 필요).", file=sys.stderr)
+            return 0
+        for renderer in RENDERERS:
+            bench_renderer(renderer, atlas, args.slots, args.number, display)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
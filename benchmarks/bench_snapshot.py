@@ -0,0 +1,139 @@
+"""이진 상태 스냅샷의 복원 속도 벤치마크.
+
+서로 다른 재고, 가격, 시재를 가진 자판기 수천 대의 상태를 파일로 저장한 뒤,
+JSON 상태 파일을 읽어 음료와 시재를 하나씩 다시 넣는 방식과 이진 스냅샷을
+메모리 매핑하여 복제하는 방식의 복원 시간을 비교한다. 같은 초기 상태에서
+함대를 만드는 경우(기본 음료를 하나씩 추가 vs 스냅샷 하나를 반복 복제)도 잰다.
+복원 결과가 원래 상태와 같은지도 확인한다.
+
+저장소 루트에서 ``python -m benchmarks.bench_snapshot``으로 실행한다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.drink import Drink
+from package.snapshot import Snapshot
+
+
+def make_machine(rng: random.Random, slots: int) -> Controller:
+    """재고, 가격, 시재가 제각각인 자판기 하나를 만든다."""
+    controller = Controller()
+    drinks = default_drinks(slots)
+    for drink in drinks:
+        drink.count = rng.randrange(0, 20)
+        drink.price += rng.choice((0, 100, 200))
+    controller.extend_drinks(drinks)
+    for currency in list(controller.cashes):
+        controller.set_cash(currency, rng.randrange(0, 50))
+    controller.inserted_cash = rng.choice((0, 0, 500, 1000))
+    return controller
+
+
+def state_of(controller: Controller) -> Dict[str, Any]:
+    return {
+        "cashes": {str(currency): count for currency, count in controller.cashes.items()},
+        "inserted": controller.inserted_cash,
+        "slots": [[d.name, d.price, d.count, d.image_path] for d in controller.drinks],
+    }
+
+
+def rebuild(path: str) -> Controller:
+    """JSON 상태 파일로 컨트롤러를 음료 하나, 화폐 하나씩 다시 만든다."""
+    with open(path, encoding="utf-8") as fp:
+        state = json.load(fp)
+    controller = Controller()
+    for name, price, count, image_path in state["slots"]:
+        controller.add_drinks(Drink(name, price, count, image_path))
+    for currency, count in state["cashes"].items():
+        controller.set_cash(int(currency), count)
+    controller.set_inserted_cash(state["inserted"])
+    return controller
+
+
+def restore(path: str) -> Controller:
+    """이진 스냅샷을 메모리 매핑하여 컨트롤러를 복제한다."""
+    with Snapshot.load(path) as snapshot:
+        return snapshot.clone()
+
+
+def timed(label: str, func: Callable[[], List[Controller]], machines: int) -> float:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:28s} {elapsed * 1e3:9.1f} ms  {elapsed / machines * 1e6:8.1f} us per machine")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=5000)
+    parser.add_argument("--slots", type=int, default=48)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    machines = [make_machine(rng, args.slots) for _ in range(args.machines)]
+    expected = [state_of(controller) for controller in machines]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_paths = []
+        snapshot_paths = []
+        json_bytes = snapshot_bytes = 0
+        started = time.perf_counter()
+        for index, controller in enumerate(machines):
+            path = os.path.join(directory, f"{index}.snap")
+            snapshot_bytes += Snapshot.save(controller, path)
+            snapshot_paths.append(path)
+        saved = time.perf_counter() - started
+        for index, state in enumerate(expected):
+            path = os.path.join(directory, f"{index}.json")
+            with open(path, "w", encoding="utf-8") as fp:
+                json.dump(state, fp, ensure_ascii=False)
+            json_bytes += os.path.getsize(path)
+            json_paths.append(path)
+        print(f"{args.machines} machines x {args.slots} slots")
+        print(f"snapshot save               {saved * 1e3:9.1f} ms  "
+              f"{snapshot_bytes / args.machines:8.0f} B per machine (JSON {json_bytes / args.machines:.0f} B)")
+
+        rebuilt: List[Controller] = []
+        restored: List[Controller] = []
+        slow = timed("rebuild from JSON", lambda: rebuilt.extend(rebuild(p) for p in json_paths), args.machines)
+        fast = timed("restore from snapshot", lambda: restored.extend(restore(p) for p in snapshot_paths),
+                     args.machines)
+        print(f"{'speedup':28s} {slow / fast:9.1f}x")
+
+    for state, a, b in zip(expected, rebuilt, restored):
+        if not state == state_of(a) == state_of(b):
+            print("복원한 상태가 원래 상태와 다릅니다", file=sys.stderr)
+            return 1
+        if a.products.stock(a.drinks[0].name) != b.products.stock(b.drinks[0].name):
+            print("복원한 상품 재고가 다릅니다", file=sys.stderr)
+            return 1
+
+    def add_one_by_one() -> List[Controller]:
+        fleet = []
+        for _ in range(args.machines):
+            controller = Controller()
+            for drink in default_drinks(args.slots):
+                controller.add_drinks(drink)
+            fleet.append(controller)
+        return fleet
+
+    base = Snapshot.of(machines[0])
+    print()
+    slow = timed("fleet: add drinks one by one", add_one_by_one, args.machines)
+    fast = timed("fleet: clone one snapshot", lambda: [base.clone() for _ in range(args.machines)], args.machines)
+    print(f"{'speedup':28s} {slow / fast:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
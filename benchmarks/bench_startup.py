@@ -0,0 +1,111 @@
+"""시작 시간 벤치마크.
+
+``package.machine`` 가져오기 시간, 음료 이미지 준비 시간(원본 디코딩 대
+썸네일 묶음)과 첫 화면까지 걸리는 시간(새 프로세스 시작부터 첫 ``update``
+까지)을 썸네일 묶음이 없을 때(cold)와 있을 때(warm)로 나누어 잰다. warm
+첫 화면 시간이 ``--budget-ms``를 넘으면 0이 아닌 종료 코드로 끝난다. 화면이
+없으면 첫 화면 측정은 건너뛴다.
+
+저장소 루트에서 ``python -m benchmarks.bench_startup``으로 실행한다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from benchmarks.run import virtual_display
+from package.catalog import default_drinks
+from package.thumbnails import SIZES, ThumbnailStore, render
+
+IMPORT_SCRIPT = """
+import time
+started = time.perf_counter()
+import package.machine
+print(time.perf_counter() - started)
+"""
+
+# main.py와 같은 순서로 첫 화면을 그린 뒤 종료한다
+FIRST_FRAME_SCRIPT = """
+import sys
+import tkinter as tk
+from package.catalog import default_drinks
+from package.image_cache import ImageCache
+from package.machine import Machine
+from package.thumbnails import ThumbnailStore
+
+root = tk.Tk()
+machine = Machine(root, image_cache=ImageCache(thumbnails=ThumbnailStore(sys.argv[1])))
+for drink in default_drinks():
+    machine.controller.add_drinks(drink)
+machine.refresh_gui()
+root.update()
+machine.image_cache.flush()
+root.destroy()
+"""
+
+
+def run_python(script: str, *args: str, display: Optional[str] = None) -> float:
+    env = {**os.environ, "DISPLAY": display} if display else None
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", script, *args], check=True, capture_output=True, text=True, env=env
+    ).stdout
+    elapsed = time.perf_counter() - started
+    return float(output) if output.strip() else elapsed
+
+
+def median(values: List[float]) -> float:
+    return sorted(values)[len(values) // 2]
+
+
+def bench_images(path: str) -> None:
+    sources = sorted({drink.image_path for drink in default_drinks()} | {"src/drinks/keyhole.png"})
+    started = time.perf_counter()
+    store = ThumbnailStore(path)
+    for source in sources:
+        for size in SIZES:
+            store.put(source, size, render(source, size))
+    cold = time.perf_counter() - started
+    store.save()
+
+    started = time.perf_counter()
+    store = ThumbnailStore(path)
+    for source in sources:
+        for size in SIZES:
+            assert store.get(source, size) is not None
+    warm = time.perf_counter() - started
+    print(f"images  decode+resize {cold * 1e3:8.1f} ms   thumbnail pack {warm * 1e3:8.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="자판기 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="warm 첫 화면 시간 상한")
+    args = parser.parse_args()
+
+    imports = [run_python(IMPORT_SCRIPT) for _ in range(args.repeat)]
+    print(f"import  package.machine {median(imports) * 1e3:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_images(os.path.join(directory, "images.pack"))
+
+    with virtual_display() as display:
+        if not display:
+            print("화면이 없어 첫 화면 측정을 건너뜁니다 (Xvfb 또는 DISPLAY 필요).", file=sys.stderr)
+            return 0
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "thumbnails.pack")
+                cold.append(run_python(FIRST_FRAME_SCRIPT, path, display=display))
+                warm.append(run_python(FIRST_FRAME_SCRIPT, path, display=display))
+    print(f"first frame  cold {median(cold) * 1e3:8.1f} ms   warm {median(warm) * 1e3:8.1f} ms"
+          f"   (budget {args.budget_ms:.0f} ms)")
+    return 0 if median(warm) * 1e3 <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""자판기 핵심 경로 벤치마크 모음.
+
+컨트롤러(``input_cash``, ``refund_cash``, ``dispense``), 카드(``insert_card``)와
+화면(``load_image``, ``build_frame``, ``refresh_gui``, ``show_page``,
+``admin_menu``)의 연산당 시간을 음료 수와 시재 크기를 바꿔가며 측정한다. 결과를 JSON으로 저장하고 기준 결과와 비교하여
+허용 비율보다 느려진(또는 위젯 생성 수가 늘어난) 항목이 있으면 0이 아닌 종료
+코드로 끝난다. 시간 항목의 단위는 마이크로초이다.
+
+기준 결과는 측정 환경마다 다르므로 같은 장비에서
+``python -m benchmarks.run --baseline baseline.json --save-baseline``으로 먼저
+저장한 뒤 ``--baseline baseline.json``으로 비교한다.
+
+저장소 루트에서 ``python -m benchmarks.run``으로 실행한다. 화면 벤치마크는
+``DISPLAY``가 없으면 빈 번호로 ``Xvfb``를 띄워 가상 화면에서 실행하며, 둘 다
+없으면 건너뛴다.
+"""
+import argparse
+import json
+import os
+import platform
+import select
+import shutil
+import subprocess
+import sys
+import time
+import timeit
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.card import Card
+
+# 음료 수와 화폐 단위별 시재 개수
+SCALES: Dict[str, List[Tuple[int, int]]] = {
+    "small": [(24, 10)],
+    "medium": [(24, 10), (96, 1000)],
+    "large": [(24, 10), (96, 1000), (480, 100000)],
+}
+
+Results = Dict[str, float]
+
+
+def measure(func: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """``func`` 한 번 실행에 걸리는 시간(마이크로초)의 최솟값을 반환한다."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def make_controller(slots: int, coins: int) -> Controller:
+    controller = Controller()
+    for currency in controller.cashes:
+        controller.set_cash(currency, coins)
+    for drink in default_drinks(slots, stock=10**9):
+        controller.add_drinks(drink)
+    return controller
+
+
+def bench_controller(slots: int, coins: int, number: int) -> Results:
+    controller = make_controller(slots, coins)
+    drinks = controller.drinks
+    results: Results = {}
+    results["controller.input_cash"] = measure(lambda: controller.input_cash({1000: 1}), number)
+
+    def refund() -> None:
+        # 공개 setter를 써야 거스름돈 인덱스가 시재와 맞는 상태로 측정된다
+        controller.set_inserted_cash(3750)
+        controller.refund_cash()
+        for currency in controller.cashes:
+            controller.set_cash(currency, coins)
+
+    results["controller.refund_cash"] = measure(refund, number)
+
+    def dispense() -> None:
+        controller.set_inserted_cash(10**12)
+        for drink in drinks:
+            controller.dispense(drink)
+
+    results["controller.dispense"] = measure(dispense, max(1, number // slots)) / slots
+    return {f"{name}[slots={slots},coins={coins}]": value for name, value in results.items()}
+
+
+def bench_card(number: int) -> Results:
+    card = Card()
+    return {
+        "card.insert_card[valid]": measure(lambda: card.insert_card("A1B2C3D4E5"), number),
+        "card.insert_card[invalid]": measure(lambda: card.insert_card("ZZZZZZZZZZ"), number),
+    }
+
+
+@contextmanager
+def virtual_display(display: Optional[str] = None) -> Iterator[Optional[str]]:
+    """쓸 화면 이름을 알려주고, 쓸 수 있는 화면이 없으면 ``None``을 알려준다.
+
+    ``display``를 주면 그 화면을, 없으면 ``DISPLAY`` 환경 변수의 화면을 쓴다.
+    둘 다 없으면 ``Xvfb``가 빈 번호를 골라 뜨게 하고 블록이 끝날 때 종료한다.
+    환경 변수는 바꾸지 않으므로 호출한 쪽이 ``tk.Tk(screenName=...)``이나 자식
+    프로세스의 환경으로 화면 이름을 넘긴다.
+    """
+    display = display or os.environ.get("DISPLAY")
+    if display:
+        yield display
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield None
+        return
+    # -displayfd: 준비가 끝나면 고른 화면 번호를 이 파일 기술자에 쓴다
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24"],
+                            pass_fds=(write_fd,), stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd) as fp:
+            ready, _, _ = select.select([fp], [], [], 10)
+            number = fp.readline().strip() if ready else ""
+        yield f":{number}" if number and proc.poll() is None else None
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def bench_tk(slots: int, number: int, display: Optional[str] = None) -> Results:
+    import tkinter as tk
+
+    from package import machine as machine_module
+    from package.image_cache import ImageCache
+
+    root = tk.Tk(screenName=display)
+    try:
+        machine = machine_module.Machine(root)
+        for drink in default_drinks(slots, stock=10**9):
+            machine.controller.add_drinks(drink)
+        machine.refresh_gui()
+        root.update()
+
+        results: Results = {}
+        results["machine.load_image[cached]"] = measure(
+            lambda: machine.load_image("src/drinks/cider.png"), number
+        )
+
+        def load_uncached() -> None:
+            ImageCache().get("src/drinks/cider.png")
+
+        results["machine.load_image[uncached]"] = measure(load_uncached, max(1, number // 100))
+
+        def build() -> None:
+            for widget in root.winfo_children():
+                widget.destroy()
+            machine.build_frame()
+            root.update_idletasks()
+
+        results["machine.build_frame"] = measure(build, 10, repeat=3)
+
+        def refresh() -> None:
+            machine.refresh_gui()
+            root.update_idletasks()
+
+        results["machine.refresh_gui"] = measure(refresh, 10, repeat=3)
+
+        def turn_page() -> None:
+            machine.show_page((machine.page + 1) % machine.page_count())
+            root.update_idletasks()
+
+        results["machine.show_page"] = measure(turn_page, 10, repeat=3)
+
+        def open_admin() -> None:
+            machine.admin_menu()
+            root.update_idletasks()
+            for widget in root.winfo_children():
+                if isinstance(widget, tk.Toplevel):
+                    widget.destroy()
+            machine.enable_widgets()
+
+        results["machine.admin_menu"] = measure(open_admin, 10, repeat=3)
+        results["machine.widgets_per_1000_purchases"] = count_purchase_widgets(machine, 1000)
+        return {f"{name}[slots={slots}]": value for name, value in results.items()}
+    finally:
+        root.destroy()
+
+
+def count_purchase_widgets(machine, purchases: int) -> float:
+    """현금 구매 ``purchases``번 동안 새로 만들어진 위젯 수를 센다."""
+    import tkinter as tk
+
+    created = [0]
+    original_init = tk.BaseWidget.__init__
+
+    def counting_init(self, *args, **kwargs) -> None:
+        created[0] += 1
+        original_init(self, *args, **kwargs)
+
+    # 결과 안내는 기존 알림 라벨을 고쳐 쓰므로 위젯을 만들지 않아야 한다
+    tk.BaseWidget.__init__ = counting_init
+    try:
+        drinks = machine.controller.drinks
+        for i in range(purchases):
+            machine.controller.input_cash({1000: 2})
+            machine.select_drink(drinks[i % len(drinks)])
+            machine.controller.refund_cash()
+        machine.root.update_idletasks()
+    finally:
+        tk.BaseWidget.__init__ = original_init
+    return float(created[0])
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """기준보다 ``tolerance`` 비율 이상 느려진 항목을 설명하는 문자열 목록을 반환한다.
+
+    기준이 0인 항목(구매당 새 위젯 수처럼 0이 목표인 값)은 조금이라도 늘면
+    느려진 것으로 본다.
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if base <= 0:
+            if value > base:
+                regressions.append(f"{name}: {base:.2f} -> {value:.2f}")
+            continue
+        ratio = value / base
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {base:.2f} -> {value:.2f} ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="자판기 핵심 경로 벤치마크")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--number", type=int, default=10000, help="측정당 반복 횟수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용하는 느려짐 비율")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 --baseline 파일에 저장")
+    parser.add_argument("--skip-tk", action="store_true", help="화면 벤치마크를 건너뜀")
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    for slots, coins in SCALES[args.scale]:
+        results.update(bench_controller(slots, coins, args.number))
+    results.update(bench_card(args.number))
+
+    if not args.skip_tk:
+        with virtual_display() as display:
+            if display:
+                for slots, _ in SCALES[args.scale]:
+                    results.update(bench_tk(slots, args.number, display))
+            else:
+                print("화면이 없어 tkinter 벤치마크를 건너뜁니다 (Xvfb 또는 DISPLAY 필요).", file=sys.stderr)
+
+    for name, value in sorted(results.items()):
+        print(f"{name:60s} {value:12.2f}")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+    if args.baseline:
+        if args.save_baseline:
+            with open(args.baseline, "w", encoding="utf-8") as fp:
+                json.dump(report, fp, indent=2, sort_keys=True)
+            return 0
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n기준 대비 느려진 항목:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,163 @@
+import argparse
+import os
+import sys
 import tkinter as tk
 
+from package import metrics
 from package.machine import Machine
-from package.drink import Drink
+from package.auth import ApprovalCache
+from package.slot_grid import BUTTONS, RENDERERS
 
 def main() -> None:
     """자판기 프로그램의 진입점.
 
     ``tk.Tk`` 루트 윈도우를 생성하고 :class:`Machine` 객체를 초기화한 뒤,
-    ``drink_infos`` 목록을 활용하여 기본 음료 재고를 채운다.
+    ``--catalog`` 파일(CSV, JSON 또는 JSON Lines)을 읽어 음료를 한 번에
+    채운다. 실행 중에 카탈로그 파일이 바뀌면 ``--catalog-poll`` 간격으로 이를
+    감지하여 바뀐 슬롯만 반영한다. 슬롯 위치가 밀리지 않도록 잘못된 행이 있는
+    파일은 시작할 때와 다시 읽을 때 모두 통째로 반영하지 않고 표준 오류로
+    알린다.
+    ``--journal``을 주면 그 디렉터리의 기록으로 시재, 재고, 가격과 투입 금액을
+    복구하고 이후의 변경을 계속 기록한다. ``--metrics-file``이나 ``--metrics-port``를 주면
+    계측을 켜고 지표를 파일 또는 HTTP ``/metrics``로 내보낸다. ``--profile``
+    또는 ``VENDING_PROFILE`` 환경 변수를 주면 ``mainloop``와 주요 콜백을
+    프로파일링하여 세션별 파일로 저장한다. ``--sales-history``를 주면 판매와
+    현금 흐름을 시간 창별로 집계하고 그 파일에 기록을 남긴다. ``--api-port``를
+    주면 작업 스레드에서 제어 API 서버(HTTP/WebSocket)를 함께 실행한다.
+    ``--renderer canvas``를 주면 음료 칸을 버튼 대신 한 캔버스에 그린다.
+    같은 카드의 반복 구매는 ``--approval-ttl``초 동안 ``--approval-limit``원까지
+    승인 요청 없이 결제된다. ``--snapshot``을 주면 시작할 때 그 이진 스냅샷으로
+    전체 상태를 되살리고, 종료할 때 현재 상태를 다시 저장한다.
+
+    첫 화면을 빨리 띄우기 위해 옵션으로 켜는 모듈은 그 옵션이 주어졌을 때만
+    가져온다.
     """
+    parser = argparse.ArgumentParser(description="자판기")
+    parser.add_argument("--catalog", metavar="PATH", default="src/catalog.csv", help="음료 카탈로그 파일")
+    parser.add_argument("--catalog-poll", type=int, default=2000, metavar="MS",
+                        help="카탈로그 변경을 확인하는 주기(밀리초), 0이면 확인하지 않음")
+    parser.add_argument("--journal", metavar="DIR", help="트랜잭션 로그와 스냅샷을 둘 디렉터리")
+    parser.add_argument("--snapshot", metavar="PATH", help="시작할 때 읽고 종료할 때 저장할 상태 스냅샷 파일")
+    parser.add_argument("--metrics-file", metavar="PATH", help="지표를 주기적으로 기록할 회전 로그 파일")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="Prometheus 지표를 제공할 HTTP 포트")
+    parser.add_argument("--sales-history", metavar="PATH", help="판매 분석 기록을 덧붙일 파일")
+    parser.add_argument("--api-port", type=int, metavar="PORT", help="제어 API(HTTP/WebSocket) 포트")
+    parser.add_argument("--api-host", default="127.0.0.1", help="제어 API를 바인드할 주소")
+    parser.add_argument("--api-token", help="제어 API가 요구할 Bearer 토큰")
+    parser.add_argument("--approval-ttl", type=float, default=300.0, metavar="SECONDS",
+                        help="카드 승인을 재사용할 시간(초), 0이면 매번 승인")
+    parser.add_argument("--approval-limit", type=int, default=10000, metavar="WON",
+                        help="승인 한 번으로 결제할 수 있는 총액(원)")
+    parser.add_argument("--renderer", choices=RENDERERS, default=BUTTONS, help="음료 칸 렌더러")
+    parser.add_argument("--profile", metavar="DIR", help="세션 프로파일을 저장할 디렉터리")
+    parser.add_argument("--profile-mode", default="sample", help="프로파일러 종류 (sample, cprofile, both)")
+    args = parser.parse_args()
+
+    exporter = server = None
+    if args.metrics_file or args.metrics_port is not None:
+        metrics.enable()
+    if args.metrics_file:
+        exporter = metrics.FileExporter(args.metrics_file)
+    if args.metrics_port is not None:
+        server = metrics.serve_http(args.metrics_port)
+
     root = tk.Tk()
-    machine = Machine(root)
-    
-    # Define the vending machine drinks. The first two are water priced at 800
-    # won. All other drinks cost between 1000 and 1800 won. Each image may be
-    # reused, but no drink type appears more than twice in a row and a variety
-    # of names is used.
-    drink_infos = [
-        ("물", 800, "src/drinks/water.png"),
-        ("물", 800, "src/drinks/water.png"),
-        ("레몬에이드", 1000, "src/drinks/ade.png"),
-        ("자몽에이드", 1000, "src/drinks/ade.png"),
-        ("칠성 사이다", 1100, "src/drinks/cider.png"),
-        ("제로 사이다", 1100, "src/drinks/cider.png"),
-        ("코카콜라", 1200, "src/drinks/coke.png"),
-        ("코카콜라 제로", 1200, "src/drinks/coke.png"),
-        ("환타 오렌지", 1300, "src/drinks/fanta.png"),
-        ("환타 파인애플", 1300, "src/drinks/fanta.png"),
-        ("이온워터", 1400, "src/drinks/ion.png"),
-        ("파워 이온", 1400, "src/drinks/ion.png"),
-        ("청량 탄산수", 1500, "src/drinks/soda.png"),
-        ("라임 탄산수", 1500, "src/drinks/soda.png"),
-        ("아이스 블루", 1600, "src/drinks/ade.png"),
-        ("자몽 스파클", 1600, "src/drinks/ade.png"),
-        ("더블 사이다", 1700, "src/drinks/cider.png"),
-        ("스위트 사이다", 1700, "src/drinks/cider.png"),
-        ("고급 콜라", 1800, "src/drinks/coke.png"),
-        ("다크 콜라", 1800, "src/drinks/coke.png"),
-        ("환타 포도", 1100, "src/drinks/fanta.png"),
-        ("환타 레몬", 1100, "src/drinks/fanta.png"),
-        ("하이드레이션 워터", 1200, "src/drinks/ion.png"),
-        ("스포츠 워터", 1200, "src/drinks/ion.png"),
-    ]
+    approvals = ApprovalCache(ttl=args.approval_ttl, spend_limit=args.approval_limit)
+    machine = Machine(root, renderer=args.renderer, approvals=approvals)
+    if metrics.enabled:
+        # 캐시들은 이미 적중 수를 세고 있으므로 내보낼 때 읽기만 한다. 전역 등록이
+        # Machine을 붙잡지 않도록 프로그램 전체에 하나뿐인 자판기에 대해서만 등록한다
+        metrics.register_callback(
+            "vending_image_cache_hits_total", "이미지 캐시 적중 수", "counter", lambda: machine.image_cache.hits
+        )
+        metrics.register_callback(
+            "vending_image_cache_misses_total", "이미지 캐시 미스 수", "counter", lambda: machine.image_cache.misses
+        )
+        metrics.register_callback(
+            "vending_card_approval_cache_hit_ratio", "카드 승인 캐시 적중률", "gauge", approvals.hit_rate
+        )
 
     # Fill the vending machine with drinks. Images will be displayed on buttons.
-    for i in range(24):
-        name, price, image = drink_infos[i % len(drink_infos)]
-        machine.controller.add_drinks(Drink(name, price, 10, image))
-        
-    machine.refresh_gui()
-    root.mainloop()
+    from package.catalog import read_catalog
+
+    errors = []
+    drinks = read_catalog(args.catalog, errors)
+    if drinks is not None:
+        machine.controller.extend_drinks(drinks)
+    for error in errors:
+        print(error, file=sys.stderr)
+
+    if args.snapshot:
+        from package.snapshot import Snapshot
+
+        if os.path.exists(args.snapshot):
+            try:
+                with Snapshot.load(args.snapshot) as snapshot:
+                    snapshot.restore(machine.controller)
+            except ValueError as error:
+                print(f"{args.snapshot}: {error}", file=sys.stderr)
+
+    if args.catalog_poll > 0:
+        from package.catalog import CatalogWatcher
+
+        watcher = CatalogWatcher(args.catalog, machine.controller)
+
+        def poll_catalog() -> None:
+            watcher.poll()
+            for error in watcher.errors:
+                print(error, file=sys.stderr)
+            watcher.errors = []
+            root.after(args.catalog_poll, poll_catalog)
+
+        root.after(args.catalog_poll, poll_catalog)
+
+    journal = analytics = api = profiler = None
+    # 포트를 열지 못하는 등 시작 도중에 실패해도 이미 시작한 기록과 서버는 정리한다
+    try:
+        if args.journal:
+            from package.journal import Journal
+
+            journal = Journal.open(machine.controller, args.journal)
+        if args.sales_history:
+            from package.analytics import SalesAnalytics
+
+            analytics = SalesAnalytics(machine.controller, history=args.sales_history)
+        if args.api_port is not None:
+            from package.api import ControlServer
+
+            api = ControlServer(machine.controller, args.api_host, args.api_port, args.api_token).start()
+        # package.profiling.ENV_DIRECTORY 환경 변수로도 켤 수 있다
+        if args.profile or os.environ.get("VENDING_PROFILE"):
+            from package.profiling import SessionProfiler
+
+            try:
+                if args.profile:
+                    profiler = SessionProfiler(args.profile, args.profile_mode)
+                else:
+                    profiler = SessionProfiler.from_env()
+            except ValueError as error:
+                parser.error(str(error))
+        if profiler is not None:
+            # 콜백을 감싼 뒤 refresh_gui로 위젯을 다시 만들어 command가 래퍼를 가리키게 한다
+            profiler.instrument(machine)
+        machine.refresh_gui()
+        if profiler is not None:
+            profiler.run(root.mainloop)
+        else:
+            root.mainloop()
+    finally:
+        if args.snapshot:
+            Snapshot.save(machine.controller, args.snapshot)
+        if journal is not None:
+            journal.close()
+        if analytics is not None:
+            analytics.close()
+        if api is not None:
+            api.stop()
+        if exporter is not None:
+            exporter.close()
+        if server is not None:
+            server.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,422 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .controller import CASH_CHANGED, CASH_REFUNDED, SALE_COMPLETED, Controller
+
+# 기록 파일의 이벤트 종류: 판매, 현금 투입, 거스름돈 반환
+SALE = "s"
+DEPOSIT = "d"
+REFUND = "r"
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# 창 이름 -> (길이(초), 버킷 수)
+WINDOWS: Dict[str, Tuple[int, int]] = {
+    "hour": (HOUR, 60),
+    "day": (DAY, 24),
+    "week": (WEEK, 7 * 24),
+}
+
+# 배치 집계에서 한 번에 파싱할 크기(바이트)
+BATCH_BYTES = 4 << 20
+
+
+@dataclass
+class SalesReport:
+    """판매량, 매출, 현금 흐름 집계.
+
+    Attributes
+    ----------
+    sales, revenue : int
+        판매 수와 매출.
+    cash_in, cash_out : int
+        투입된 현금과 거슬러 준 현금.
+    slots : Dict[int, List[int]]
+        슬롯 위치 -> ``[판매 수, 매출]``.
+    products : Dict[str, List[int]]
+        상품 이름 -> ``[판매 수, 매출]``.
+    machines : Dict[str, List[int]]
+        기록 파일 경로(자판기) -> ``[판매 수, 매출]``. 배치 집계에서만 채운다.
+    events : int
+        집계한 이벤트 수.
+    """
+
+    sales: int = 0
+    revenue: int = 0
+    cash_in: int = 0
+    cash_out: int = 0
+    slots: Dict[int, List[int]] = field(default_factory=dict)
+    products: Dict[str, List[int]] = field(default_factory=dict)
+    machines: Dict[str, List[int]] = field(default_factory=dict)
+    events: int = 0
+
+    def add_sale(self, slot: int, product: str, price: int) -> None:
+        """판매 한 건을 더한다."""
+        self.sales += 1
+        self.revenue += price
+        entry = self.slots.get(slot)
+        if entry is None:
+            entry = self.slots[slot] = [0, 0]
+        entry[0] += 1
+        entry[1] += price
+        entry = self.products.get(product)
+        if entry is None:
+            entry = self.products[product] = [0, 0]
+        entry[0] += 1
+        entry[1] += price
+
+    def merge(self, other: "SalesReport", sign: int = 1) -> None:
+        """다른 집계를 더한다. ``sign``이 -1이면 뺀다."""
+        self.sales += sign * other.sales
+        self.revenue += sign * other.revenue
+        self.cash_in += sign * other.cash_in
+        self.cash_out += sign * other.cash_out
+        self.events += sign * other.events
+        for mine, theirs in ((self.slots, other.slots), (self.products, other.products),
+                             (self.machines, other.machines)):
+            for key, (sales, revenue) in theirs.items():
+                entry = mine.setdefault(key, [0, 0])
+                entry[0] += sign * sales
+                entry[1] += sign * revenue
+                if not entry[0] and not entry[1]:
+                    # 창에서 빠진 항목을 지워 메모리가 늘지 않게 한다
+                    del mine[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def table(entries: Dict[Any, List[int]]) -> Dict[str, Dict[str, int]]:
+            return {str(key): {"sales": sales, "revenue": revenue}
+                    for key, (sales, revenue) in sorted(entries.items())}
+
+        return {
+            "events": self.events,
+            "sales": self.sales,
+            "revenue": self.revenue,
+            "cash_in": self.cash_in,
+            "cash_out": self.cash_out,
+            "net_cash": self.cash_in - self.cash_out,
+            "slots": table(self.slots),
+            "products": table(self.products),
+            "machines": table(self.machines),
+        }
+
+
+class RollingWindow:
+    """최근 ``span``초의 집계를 ``buckets``개의 시간 버킷으로 유지한다.
+
+    버킷을 원형으로 재사용하며 시간이 흘러 버킷이 창 밖으로 나가면 그 버킷
+    값만 합계에서 빼므로 이벤트마다 상수 시간이 들고 메모리는 버킷 수와 판매된
+    슬롯 수에만 비례한다. 창의 경계는 버킷 너비(``span / buckets``) 단위이다.
+    """
+
+    def __init__(self, span: float, buckets: int) -> None:
+        self.span = span
+        self.width = span / buckets
+        self.total = SalesReport()
+        self._buckets = [SalesReport() for _ in range(buckets)]
+        self._head: Optional[int] = None
+
+    def bucket(self, now: float) -> SalesReport:
+        """``now``가 속한 버킷을 반환하고, 그 사이 창을 벗어난 버킷을 비운다."""
+        number = int(now // self.width)
+        head = self._head
+        if head is None:
+            self._head = head = number
+        elif number > head:
+            count = len(self._buckets)
+            for expired in range(head + 1, head + 1 + min(number - head, count)):
+                old = self._buckets[expired % count]
+                if old.events:
+                    self.total.merge(old, -1)
+                    self._buckets[expired % count] = SalesReport()
+            self._head = head = number
+        # 시계가 뒤로 간 이벤트는 현재 버킷에 넣는다
+        return self._buckets[head % len(self._buckets)]
+
+
+class SalesAnalytics:
+    """컨트롤러 알림으로 판매와 현금 흐름을 시간 창별로 증분 집계한다.
+
+    ``sale``, ``refund``, ``cash``(투입) 알림을 받을 때마다 :data:`WINDOWS`의
+    모든 창에 더하며, ``history``를 주면 같은 이벤트를 JSON Lines 기록 파일에
+    덧붙여 :func:`build_report`로 과거 전체를 다시 집계할 수 있게 한다. 기록
+    파일의 잘린 마지막 줄은 열 때 고친다.
+    """
+
+    def __init__(
+        self,
+        controller: Optional[Controller] = None,
+        windows: Dict[str, Tuple[int, int]] = WINDOWS,
+        history: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """집계 창을 만들고 ``controller``가 있으면 알림을 구독한다.
+
+        Parameters
+        ----------
+        controller : :class:`Controller`, optional
+            판매와 현금 흐름을 받을 컨트롤러.
+        windows : Dict[str, Tuple[int, int]], optional
+            창 이름 -> ``(길이(초), 버킷 수)``.
+        history : str, optional
+            이벤트를 덧붙일 JSON Lines 기록 파일 경로.
+        clock : Callable[[], float], optional
+            현재 시각(초)을 반환하는 함수.
+        """
+        self.controller = controller
+        self.clock = clock
+        self.windows = {name: RollingWindow(span, buckets) for name, (span, buckets) in windows.items()}
+        self._lock = threading.Lock()
+        self._history: Optional[IO[str]] = None
+        if history is not None:
+            directory = os.path.dirname(history)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            _repair_tail(history)
+            self._history = open(history, "a", encoding="utf-8")
+        if controller is not None:
+            controller.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """알림 구독을 해제하고 기록 파일을 닫는다."""
+        if self.controller is not None:
+            self.controller.unsubscribe(self._on_change)
+        with self._lock:
+            if self._history is not None:
+                self._history.close()
+                self._history = None
+
+    def _on_change(self, event: str, payload: Dict[str, Any]) -> None:
+        if event == SALE_COMPLETED:
+            self.record(SALE, payload["price"], payload["slot"], payload["product"])
+        elif event == CASH_REFUNDED:
+            if payload["amount"]:
+                self.record(REFUND, payload["amount"])
+        elif event == CASH_CHANGED:
+            if payload.get("deposited"):
+                self.record(DEPOSIT, payload["deposited"])
+
+    def record(self, kind: str, amount: int, slot: Optional[int] = None,
+               product: Optional[str] = None, now: Optional[float] = None) -> None:
+        """이벤트 하나를 모든 창에 더한다.
+
+        Parameters
+        ----------
+        kind : str
+            ``s``(판매), ``d``(현금 투입), ``r``(거스름돈 반환).
+        amount : int
+            판매 가격 또는 현금 금액.
+        slot, product : optional
+            판매한 슬롯 위치와 상품 이름.
+        now : float, optional
+            이벤트 시각. 생략하면 ``clock()``.
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            for window in self.windows.values():
+                for report in (window.bucket(now), window.total):
+                    _apply(report, kind, amount, slot, product)
+            if self._history is not None:
+                self._history.write(json.dumps([round(now, 3), kind, slot, product, amount],
+                                               ensure_ascii=False) + "\n")
+
+    def report(self, window: str = "day") -> SalesReport:
+        """``window`` 창의 현재 집계 복사본을 반환한다."""
+        with self._lock:
+            rolling = self.windows[window]
+            # 이벤트가 없던 동안 지난 버킷을 먼저 비운다
+            rolling.bucket(self.clock())
+            copy = SalesReport()
+            copy.merge(rolling.total)
+            return copy
+
+    def reports(self) -> Dict[str, Dict[str, Any]]:
+        """모든 창의 집계를 ``{창 이름: 딕셔너리}``로 반환한다."""
+        return {name: self.report(name).to_dict() for name in self.windows}
+
+    def flush(self) -> None:
+        """기록 파일 버퍼를 디스크로 내보낸다."""
+        with self._lock:
+            if self._history is not None:
+                self._history.flush()
+
+
+def _repair_tail(path: str) -> None:
+    """``path`` 기록 파일의 마지막 줄이 줄바꿈 없이 끝났으면 고친다.
+
+    정전으로 잘린 줄은 마지막 줄바꿈 뒤로 잘라내고, 줄바꿈 직전에 끊겨 내용이
+    온전한 줄은 줄바꿈을 채운다. 그대로 두면 다음 이벤트가 같은 줄에 붙어 두
+    이벤트가 모두 읽히지 않는다.
+    """
+    try:
+        fp = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with fp:
+        end = fp.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            size = min(4096, position)
+            fp.seek(position - size)
+            chunk = fp.read(size)
+            if position == end and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                position -= size - newline - 1
+                break
+            position -= size
+        fp.seek(position)
+        try:
+            json.loads(fp.read())
+        except ValueError:
+            fp.truncate(position)
+        else:
+            fp.write(b"\n")
+
+
+def _apply(report: SalesReport, kind: str, amount: int, slot: Optional[int], product: Optional[str]) -> None:
+    report.events += 1
+    if kind == SALE:
+        report.add_sale(slot, product, amount)
+    elif kind == DEPOSIT:
+        report.cash_in += amount
+    elif kind == REFUND:
+        report.cash_out += amount
+
+
+def _timestamp(line: str) -> float:
+    try:
+        return float(line[1:line.index(",")])
+    except ValueError:
+        return float("nan")
+
+
+def aggregate_file(path: str, start: Optional[float] = None, end: Optional[float] = None) -> SalesReport:
+    """기록 파일 하나를 ``[start, end)`` 구간에 대해 집계한다.
+
+    한 자판기의 기록은 슬롯, 상품, 금액 조합이 몇 가지뿐이므로 줄마다 JSON을
+    파싱하지 않고 시각 뒤의 내용을 :class:`collections.Counter`로 한 번에 세고,
+    서로 다른 내용만 파싱하여 개수를 곱한다. 줄 나누기와 세기는 모두 C 수준의
+    반복으로 처리된다. 기록은 시간순으로 덧붙여지므로 약 :data:`BATCH_BYTES`
+    크기의 묶음은 처음과 마지막 줄의 시각만 보고 통째로 넣거나 건너뛰며, 구간
+    경계에 걸친 묶음만 줄마다 시각을 확인한다. 기록 파일이 곧 자판기 한 대이므로
+    ``machines``에는 받은 경로 그대로 합계를 남긴다. 자판기마다 디렉터리를
+    두고 같은 파일 이름을 쓰더라도 서로 섞이지 않는다.
+    """
+    counts: Counter = Counter()
+    low = float("-inf") if start is None else start
+    high = float("inf") if end is None else end
+    partition = str.partition
+    with open(path, encoding="utf-8") as fp:
+        while True:
+            lines = fp.readlines(BATCH_BYTES)
+            if not lines:
+                break
+            if start is not None or end is not None:
+                first, last = _timestamp(lines[0]), _timestamp(lines[-1])
+                if last < low or first >= high:
+                    continue
+                if not low <= first <= last < high:
+                    lines = [line for line in lines if low <= _timestamp(line) < high]
+            counts.update(map(itemgetter(2), map(partition, lines, repeat(","))))
+
+    report = SalesReport()
+    for payload, count in counts.items():
+        try:
+            kind, slot, product, amount = json.loads("[" + payload)
+        except ValueError:
+            # 정전으로 잘린 마지막 줄
+            continue
+        report.events += count
+        if kind == SALE:
+            for key, table in ((slot, report.slots), (product, report.products)):
+                entry = table.setdefault(key, [0, 0])
+                entry[0] += count
+                entry[1] += count * amount
+            report.sales += count
+            report.revenue += count * amount
+        elif kind == DEPOSIT:
+            report.cash_in += count * amount
+        elif kind == REFUND:
+            report.cash_out += count * amount
+    report.machines[path] = [report.sales, report.revenue]
+    return report
+
+
+def _aggregate_shard(paths: List[str], start: Optional[float], end: Optional[float]) -> SalesReport:
+    # 프로세스마다 결과를 먼저 합쳐서 주고받는 데이터를 줄인다
+    report = SalesReport()
+    for path in paths:
+        report.merge(aggregate_file(path, start, end))
+    return report
+
+
+def build_report(
+    paths: Sequence[str],
+    window: Optional[float] = None,
+    end: Optional[float] = None,
+    processes: Optional[int] = None,
+) -> SalesReport:
+    """여러 기록 파일(자판기)을 프로세스 풀에 나누어 집계하고 하나로 합친다.
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        :class:`SalesAnalytics`가 남긴 JSON Lines 기록 파일들.
+    window : float, optional
+        ``end``부터 거슬러 올라갈 집계 구간(초). 생략하면 전체 기간.
+    end : float, optional
+        집계 구간의 끝 시각. 생략하면 현재 시각.
+    processes : int, optional
+        사용할 프로세스 수. 생략하면 CPU 수를 사용하고, 1이면 현재 프로세스에서
+        바로 실행한다.
+    """
+    start = None
+    if window is not None:
+        end = time.time() if end is None else end
+        start = end - window
+    paths = list(paths)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(paths) <= 1:
+        return _aggregate_shard(paths, start, end)
+
+    shards = [paths[i::processes] for i in range(processes)]
+    report = SalesReport()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_aggregate_shard, shard, start, end) for shard in shards if shard]
+        for future in futures:
+            report.merge(future.result())
+    return report
+
+
+def main() -> None:
+    """기록 파일들로 함대 판매 보고서를 만들어 JSON으로 출력한다."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="판매 기록 집계기")
+    parser.add_argument("files", nargs="+", help="판매 기록 파일 (JSON Lines)")
+    parser.add_argument("--window", choices=sorted(WINDOWS), help="최근 구간만 집계. 생략하면 전체 기간")
+    parser.add_argument("--end", type=float, help="구간의 끝 시각(유닉스 시간). 생략하면 현재")
+    parser.add_argument("--processes", type=int, default=None, help="사용할 프로세스 수")
+    args = parser.parse_args()
+
+    window = WINDOWS[args.window][0] if args.window else None
+    report = build_report(args.files, window, args.end, args.processes)
+    json.dump(report.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import struct
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .controller import Controller
+from .inventory import MAX_VALUE
+
+# WebSocket 핸드셰이크에 쓰는 고정 GUID (RFC 6455)
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OP_TEXT = 0x1
+_OP_CLOSE = 0x8
+_OP_PING = 0x9
+_OP_PONG = 0xA
+
+# 요청 머리글과 본문의 최대 크기(바이트)
+MAX_HEADER = 16 << 10
+MAX_BODY = 1 << 20
+# 클라이언트마다 보내지 못하고 쌓아 둘 알림 수. 넘으면 느린 클라이언트로 보고 끊는다
+CLIENT_BACKLOG = 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    """HTTP 오류 응답으로 바꿀 예외."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def state_of(controller: Controller) -> Dict[str, Any]:
+    """컨트롤러의 시재, 투입 금액, 슬롯 목록을 JSON으로 보낼 딕셔너리로 만든다."""
+    with controller.lock:
+        drinks = controller.drinks
+        return {
+            "cashes": {str(currency): count for currency, count in controller.cashes.items()},
+            "inserted_cash": controller.inserted_cash,
+            "slots": [_slot_of(drink) for drink in drinks],
+        }
+
+
+def _slot_of(drink: Any) -> Dict[str, Any]:
+    return {"slot": drink.index, "name": drink.name, "price": drink.price,
+            "count": drink.count, "image_path": drink.image_path}
+
+
+class ControlServer:
+    """컨트롤러 상태 조회와 가격·재고·시재 변경을 제공하는 asyncio HTTP/WebSocket 서버.
+
+    연결마다 스레드를 만들지 않고 하나의 이벤트 루프가 모든 연결을 처리한다.
+    ``/ws``에 WebSocket으로 연결한 클라이언트에게는 처음에 전체 상태를, 이후에는
+    컨트롤러 변경 알림을 JSON 메시지로 밀어 주므로 클라이언트가 주기적으로 조회할
+    필요가 없다. 알림은 한 번만 직렬화하여 모든 클라이언트에 보낸다. 카드 차단
+    알림(``deny``)도 차단된 번호와 함께 보낸다.
+
+    ============================  ==============================================
+    ``GET /state``                시재, 투입 금액, 모든 슬롯
+    ``GET /slots/<n>``            슬롯 하나
+    ``PUT /slots/<n>``            ``{"price": 정수, "count": 정수}`` 중 준 값 변경
+    ``PUT /cashes/<단위>``         ``{"count": 정수}``로 시재 변경
+    ``GET /ws``                   변경 알림 WebSocket
+    ============================  ==============================================
+
+    :py:meth:`start`는 작업 스레드에서 이벤트 루프를 돌려 tkinter ``mainloop``와
+    함께 쓰고, 화면 없이 실행할 때는 :py:meth:`serve_forever`를 ``asyncio.run``으로
+    실행한다. 컨트롤러 메서드는 잠금으로 보호되므로 어느 스레드에서 불러도 되며,
+    요청 처리는 잠금을 기다리는 동안 이벤트 루프가 멈추지 않도록 루프의 기본
+    실행기(스레드 풀)에서 한다.
+    """
+
+    def __init__(self, controller: Controller, host: str = "127.0.0.1", port: int = 8080,
+                 token: Optional[str] = None) -> None:
+        """서버 주소와 인증 토큰을 정한다.
+
+        Parameters
+        ----------
+        controller : :class:`Controller`
+            노출할 컨트롤러.
+        host : str, optional
+            바인드할 주소. 기본값은 로컬에서만 접속 가능한 ``127.0.0.1``.
+        port : int, optional
+            바인드할 포트. 0이면 빈 포트를 골라 ``port``에 기록한다.
+        token : str, optional
+            주어지면 모든 요청에 ``Authorization: Bearer <token>``을 요구한다.
+        """
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self.token = token
+        self.clients: Set["asyncio.Queue[Optional[bytes]]"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+        # 포트를 열었거나 열지 못했을 때 설정된다
+        self._bound = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    async def serve_forever(self) -> None:
+        """현재 이벤트 루프에서 :py:meth:`stop`이 불릴 때까지 요청을 처리한다."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER)
+            self.port = self._server.sockets[0].getsockname()[1]
+            self.controller.subscribe(self._on_change)
+        except OSError as exc:
+            self._error = exc
+            raise
+        finally:
+            self._bound.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            self.controller.unsubscribe(self._on_change)
+            self._server.close()
+            for queue in list(self.clients):
+                _disconnect(queue)
+            self.clients.clear()
+            await self._server.wait_closed()
+
+    def start(self) -> "ControlServer":
+        """작업 스레드에서 서버를 시작하고 포트가 열릴 때까지 기다린다.
+
+        포트를 열지 못하면 그 :class:`OSError`를 다시 발생시킨다.
+        """
+        self._thread = threading.Thread(target=self._run, name="control-api", daemon=True)
+        self._thread.start()
+        self._bound.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        return self
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self.serve_forever())
+        except OSError:
+            # 포트를 열지 못한 오류는 start()가 호출한 스레드에서 발생시킨다
+            if self._error is None:
+                raise
+
+    def stop(self) -> None:
+        """서버를 멈춘다. 다른 스레드에서 불러도 된다."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _on_change(self, event: str, payload: Dict[str, Any]) -> None:
+        # 변경을 일으킨 스레드에서 불리므로 이벤트 루프로 넘긴다
+        message = _ws_frame(_OP_TEXT, json.dumps({"event": event, **payload}, ensure_ascii=False).encode())
+        loop = self._loop
+        if loop is None:
+            return
+        if loop is _running_loop():
+            self._broadcast(message)
+        else:
+            loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _broadcast(self, message: bytes) -> None:
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 따라오지 못하는 클라이언트는 끊어 다른 클라이언트를 막지 않는다
+                self.clients.discard(queue)
+                _disconnect(queue)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                method, path, version, headers = _parse_head(head)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    try:
+                        length = int(headers.get("content-length", "0"))
+                    except ValueError:
+                        length = -1
+                    if not 0 <= length <= MAX_BODY or not self._authorized(headers):
+                        # 본문을 읽지 않으므로 연결을 이어 쓸 수 없다
+                        keep_alive = False
+                        if not 0 <= length <= MAX_BODY:
+                            raise ApiError(413 if length > MAX_BODY else 400, "본문 길이가 올바르지 않습니다")
+                        raise ApiError(401, "인증이 필요합니다")
+                    body = await reader.readexactly(length) if length else b""
+                    if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                        await self._websocket(reader, writer, headers)
+                        return
+                    # 컨트롤러 잠금을 기다리는 동안 다른 연결을 막지 않도록 작업 스레드에서 처리한다
+                    result = await asyncio.get_running_loop().run_in_executor(None, self._route, method, path, body)
+                    status = 200
+                except ApiError as exc:
+                    status, result = exc.status, {"error": str(exc)}
+                except Exception as exc:
+                    # 처리 중 예기치 못한 오류도 응답 없이 연결을 끊지 않고 500으로 알린다
+                    status, result = 500, {"error": f"서버 오류: {type(exc).__name__}"}
+                _respond(writer, status, result, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        if self.token is None:
+            return True
+        # 토큰을 앞에서부터 맞춰 보는 시간 차로 추측할 수 없도록 상수 시간에 비교한다
+        given = headers.get("authorization", "").encode()
+        return hmac.compare_digest(given, f"Bearer {self.token}".encode())
+
+    def _route(self, method: str, path: str, body: bytes) -> Any:
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        controller = self.controller
+        if parts == ["state"]:
+            if method != "GET":
+                raise ApiError(405, "GET만 지원합니다")
+            return state_of(controller)
+        if len(parts) == 2 and parts[0] in ("slots", "cashes"):
+            try:
+                key = int(parts[1])
+            except ValueError:
+                raise ApiError(404, f"없는 경로: {path}") from None
+            if method == "GET" and parts[0] == "slots":
+                return _slot_of(self._drink(key))
+            if method != "PUT":
+                raise ApiError(405, "GET 또는 PUT만 지원합니다")
+            values = _json_body(body)
+            if parts[0] == "slots":
+                drink = self._drink(key)
+                with controller.lock:
+                    if "price" in values:
+                        controller.set_price(drink, _integer(values, "price"))
+                    if "count" in values:
+                        controller.set_stock(drink, _integer(values, "count"))
+                    return _slot_of(drink)
+            if key not in controller.cashes:
+                raise ApiError(404, f"없는 화폐 단위: {key}")
+            controller.set_cash(key, _integer(values, "count"))
+            return {"currency": key, "count": controller.cashes[key]}
+        raise ApiError(404, f"없는 경로: {path}")
+
+    def _drink(self, slot: int) -> Any:
+        if not 0 <= slot < len(self.controller.drinks):
+            raise ApiError(404, f"없는 슬롯: {slot}")
+        return self.controller.drinks[slot]
+
+    async def _websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         headers: Dict[str, str]) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            _respond(writer, 400, {"error": "Sec-WebSocket-Key가 없습니다"}, False)
+            return
+        accept = base64.b64encode(hashlib.sha1(key.encode() + _WS_GUID).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(CLIENT_BACKLOG)
+        # 첫 상태와 이후 알림 사이에 빠지는 변경이 없도록 상태를 읽기 전에 등록한다
+        self.clients.add(queue)
+        state = await asyncio.get_running_loop().run_in_executor(None, state_of, self.controller)
+        snapshot = {"event": "state", **state}
+        writer.write(_ws_frame(_OP_TEXT, json.dumps(snapshot, ensure_ascii=False).encode()))
+        receiver = asyncio.ensure_future(self._ws_receive(reader, writer, queue))
+        try:
+            closing = False
+            while not closing:
+                # 쌓인 알림은 한 번에 써서 시스템 호출을 줄인다
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                if None in batch:
+                    closing = True
+                    batch = batch[:batch.index(None)]
+                writer.write(b"".join(batch))
+                await writer.drain()
+            writer.write(_ws_frame(_OP_CLOSE, b""))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(queue)
+            receiver.cancel()
+
+    async def _ws_receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                          queue: "asyncio.Queue[Optional[bytes]]") -> None:
+        # 알림은 서버에서 보내기만 하므로 제어 프레임만 처리한다
+        try:
+            while True:
+                opcode, payload = await _read_frame(reader)
+                if opcode == _OP_CLOSE:
+                    break
+                if opcode == _OP_PING:
+                    writer.write(_ws_frame(_OP_PONG, payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        self.clients.discard(queue)
+        _disconnect(queue)
+
+
+def _disconnect(queue: "asyncio.Queue[Optional[bytes]]") -> None:
+    # 보내지 못한 알림을 버리고 보내는 쪽에 종료를 알린다
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(None)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, version = lines[0].split(" ", 2)
+    except ValueError:
+        method, path, version = "GET", "/", "HTTP/1.0"
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, path, version, headers
+
+
+def _json_body(body: bytes) -> Dict[str, Any]:
+    try:
+        values = json.loads(body or b"{}")
+    except ValueError:
+        raise ApiError(400, "본문이 JSON이 아닙니다") from None
+    if not isinstance(values, dict):
+        raise ApiError(400, "본문은 JSON 객체여야 합니다")
+    return values
+
+
+def _integer(values: Dict[str, Any], key: str) -> int:
+    value = values.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_VALUE:
+        raise ApiError(400, f"{key} 값은 0 이상 {MAX_VALUE} 이하의 정수여야 합니다")
+    return value
+
+
+def _respond(writer: asyncio.StreamWriter, status: int, result: Any, keep_alive: bool) -> None:
+    body = json.dumps(result, ensure_ascii=False).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+        + body
+    )
+
+
+def _ws_frame(opcode: int, payload: bytes) -> bytes:
+    # 서버가 보내는 프레임은 마스크하지 않는다
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_BODY:
+        raise ValueError("프레임이 너무 큽니다")
+    mask = await reader.readexactly(4) if second & 0x80 else b""
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def main() -> None:
+    """화면 없이 카탈로그로 컨트롤러를 만들고 제어 API 서버를 실행한다."""
+    import argparse
+
+    from .catalog import load_catalog
+
+    parser = argparse.ArgumentParser(description="자판기 제어 API 서버")
+    parser.add_argument("--catalog", default="src/catalog.csv", help="음료 카탈로그 파일")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", help="요구할 Bearer 토큰")
+    args = parser.parse_args()
+
+    controller = Controller()
+    controller.extend_drinks(load_catalog(args.catalog))
+    server = ControlServer(controller, args.host, args.port, args.token)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import io
+import json
+import math
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 기본 스프라이트 아틀라스 파일 경로와 음료 칸에 쓰는 이미지 크기
+DEFAULT_PATH = "src/drinks.atlas"
+SPRITE_SIZE = (70, 70)
+
+_MAGIC = b"ATL1"
+_HEADER = struct.Struct("<4sI")
+
+Region = Tuple[int, int, int, int]
+
+
+class SpriteAtlas:
+    """여러 음료 이미지를 한 장의 PNG에 격자로 모은 스프라이트 아틀라스.
+
+    ``regions``는 원본 경로를 아틀라스 안의 ``(x1, y1, x2, y2)`` 영역으로
+    대응시킨다. 파일은 헤더, JSON 목차, PNG 바이트 순으로 이루어지며, 목차에
+    기록한 원본의 수정 시각과 크기가 현재 파일과 다르면 :py:meth:`is_fresh`가
+    ``False``를 반환한다. 화면은 PNG를 한 번만 디코딩하고 영역을 잘라 쓴다.
+    """
+
+    def __init__(self, png: bytes, size: Tuple[int, int], regions: Dict[str, Region],
+                 stamps: Dict[str, Tuple[int, int]]) -> None:
+        """이미 만들어진 아틀라스를 감싼다.
+
+        Parameters
+        ----------
+        png : bytes
+            모든 스프라이트를 담은 PNG 바이트.
+        size : tuple[int, int]
+            스프라이트 하나의 크기.
+        regions : Dict[str, tuple]
+            원본 경로별 아틀라스 안의 영역.
+        stamps : Dict[str, tuple[int, int]]
+            원본 경로별 만들 당시의 수정 시각(ns)과 파일 크기.
+        """
+        self.png = png
+        self.size = size
+        self.regions = regions
+        self.stamps = stamps
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    @classmethod
+    def build(cls, sources: Sequence[str], size: Tuple[int, int] = SPRITE_SIZE) -> "SpriteAtlas":
+        """``sources`` 이미지를 ``size``로 줄여 정사각형에 가까운 격자로 붙인다.
+
+        PIL은 아틀라스를 새로 만들 때만 필요하므로 여기서 가져온다.
+        """
+        from PIL import Image
+
+        columns = max(1, math.ceil(math.sqrt(len(sources))))
+        rows = max(1, -(-len(sources) // columns))
+        width, height = size
+        sheet = Image.new("RGBA", (columns * width, rows * height), (0, 0, 0, 0))
+        regions: Dict[str, Region] = {}
+        stamps: Dict[str, Tuple[int, int]] = {}
+        for index, source in enumerate(sources):
+            stat = os.stat(source)
+            x = index % columns * width
+            y = index // columns * height
+            with Image.open(source) as image:
+                sheet.paste(image.convert("RGBA").resize(size), (x, y))
+            regions[source] = (x, y, x + width, y + height)
+            stamps[source] = (stat.st_mtime_ns, stat.st_size)
+        buffer = io.BytesIO()
+        sheet.save(buffer, format="PNG")
+        return cls(buffer.getvalue(), tuple(size), regions, stamps)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional["SpriteAtlas"]:
+        """``path``의 아틀라스를 읽는다. 없거나 손상되었으면 ``None``."""
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            return None
+        try:
+            magic, length = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                return None
+            start = _HEADER.size + length
+            index = json.loads(data[_HEADER.size:start].decode("utf-8"))
+            regions = {}
+            stamps = {}
+            for source, x, y, mtime, nbytes in index["sprites"]:
+                regions[source] = (x, y, x + index["width"], y + index["height"])
+                stamps[source] = (mtime, nbytes)
+            return cls(data[start:], (index["width"], index["height"]), regions, stamps)
+        except (ValueError, struct.error, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def open(cls, directory: str = "src/drinks", size: Tuple[int, int] = SPRITE_SIZE,
+             path: str = DEFAULT_PATH) -> "SpriteAtlas":
+        """``directory``의 PNG로 된 아틀라스를 반환한다.
+
+        저장된 아틀라스가 같은 원본 목록과 크기로 만들어졌고 원본이 바뀌지
+        않았으면 그대로 쓰고, 아니면 새로 만들어 저장을 시도한다. 쓸 수 없는
+        위치여도 새로 만든 아틀라스는 반환한다.
+        """
+        sources = sources_in(directory)
+        atlas = cls.load(path)
+        if atlas is not None and atlas.size == tuple(size) and atlas.is_fresh(sources):
+            return atlas
+        atlas = cls.build(sources, size)
+        try:
+            atlas.save(path)
+        except OSError:
+            pass
+        return atlas
+
+    def is_fresh(self, sources: Sequence[str]) -> bool:
+        """``sources``와 원본 목록이 같고 모든 원본이 그대로인지 확인한다."""
+        if set(sources) != set(self.regions):
+            return False
+        for source in sources:
+            try:
+                stat = os.stat(source)
+            except OSError:
+                return False
+            if self.stamps.get(source) != (stat.st_mtime_ns, stat.st_size):
+                return False
+        return True
+
+    def save(self, path: str = DEFAULT_PATH) -> None:
+        """임시 파일에 쓴 뒤 교체하여 ``path``에 저장한다."""
+        sprites = [
+            [source, x, y, *self.stamps[source]] for source, (x, y, _, _) in self.regions.items()
+        ]
+        header = json.dumps(
+            {"width": self.size[0], "height": self.size[1], "sprites": sprites}, ensure_ascii=False
+        ).encode("utf-8")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = path + ".tmp"
+        with open(temp, "wb") as fp:
+            fp.write(_HEADER.pack(_MAGIC, len(header)) + header + self.png)
+        os.replace(temp, path)
+
+
+def sources_in(directory: str) -> List[str]:
+    """``directory``의 PNG 파일을 화면 코드와 같은 경로 표기로 반환한다."""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [f"{directory.rstrip('/')}/{name}" for name in names if name.lower().endswith(".png")]
+
+
+def main() -> None:
+    """이미지 디렉터리의 PNG 파일로 스프라이트 아틀라스를 미리 만든다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="스프라이트 아틀라스 생성기")
+    parser.add_argument("directory", nargs="?", default="src/drinks")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    atlas = SpriteAtlas.open(args.directory, path=args.output)
+    print(f"{len(atlas)}개의 이미지를 아틀라스에 담았습니다: {args.output} ({len(atlas.png):,} 바이트)")
+
+
+if __name__ == "__main__":
+    main()
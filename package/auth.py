@@ -0,0 +1,347 @@
+import itertools
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from . import metrics
+from .controller import CARD_DENIED, Controller
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# 시간 초과로 끝난 요청의 거절 사유
+TIMEOUT_REASON = "시간 초과"
+
+
+class AuthResult(NamedTuple):
+    """카드 승인 요청의 처리 결과.
+
+    Attributes
+    ----------
+    request_id : int
+        :py:meth:`AuthPipeline.submit`이 돌려준 요청 번호.
+    approved : bool
+        승인 여부.
+    reason : str
+        거절 또는 실패 사유. 승인된 경우 빈 문자열.
+    elapsed : float
+        요청부터 결과까지 걸린 시간(초).
+    cached : bool
+        백엔드에 묻지 않고 :class:`ApprovalCache`의 승인으로 처리했는지 여부.
+    """
+
+    request_id: int
+    approved: bool
+    reason: str
+    elapsed: float
+    cached: bool = False
+
+
+Callback = Callable[[AuthResult], None]
+
+
+class Authorizer:
+    """카드 승인 백엔드의 기본 클래스.
+
+    하위 클래스는 :py:meth:`authorize`를 구현한다. 이 메서드는 작업 스레드에서
+    호출되므로 오래 걸려도 화면을 멈추지 않는다.
+    """
+
+    def authorize(self, number: str, amount: int) -> Tuple[bool, str]:
+        """카드 번호와 금액으로 승인을 요청하고 ``(승인 여부, 사유)``를 반환한다."""
+        raise NotImplementedError
+
+
+class StubAuthorizer(Authorizer):
+    """지연과 거절을 흉내 내는 로컬 승인 백엔드."""
+
+    def __init__(
+        self,
+        latency: Tuple[float, float] = (0.5, 2.0),
+        decline_rate: float = 0.0,
+        declined_numbers: Iterable[str] = (),
+        seed: Optional[int] = None,
+    ) -> None:
+        """승인 지연과 거절 조건을 설정한다.
+
+        Parameters
+        ----------
+        latency : tuple[float, float], optional
+            승인 지연 시간(초)의 최솟값과 최댓값.
+        decline_rate : float, optional
+            무작위로 거절할 확률.
+        declined_numbers : Iterable[str], optional
+            항상 거절할 카드 번호.
+        seed : int, optional
+            지연과 거절을 재현하기 위한 난수 시드.
+        """
+        self.latency = latency
+        self.decline_rate = decline_rate
+        self.declined_numbers = set(declined_numbers)
+        self._random = random.Random(seed)
+
+    def authorize(self, number: str, amount: int) -> Tuple[bool, str]:
+        time.sleep(self._random.uniform(*self.latency))
+        if number in self.declined_numbers:
+            return False, "거절된 카드"
+        if self._random.random() < self.decline_rate:
+            return False, "승인 거절"
+        return True, ""
+
+
+class ApprovalCache:
+    """카드 번호별로 최근 승인을 기억하여 반복 구매의 승인 왕복을 생략하는 캐시.
+
+    백엔드가 승인한 카드는 그때부터 ``ttl``초 동안, 처음 결제한 금액을 포함해
+    ``spend_limit``원까지 다시 승인을 받지 않고 결제할 수 있다. 기간은 사용해도
+    늘어나지 않는다. 승인을 받고도 결제하지 못한 금액은 :py:meth:`refund`로
+    한도에 되돌린다. 항목이 ``max_entries``를 넘으면 가장 오래 쓰지 않은
+    카드부터 버리며, :py:meth:`watch`로 연결한 컨트롤러가 카드를 차단하면 그
+    카드의 항목을 즉시 지운다. 승인 작업 스레드, 화면 스레드와 차단을 알리는
+    스레드가 함께 쓰므로 잠금으로 보호한다. ``hits``와 ``misses``로 적중
+    횟수를 집계한다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        spend_limit: int = 10000,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """빈 캐시를 만든다.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            승인을 재사용할 수 있는 시간(초). 0이면 캐시를 쓰지 않는다.
+        spend_limit : int, optional
+            한 번의 승인으로 기간 안에 결제할 수 있는 총액(원).
+        max_entries : int, optional
+            기억할 카드 수의 상한.
+        clock : Callable[[], float], optional
+            현재 시각(초)을 반환하는 함수.
+        """
+        self.ttl = ttl
+        self.spend_limit = spend_limit
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 카드 번호 -> (만료 시각, 남은 한도)
+        self._entries: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def watch(self, controller: Controller) -> None:
+        """``controller``의 카드 차단 알림을 받아 해당 항목을 지우도록 구독한다."""
+        controller.subscribe(self._on_change)
+
+    def lookup(self, number: str, amount: int) -> bool:
+        """유효한 승인이 있고 남은 한도가 ``amount`` 이상이면 한도를 차감하고 ``True``."""
+        with self._lock:
+            entry = self._entries.get(number)
+            if entry is not None:
+                expires, remaining = entry
+                if expires <= self.clock():
+                    del self._entries[number]
+                elif remaining >= amount:
+                    self._entries[number] = (expires, remaining - amount)
+                    self._entries.move_to_end(number)
+                    self.hits += 1
+                    return True
+            self.misses += 1
+            return False
+
+    def store(self, number: str, amount: int) -> None:
+        """백엔드가 ``amount``원 결제를 승인한 ``number`` 카드를 기억한다."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[number] = (self.clock() + self.ttl, max(0, self.spend_limit - amount))
+            self._entries.move_to_end(number)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refund(self, number: str, amount: int) -> None:
+        """결제하지 못한 ``amount``원을 ``number`` 카드의 남은 한도에 되돌린다.
+
+        승인(캐시 적중 포함) 뒤에 품절 등으로 결제가 이루어지지 않았을 때
+        호출한다. 항목이 없거나 만료되었으면 아무것도 하지 않는다.
+        """
+        with self._lock:
+            entry = self._entries.get(number)
+            if entry is not None and entry[0] > self.clock():
+                expires, remaining = entry
+                self._entries[number] = (expires, min(self.spend_limit, remaining + amount))
+
+    def invalidate(self, number: str) -> bool:
+        """``number`` 카드의 항목을 지우고, 있었는지 반환한다."""
+        with self._lock:
+            return self._entries.pop(number, None) is not None
+
+    def clear(self) -> None:
+        """모든 항목을 지운다. 집계된 적중/미스 횟수는 유지된다."""
+        with self._lock:
+            self._entries.clear()
+
+    def hit_rate(self) -> float:
+        """조회 중 캐시로 처리한 비율. 조회가 없었으면 0."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """적중/미스 횟수, 적중률과 현재 항목 수를 반환한다."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "entries": len(self._entries),
+        }
+
+    def _on_change(self, event: str, payload: Dict[str, Any]) -> None:
+        if event == CARD_DENIED:
+            self.invalidate(payload["number"])
+
+
+class AuthPipeline:
+    """승인 요청을 스레드 풀에서 처리하고 결과를 큐로 돌려준다.
+
+    작업 스레드는 결과를 스레드 안전한 큐에 넣기만 하고, 콜백은 화면 스레드에서
+    :py:meth:`poll`을 호출할 때 실행된다. 요청마다 제한 시간을 두며, 제한 시간이
+    지나거나 :py:meth:`cancel`로 취소된 요청의 늦은 결과는 버린다.
+
+    ``cache``가 주어지면 최근에 승인된 카드의 요청은 작업 스레드를 거치지 않고
+    바로 승인 결과를 큐에 넣으며, 백엔드가 새로 승인한 카드를 캐시에 기록한다.
+    """
+
+    def __init__(self, authorizer: Authorizer, workers: int = 2, timeout: float = 5.0,
+                 cache: Optional[ApprovalCache] = None) -> None:
+        """승인 파이프라인을 생성한다.
+
+        Parameters
+        ----------
+        authorizer : :class:`Authorizer`
+            실제 승인을 처리할 백엔드.
+        workers : int, optional
+            작업 스레드 수.
+        timeout : float, optional
+            요청별 기본 제한 시간(초).
+        cache : :class:`ApprovalCache`, optional
+            반복 구매에 재사용할 승인 캐시.
+        """
+        self.authorizer = authorizer
+        self.cache = cache
+        self.timeout = timeout
+        self.workers = workers
+        # 작업 스레드 풀은 첫 요청 때 만든다(시작 시간 단축)
+        self._executor: "Optional[ThreadPoolExecutor]" = None
+        self._results: "queue.Queue[AuthResult]" = queue.Queue()
+        self._ids = itertools.count(1)
+        # 요청 번호 -> (시작 시각, 마감 시각, 콜백, 카드 번호, 금액)
+        self._pending: Dict[int, Tuple[float, float, Callback, str, int]] = {}
+
+    def submit(self, number: str, amount: int, callback: Callback, timeout: Optional[float] = None) -> int:
+        """승인 요청을 작업 스레드에 맡기고 요청 번호를 반환한다.
+
+        Parameters
+        ----------
+        number : str
+            카드 번호.
+        amount : int
+            결제 금액.
+        callback : Callable[[AuthResult], None]
+            결과가 나오면 :py:meth:`poll`을 호출한 스레드에서 실행할 함수.
+        timeout : float, optional
+            제한 시간(초). 생략하면 기본값을 사용한다.
+
+        캐시된 승인이 있으면 결과는 곧바로 큐에 들어가므로 이어서
+        :py:meth:`poll`을 부르면 콜백이 바로 실행된다.
+        """
+        request_id = next(self._ids)
+        started = time.monotonic()
+        limit = self.timeout if timeout is None else timeout
+        self._pending[request_id] = (started, started + limit, callback, number, amount)
+        if self.cache is not None and self.cache.lookup(number, amount):
+            self._results.put(AuthResult(request_id, True, "", time.monotonic() - started, cached=True))
+            return request_id
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="card-auth")
+        self._executor.submit(self._run, request_id, number, amount, started)
+        return request_id
+
+    def cancel(self, request_id: int) -> bool:
+        """대기 중인 요청을 취소한다. 이미 끝난 요청이면 ``False``를 반환한다."""
+        cancelled = self._pending.pop(request_id, None) is not None
+        if cancelled and metrics.enabled:
+            metrics.CARD_AUTH.inc("cancelled")
+        return cancelled
+
+    def elapsed(self, request_id: int) -> float:
+        """대기 중인 요청이 시작된 뒤 지난 시간(초)을 반환한다."""
+        entry = self._pending.get(request_id)
+        return 0.0 if entry is None else time.monotonic() - entry[0]
+
+    def pending(self) -> int:
+        """결과를 기다리는 요청 수를 반환한다."""
+        return len(self._pending)
+
+    def poll(self) -> None:
+        """도착한 결과와 제한 시간이 지난 요청의 콜백을 실행한다.
+
+        화면 스레드에서 주기적으로 호출한다.
+        """
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            entry = self._pending.pop(result.request_id, None)
+            if entry is not None:
+                _record(result)
+                if result.approved and not result.cached and self.cache is not None:
+                    self.cache.store(entry[3], entry[4])
+                entry[2](result)
+
+        now = time.monotonic()
+        expired = [rid for rid, entry in self._pending.items() if entry[1] <= now]
+        for request_id in expired:
+            started, _, callback, _, _ = self._pending.pop(request_id)
+            result = AuthResult(request_id, False, TIMEOUT_REASON, now - started)
+            _record(result)
+            callback(result)
+
+    def shutdown(self) -> None:
+        """작업 스레드를 정리한다. 대기 중인 요청의 결과는 버린다."""
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, request_id: int, number: str, amount: int, started: float) -> None:
+        try:
+            approved, reason = self.authorizer.authorize(number, amount)
+        except Exception as exc:  # 백엔드 오류는 거절로 처리한다
+            approved, reason = False, f"승인 오류: {exc}"
+        self._results.put(AuthResult(request_id, approved, reason, time.monotonic() - started))
+
+
+def _record(result: AuthResult) -> None:
+    if not metrics.enabled:
+        return
+    if result.cached:
+        outcome = "cached"
+    elif result.approved:
+        outcome = "approved"
+    elif result.reason == TIMEOUT_REASON:
+        outcome = "timeout"
+    else:
+        outcome = "declined"
+    metrics.CARD_AUTH.inc(outcome)
+    metrics.CARD_AUTH_SECONDS.observe(result.elapsed)
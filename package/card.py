@@ -1,11 +1,18 @@
 import re
+from typing import Optional
+
+from .card_index import CardIndex, OverlayCardIndex, SetCardIndex
+
+# 10자리 영문/숫자 카드 번호 형식
+_CARD_PATTERN = re.compile(r"[A-Za-z0-9]{10}")
 
 
 class Card:
     """카드 결제를 위한 간단한 인증 모델.
 
     주요 속성으로 ``status``(결제 승인 여부), ``inserted``(카드 삽입 상태),
-    ``number``(삽입된 카드 번호)을 관리한다.
+    ``number``(삽입된 카드 번호)을 관리한다. 유효한 카드 번호는 ``allowed``
+    인덱스에서, 차단된 번호는 ``denied`` 인덱스에서 조회한다.
     """
 
     # Predefined valid card numbers
@@ -15,12 +22,25 @@ class Card:
         "A1B2C3D4E5",
     ]
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        allowed: Optional[CardIndex] = None,
+        denied: Optional[CardIndex] = None,
+    ) -> None:
         """카드 상태와 번호를 초기화한다.
 
-        매개변수는 없으며 ``status``와 ``inserted``를 ``False``로,
-        ``number``를 빈 문자열로 설정하여 초기 상태를 만든다.
+        Parameters
+        ----------
+        allowed : :class:`CardIndex`, optional
+            유효한 카드 번호 인덱스. 생략하면 ``__CARD_ID`` 목록을 사용한다.
+        denied : :class:`CardIndex`, optional
+            차단할 카드 번호 인덱스.
+
+        ``status``와 ``inserted``를 ``False``로, ``number``를 빈 문자열로
+        설정하여 초기 상태를 만든다.
         """
+        self.allowed = allowed if allowed is not None else SetCardIndex(self.__CARD_ID)
+        self.denied = denied
         # 결제 승인 여부
         self.status = False
         # 카드 삽입 여부
@@ -36,11 +56,14 @@ class Card:
         number : str
             10자리 영문/숫자로 이루어진 카드 번호.
 
-        ``__CARD_ID`` 목록과 비교하여 일치하면 ``number``와 ``inserted``를
-        갱신하고 ``status``를 초기화한다.
+        ``allowed`` 인덱스에 있고 ``denied`` 인덱스에 없으면 ``number``와
+        ``inserted``를 갱신하고 ``status``를 초기화한다.
         """
-        pattern = r"^[A-Za-z0-9]{10}$"
-        if re.fullmatch(pattern, number) and number in self.__CARD_ID:
+        if (
+            _CARD_PATTERN.fullmatch(number)
+            and number in self.allowed
+            and (self.denied is None or number not in self.denied)
+        ):
             self.number = number
             self.inserted = True
             self.status = False
@@ -63,6 +86,19 @@ class Card:
         self.inserted = False
         self.status = False
 
+    def deny(self, number: str) -> None:
+        """카드 번호를 ``denied`` 인덱스에 추가하여 이후 삽입을 막는다.
+
+        ``denied``가 없으면 빈 :class:`SetCardIndex`를 만든다. 파일을 메모리
+        매핑한 인덱스처럼 바꿀 수 없는 인덱스면 :class:`OverlayCardIndex`로 감싸
+        추가한 번호만 따로 보관한다.
+        """
+        if self.denied is None:
+            self.denied = SetCardIndex()
+        elif not isinstance(self.denied, (SetCardIndex, OverlayCardIndex)):
+            self.denied = OverlayCardIndex(self.denied)
+        self.denied.add(number)
+
     def accept(self) -> bool:
         """호환성을 위해 승인 상태를 반환한다.
 
@@ -0,0 +1,288 @@
+import hashlib
+import mmap
+import struct
+from typing import Any, Iterable, Iterator, Optional
+
+# 정렬 인덱스 파일에서 카드 번호 하나가 차지하는 바이트 수
+RECORD_SIZE = 10
+
+_BLOOM_HEADER = struct.Struct("<4sII")
+_BLOOM_MAGIC = b"BLM1"
+
+
+class CardIndex:
+    """카드 번호 집합의 기본 클래스.
+
+    하위 클래스는 ``number in index`` 형태의 조회를 제공한다.
+    """
+
+    def __contains__(self, number: object) -> bool:
+        raise NotImplementedError
+
+
+class SetCardIndex(CardIndex):
+    """해시 집합에 카드 번호를 보관하는 O(1) 인덱스."""
+
+    def __init__(self, numbers: Iterable[str] = ()) -> None:
+        """카드 번호 목록으로 집합을 만든다."""
+        self._numbers = set(numbers)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SetCardIndex":
+        """한 줄에 카드 번호 하나씩 적힌 텍스트 파일을 읽는다. 빈 줄은 무시한다."""
+        with open(path, encoding="ascii") as fp:
+            return cls(line.strip() for line in fp if line.strip())
+
+    def __contains__(self, number: object) -> bool:
+        return number in self._numbers
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._numbers)
+
+    def add(self, number: str) -> None:
+        """카드 번호를 추가한다."""
+        self._numbers.add(number)
+
+    def discard(self, number: str) -> None:
+        """카드 번호가 있으면 제거한다."""
+        self._numbers.discard(number)
+
+
+class OverlayCardIndex(CardIndex):
+    """바꿀 수 없는 인덱스 위에 실행 중에 추가한 번호를 얹은 인덱스.
+
+    :class:`SortedCardIndex`처럼 파일을 메모리 매핑한 인덱스는 그대로 두고,
+    추가한 번호는 작은 :class:`SetCardIndex`인 ``added``에 보관한다. 조회는
+    ``added``를 먼저 보고 ``base``를 본다.
+    """
+
+    def __init__(self, base: CardIndex, added: Iterable[str] = ()) -> None:
+        """``base`` 위에 ``added`` 번호를 얹는다."""
+        self.base = base
+        self.added = SetCardIndex(added)
+
+    def __contains__(self, number: object) -> bool:
+        return number in self.added or number in self.base
+
+    def add(self, number: str) -> None:
+        """카드 번호를 ``added``에 추가한다."""
+        self.added.add(number)
+
+
+class BloomFilter:
+    """빠른 거절을 위한 블룸 필터.
+
+    ``False``를 돌려주면 집합에 확실히 없고, ``True``면 있을 수도 있다.
+    비트 배열은 ``bytes``, ``bytearray`` 또는 메모리 매핑된 파일을 그대로 쓴다.
+    """
+
+    def __init__(self, bits, num_bits: int, num_hashes: int) -> None:
+        self._bits = bits
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+
+    @classmethod
+    def build(cls, numbers: Iterable[bytes], count: int, bits_per_entry: int = 10) -> "BloomFilter":
+        """``count``개의 카드 번호로 필터를 만든다.
+
+        ``bits_per_entry``가 10이면 거짓 양성 확률은 약 1%이다.
+        """
+        num_bits = max(8, count * bits_per_entry)
+        num_hashes = max(1, round(bits_per_entry * 0.693))
+        bloom = cls(bytearray((num_bits + 7) // 8), num_bits, num_hashes)
+        for number in numbers:
+            for position in bloom._positions(number):
+                bloom._bits[position >> 3] |= 1 << (position & 7)
+        return bloom
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """:py:meth:`save`로 저장한 파일을 메모리 매핑하여 연다."""
+        with open(path, "rb") as fp:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, num_bits, num_hashes = _BLOOM_HEADER.unpack_from(data)
+        if magic != _BLOOM_MAGIC:
+            raise ValueError(f"블룸 필터 파일이 아닙니다: {path}")
+        return cls(memoryview(data)[_BLOOM_HEADER.size:], num_bits, num_hashes)
+
+    def save(self, path: str) -> None:
+        """필터를 파일로 저장한다."""
+        with open(path, "wb") as fp:
+            fp.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, self.num_bits, self.num_hashes))
+            fp.write(self._bits)
+
+    def might_contain(self, number: bytes) -> bool:
+        bits = self._bits
+        for position in self._positions(number):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _positions(self, number: bytes):
+        # 128비트 해시를 둘로 나누어 이중 해싱으로 위치를 만든다
+        digest = hashlib.blake2b(number, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+
+class SortedCardIndex(CardIndex):
+    """정렬된 고정 길이 레코드 파일을 메모리 매핑하여 이진 탐색하는 인덱스.
+
+    파일은 10바이트 ASCII 카드 번호를 구분자 없이 정렬된 순서로 이어 붙인
+    형태이며 :func:`write_sorted_index`로 만든다. 시작할 때 파일을 읽어 문자열로
+    바꾸지 않으므로 수백만 건이어도 메모리와 시작 시간이 거의 늘지 않는다.
+    블룸 필터를 함께 주면 없는 번호 대부분을 파일을 건드리지 않고 거절한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bloom: Optional[BloomFilter] = None,
+        offset: int = 0,
+        count: Optional[int] = None,
+    ) -> None:
+        """인덱스 파일을 연다.
+
+        Parameters
+        ----------
+        path : str
+            :func:`write_sorted_index`로 만든 인덱스 파일 경로.
+        bloom : :class:`BloomFilter`, optional
+            빠른 거절에 사용할 블룸 필터.
+        offset : int, optional
+            레코드가 시작하는 위치. 스냅샷처럼 다른 내용 사이에 레코드 구역이
+            있는 파일을 열 때 쓴다.
+        count : int, optional
+            레코드 수. 생략하면 ``offset``부터 파일 끝까지를 레코드로 본다.
+        """
+        with open(path, "rb") as fp:
+            size = fp.seek(0, 2)
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._attach(data, bloom, offset, count, path)
+
+    @classmethod
+    def from_buffer(
+        cls,
+        data: bytes,
+        bloom: Optional[BloomFilter] = None,
+        offset: int = 0,
+        count: Optional[int] = None,
+    ) -> "SortedCardIndex":
+        """메모리에 있는 정렬된 레코드 바이트로 인덱스를 만든다. 인자는 생성자와 같다."""
+        index = cls.__new__(cls)
+        index._attach(data, bloom, offset, count, "버퍼")
+        return index
+
+    def _attach(self, data: Any, bloom: Optional[BloomFilter], offset: int, count: Optional[int],
+                source: str) -> None:
+        if count is None:
+            if (len(data) - offset) % RECORD_SIZE:
+                raise ValueError(f"인덱스 파일 크기가 {RECORD_SIZE}의 배수가 아닙니다: {source}")
+            count = (len(data) - offset) // RECORD_SIZE
+        elif offset + count * RECORD_SIZE > len(data):
+            raise ValueError(f"인덱스 레코드가 잘렸습니다: {source}")
+        self._data = data
+        self._base = offset
+        self._count = count
+        self.bloom = bloom
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, number: object) -> bool:
+        if not isinstance(number, str) or len(number) != RECORD_SIZE:
+            return False
+        try:
+            key = number.encode("ascii")
+        except UnicodeEncodeError:
+            return False
+        if self.bloom is not None and not self.bloom.might_contain(key):
+            return False
+        data = self._data
+        base = self._base
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            offset = base + mid * RECORD_SIZE
+            record = data[offset:offset + RECORD_SIZE]
+            if record < key:
+                low = mid + 1
+            elif record > key:
+                high = mid
+            else:
+                return True
+        return False
+
+
+def write_sorted_index(
+    numbers: Iterable[str],
+    path: str,
+    bloom_path: Optional[str] = None,
+    bits_per_entry: int = 10,
+) -> int:
+    """카드 번호 목록으로 :class:`SortedCardIndex` 파일을 만들고 개수를 반환한다.
+
+    Parameters
+    ----------
+    numbers : Iterable[str]
+        10자리 카드 번호 목록. 중복은 제거된다.
+    path : str
+        저장할 인덱스 파일 경로.
+    bloom_path : str, optional
+        주어지면 같은 번호로 만든 블룸 필터를 이 경로에 저장한다.
+    bits_per_entry : int, optional
+        블룸 필터의 번호당 비트 수.
+    """
+    records = sorted_records(numbers)
+    with open(path, "wb") as fp:
+        fp.write(records)
+    count = len(records) // RECORD_SIZE
+    if bloom_path is not None:
+        keys = (records[i:i + RECORD_SIZE] for i in range(0, len(records), RECORD_SIZE))
+        BloomFilter.build(keys, count, bits_per_entry).save(bloom_path)
+    return count
+
+
+def sorted_records(numbers: Iterable[str]) -> bytes:
+    """카드 번호 목록을 :class:`SortedCardIndex`가 읽는 정렬된 레코드 바이트로 만든다.
+
+    중복은 제거하며, ``RECORD_SIZE``자리가 아닌 번호가 있으면 ``ValueError``를
+    일으킨다.
+    """
+    records = sorted({number.encode("ascii") for number in numbers})
+    for record in records:
+        if len(record) != RECORD_SIZE:
+            raise ValueError(f"카드 번호는 {RECORD_SIZE}자리여야 합니다: {record!r}")
+    return b"".join(records)
+
+
+def open_sorted_index(path: str, bloom_path: Optional[str] = None) -> SortedCardIndex:
+    """인덱스 파일과 (있으면) 블룸 필터 파일을 열어 :class:`SortedCardIndex`를 만든다."""
+    bloom = BloomFilter.open(bloom_path) if bloom_path is not None else None
+    return SortedCardIndex(path, bloom)
+
+
+def main() -> None:
+    """텍스트 카드 번호 목록으로 정렬 인덱스와 블룸 필터 파일을 만든다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="카드 번호 인덱스 생성기")
+    parser.add_argument("source", help="한 줄에 카드 번호 하나씩 적힌 텍스트 파일")
+    parser.add_argument("output", help="저장할 인덱스 파일")
+    parser.add_argument("--bloom", help="함께 저장할 블룸 필터 파일")
+    parser.add_argument("--bits-per-entry", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.source, encoding="ascii") as fp:
+        numbers = (line.strip() for line in fp if line.strip())
+        count = write_sorted_index(numbers, args.output, args.bloom, args.bits_per_entry)
+    print(f"{count}개의 카드 번호를 저장했습니다: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
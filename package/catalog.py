@@ -0,0 +1,335 @@
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .drink import Drink
+
+if TYPE_CHECKING:
+    from .controller import Controller
+
+# CSV 카탈로그의 열 이름
+FIELDS = ("name", "price", "count", "image_path")
+
+# Define the vending machine drinks. The first two are water priced at 800
+# won. All other drinks cost between 1000 and 1800 won. Each image may be
+# reused, but no drink type appears more than twice in a row and a variety
+# of names is used.
+DRINK_INFOS: List[Tuple[str, int, str]] = [
+    ("물", 800, "src/drinks/water.png"),
+    ("물", 800, "src/drinks/water.png"),
+    ("레몬에이드", 1000, "src/drinks/ade.png"),
+    ("자몽에이드", 1000, "src/drinks/ade.png"),
+    ("칠성 사이다", 1100, "src/drinks/cider.png"),
+    ("제로 사이다", 1100, "src/drinks/cider.png"),
+    ("코카콜라", 1200, "src/drinks/coke.png"),
+    ("코카콜라 제로", 1200, "src/drinks/coke.png"),
+    ("환타 오렌지", 1300, "src/drinks/fanta.png"),
+    ("환타 파인애플", 1300, "src/drinks/fanta.png"),
+    ("이온워터", 1400, "src/drinks/ion.png"),
+    ("파워 이온", 1400, "src/drinks/ion.png"),
+    ("청량 탄산수", 1500, "src/drinks/soda.png"),
+    ("라임 탄산수", 1500, "src/drinks/soda.png"),
+    ("아이스 블루", 1600, "src/drinks/ade.png"),
+    ("자몽 스파클", 1600, "src/drinks/ade.png"),
+    ("더블 사이다", 1700, "src/drinks/cider.png"),
+    ("스위트 사이다", 1700, "src/drinks/cider.png"),
+    ("고급 콜라", 1800, "src/drinks/coke.png"),
+    ("다크 콜라", 1800, "src/drinks/coke.png"),
+    ("환타 포도", 1100, "src/drinks/fanta.png"),
+    ("환타 레몬", 1100, "src/drinks/fanta.png"),
+    ("하이드레이션 워터", 1200, "src/drinks/ion.png"),
+    ("스포츠 워터", 1200, "src/drinks/ion.png"),
+]
+
+
+def default_drinks(slots: int = 24, stock: int = 10) -> List[Drink]:
+    """기본 음료 구성으로 ``slots``개의 음료 객체를 만든다.
+
+    Parameters
+    ----------
+    slots : int, optional
+        만들 음료 수. ``DRINK_INFOS``보다 많으면 처음부터 반복한다.
+    stock : int, optional
+        음료마다 채울 재고 수량.
+    """
+    drinks: List[Drink] = []
+    for i in range(slots):
+        name, price, image = DRINK_INFOS[i % len(DRINK_INFOS)]
+        drinks.append(Drink(name, price, stock, image))
+    return drinks
+
+
+class CatalogError(ValueError):
+    """카탈로그 행이 올바르지 않을 때 발생하는 예외.
+
+    Attributes
+    ----------
+    source : str
+        카탈로그 파일 경로.
+    line : int
+        문제가 있는 행 번호(CSV는 머리글이 1행, JSON 배열은 원소 순서).
+    """
+
+    def __init__(self, source: str, line: int, message: str) -> None:
+        super().__init__(f"{source}:{line}: {message}")
+        self.source = source
+        self.line = line
+
+
+def _number(row: Dict[str, Any], key: str) -> int:
+    value = row.get(key)
+    if isinstance(value, bool) or value is None:
+        raise ValueError(f"{key} 값이 없습니다")
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.lstrip("-").isdigit():
+            raise ValueError(f"{key} 값이 정수가 아닙니다: {value!r}")
+        value = int(value)
+    if not isinstance(value, int):
+        raise ValueError(f"{key} 값이 정수가 아닙니다: {value!r}")
+    if value < 0:
+        raise ValueError(f"{key} 값이 음수입니다: {value}")
+    return value
+
+
+def _rows(path: str) -> Iterator[Tuple[int, Any]]:
+    """파일 형식에 맞게 ``(행 번호, 행)``을 하나씩 읽는다."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as fp:
+        if extension == ".csv":
+            reader = csv.DictReader(fp)
+            missing = [key for key in FIELDS if key not in (reader.fieldnames or ())]
+            if missing:
+                raise CatalogError(path, 1, f"열이 없습니다: {', '.join(missing)}")
+            for row in reader:
+                yield reader.line_num, row
+        elif extension == ".json":
+            # JSON 배열은 한 번에 읽지만 검증과 추가는 행 단위로 한다
+            for line, row in enumerate(json.load(fp), 1):
+                yield line, row
+        elif extension in (".jsonl", ".ndjson"):
+            for line, text in enumerate(fp, 1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except ValueError as exc:
+                    raise CatalogError(path, line, f"JSON 형식 오류: {exc}") from None
+        else:
+            raise CatalogError(path, 0, f"지원하지 않는 카탈로그 형식: {extension}")
+
+
+def iter_catalog(path: str, errors: Optional[List[CatalogError]] = None) -> Iterator[Drink]:
+    """카탈로그 파일을 한 행씩 읽고 검증하여 음료 객체를 만든다.
+
+    Parameters
+    ----------
+    path : str
+        ``name,price,count,image_path`` 열이 있는 CSV 파일, 같은 키를 가진
+        객체의 JSON 배열(``.json``) 또는 한 줄에 객체 하나인 JSON Lines
+        (``.jsonl``) 파일.
+    errors : List[:class:`CatalogError`], optional
+        주어지면 잘못된 행을 건너뛰고 오류를 여기에 모은다. 없으면 첫 오류에서
+        :class:`CatalogError`를 발생시킨다.
+
+    가격과 재고는 0 이상의 정수여야 하고 이미지 파일이 있어야 한다. 같은
+    이미지를 쓰는 행이 많으므로 이미지 확인 결과는 경로별로 한 번만 구한다.
+    """
+    images: Dict[str, bool] = {}
+    for line, row in _rows(path):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("행이 객체가 아닙니다")
+            name = str(row.get("name") or "").strip()
+            if not name:
+                raise ValueError("name 값이 없습니다")
+            price = _number(row, "price")
+            count = _number(row, "count")
+            image_path = str(row.get("image_path") or "").strip()
+            if image_path not in images:
+                images[image_path] = bool(image_path) and os.path.isfile(image_path)
+            if not images[image_path]:
+                raise ValueError(f"이미지 파일이 없습니다: {image_path!r}")
+        except ValueError as exc:
+            error = CatalogError(path, line, str(exc))
+            if errors is None:
+                raise error from None
+            errors.append(error)
+            continue
+        yield Drink(name, price, count, image_path)
+
+
+def load_catalog(path: str, errors: Optional[List[CatalogError]] = None) -> List[Drink]:
+    """:func:`iter_catalog`로 카탈로그 전체를 읽어 목록으로 반환한다.
+
+    파일 읽기와 검증은 행 단위로 이루어지고 목록에는 검증을 통과한 음료만
+    쌓인다. 컨트롤러에 조금씩 넣지 않고 목록을 모으는 이유는
+    :func:`read_catalog`를 참고한다.
+    """
+    return list(iter_catalog(path, errors))
+
+
+def read_catalog(path: str, errors: List[CatalogError]) -> Optional[List[Drink]]:
+    """카탈로그 파일 전체를 읽되, 하나라도 문제가 있으면 아무것도 반환하지 않는다.
+
+    Parameters
+    ----------
+    path : str
+        :func:`iter_catalog`가 읽을 수 있는 카탈로그 파일 경로.
+    errors : List[:class:`CatalogError`]
+        잘못된 행과 파일을 읽지 못한 오류를 모을 목록.
+
+    슬롯은 행 위치로 대응되므로 한 행을 건너뛰면 그 뒤의 음료가 모두 한 칸씩
+    밀려 기록, 제어 API, 화면이 다른 음료를 가리키게 된다. 그래서 시작할 때와
+    다시 읽을 때 모두 잘못된 행이 있으면 파일 전체를 반영하지 않는다. 오류가
+    있으면 ``None``을 반환한다.
+
+    그래서 검증이 끝나기 전에는 컨트롤러에 아무것도 넣지 않는다. 행을 묶음으로
+    나누어 넣으면 잘못된 행을 만났을 때 이미 넣은 슬롯을 되돌려야 하는데,
+    슬롯은 지우지 않는 것이 원칙이고(:func:`apply_catalog` 참고) 묶음마다 나간
+    ``layout`` 알림을 기록과 화면이 이미 반영한 뒤이다. 검증한 목록은
+    :py:meth:`Controller.extend_drinks` 한 번으로 넣으므로 슬롯 수와 관계없이
+    변경 알림은 하나이다.
+    """
+    try:
+        drinks = load_catalog(path, errors)
+    except (OSError, ValueError) as exc:
+        errors.append(exc if isinstance(exc, CatalogError) else CatalogError(path, 0, str(exc)))
+        return None
+    return None if errors else drinks
+
+
+@dataclass
+class CatalogDiff:
+    """카탈로그를 다시 적용했을 때 바뀐 슬롯 위치 목록.
+
+    Attributes
+    ----------
+    added : List[int]
+        새로 추가된 슬롯.
+    replaced : List[int]
+        다른 음료(이름 또는 이미지)로 바뀐 슬롯.
+    repriced : List[int]
+        가격만 바뀐 슬롯.
+    restocked : List[int]
+        재고가 카탈로그 값으로 바뀐 슬롯.
+    emptied : List[int]
+        카탈로그에서 빠져 재고를 비운 슬롯.
+    """
+
+    added: List[int] = field(default_factory=list)
+    replaced: List[int] = field(default_factory=list)
+    repriced: List[int] = field(default_factory=list)
+    restocked: List[int] = field(default_factory=list)
+    emptied: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.replaced or self.repriced or self.restocked or self.emptied)
+
+
+def apply_catalog(controller: "Controller", drinks: Iterable[Drink], restock: bool = False) -> CatalogDiff:
+    """카탈로그 음료를 슬롯 순서대로 ``controller``에 반영하고 바뀐 부분만 적용한다.
+
+    Parameters
+    ----------
+    controller : :class:`Controller`
+        음료를 반영할 컨트롤러.
+    drinks : Iterable[:class:`Drink`]
+        슬롯 순서대로 나열된 음료. :func:`iter_catalog`를 그대로 넘길 수 있다.
+    restock : bool, optional
+        참이면 이름과 이미지가 같은 슬롯의 재고도 카탈로그 값으로 맞춘다. 기본
+        값은 판매로 줄어든 현재 재고를 유지한다.
+
+    기존 슬롯은 값이 다를 때만 가격, 재고 또는 음료 전체를 바꾸고 남는 행은
+    :py:meth:`Controller.extend_drinks`로 한 번에 추가하므로 변경 알림은 바뀐
+    슬롯에 대해서만 나간다. 슬롯 위치는 기록과 화면이 가리키는 번호이므로
+    카탈로그가 짧아져도 슬롯을 지우지 않고 재고만 0으로 비운다.
+    """
+    diff = CatalogDiff()
+    current = controller.drinks
+    existing = len(current)
+    iterator = iter(drinks)
+    slot = 0
+    for drink in iterator:
+        if slot >= existing:
+            # 나머지는 새 슬롯이므로 남은 행과 함께 한 번에 추가한다
+            added = controller.extend_drinks(_chain(drink, iterator))
+            diff.added = [view.index for view in added]
+            break
+        view = current[slot]
+        if (view.name, view.image_path) != (drink.name, drink.image_path):
+            controller.replace_drink(slot, drink)
+            diff.replaced.append(slot)
+        else:
+            if view.price != drink.price:
+                controller.set_price(view, drink.price)
+                diff.repriced.append(slot)
+            if restock and view.count != drink.count:
+                controller.set_stock(view, drink.count)
+                diff.restocked.append(slot)
+        slot += 1
+    else:
+        for view in current[slot:existing]:
+            if view.count:
+                controller.set_stock(view, 0)
+                diff.emptied.append(view.index)
+    return diff
+
+
+def _chain(first: Drink, rest: Iterator[Drink]) -> Iterator[Drink]:
+    yield first
+    yield from rest
+
+
+class CatalogWatcher:
+    """카탈로그 파일이 바뀌면 다시 읽어 차이만 컨트롤러에 반영한다.
+
+    화면 스레드에서 ``root.after``로 :py:meth:`poll`을 주기적으로 부르는
+    용도이며, 파일의 수정 시각과 크기가 바뀌었을 때만 파일을 읽는다.
+    """
+
+    def __init__(self, path: str, controller: "Controller", restock: bool = False) -> None:
+        """감시할 카탈로그 파일과 반영할 컨트롤러를 정한다.
+
+        Parameters
+        ----------
+        path : str
+            카탈로그 파일 경로.
+        controller : :class:`Controller`
+            바뀐 내용을 반영할 컨트롤러.
+        restock : bool, optional
+            :func:`apply_catalog`의 ``restock`` 인자.
+        """
+        self.path = path
+        self.controller = controller
+        self.restock = restock
+        self.errors: List[CatalogError] = []
+        self._stamp = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[CatalogDiff]:
+        """파일이 바뀌었으면 다시 적용하고 :class:`CatalogDiff`를 반환한다.
+
+        파일은 :func:`read_catalog`로 읽으므로 잘못된 행이 하나라도 있으면
+        ``errors``에 모으고 이번 파일은 반영하지 않는다. 저장 도중의 파일처럼
+        전체를 읽지 못한 경우도 같으며, 저장이 끝나면 수정 시각이 다시 바뀌므로
+        그때 다시 읽는다. 파일이 바뀌지 않았거나 반영하지 않았으면 ``None``을
+        반환한다.
+        """
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        self.errors = []
+        drinks = read_catalog(self.path, self.errors)
+        if drinks is None:
+            return None
+        return apply_catalog(self.controller, drinks, self.restock)
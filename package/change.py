@@ -0,0 +1,251 @@
+from collections import deque
+from dataclasses import dataclass, field
+from math import gcd
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Change:
+    """거스름돈 계산 결과.
+
+    Attributes
+    ----------
+    coins : Dict[int, int]
+        ``{화폐단위: 개수}`` 형태의 지급 내역. 큰 단위부터 정렬되어 있다.
+    shortfall : int
+        시재가 부족하여 지급하지 못한 금액. 정확히 거슬러 줄 수 있으면 0.
+    """
+
+    coins: Dict[int, int] = field(default_factory=dict)
+    shortfall: int = 0
+
+    @property
+    def exact(self) -> bool:
+        """요청 금액을 정확히 지급할 수 있는지 여부."""
+        return self.shortfall == 0
+
+
+def make_change(amount: int, cashes: Dict[int, int]) -> Change:
+    """보유 시재 안에서 가장 적은 개수의 화폐로 거스름돈을 계산한다.
+
+    Parameters
+    ----------
+    amount : int
+        거슬러 줄 금액.
+    cashes : Dict[int, int]
+        ``{화폐단위: 보유 개수}`` 형태의 현재 시재. 값은 변경하지 않는다.
+
+    화폐 단위별 보유 개수를 한도로 하는 동전 교환 문제를 동적 계획법으로 풀어
+    단위마다 지급 개수를 한 번에 결정한다. 배수 관계인 화폐 체계는 탐욕 계산만으로
+    같은 답이 나오므로 바로 계산한다. 정확한 금액을 만들 수 없으면 만들 수 있는 가장 큰 금액을
+    지급 내역으로 하고 나머지를 ``shortfall``로 돌려준다.
+    """
+    if amount <= 0:
+        return Change()
+    denominations = sorted(
+        (currency for currency, count in cashes.items() if count > 0 and currency <= amount),
+        reverse=True,
+    )
+    if not denominations:
+        return Change(shortfall=amount)
+
+    # 큰 단위가 작은 단위의 배수인 화폐 체계에서는 큰 단위를 가능한 만큼 쓰는
+    # 탐욕 방식이 지급액은 최대, 개수는 최소가 되므로 단위마다 개수를 바로 정한다
+    if all(big % small == 0 for big, small in zip(denominations, denominations[1:])):
+        coins: Dict[int, int] = {}
+        remaining = amount
+        for currency in denominations:
+            count = min(cashes[currency], remaining // currency)
+            if count:
+                coins[currency] = count
+                remaining -= count * currency
+        return Change(coins, remaining)
+
+    # 모든 화폐 단위의 최대공약수를 한 칸으로 하여 상태 수를 줄인다
+    unit = 0
+    for currency in denominations:
+        unit = gcd(unit, currency)
+    size = amount // unit
+
+    inf = size + 1
+    best: List[int] = [0] + [inf] * size
+    # layers[i][v]: i번째 화폐 단위로 금액 v를 만들 때 사용한 개수
+    layers: List[List[int]] = []
+    for currency in denominations:
+        step = currency // unit
+        limit = min(cashes[currency], size // step)
+        new_best = [inf] * (size + 1)
+        used = [0] * (size + 1)
+        # 같은 나머지를 갖는 금액끼리 최근 limit칸의 최솟값을 단조 큐로 유지
+        for start in range(min(step, size + 1)):
+            window: Deque[Tuple[int, int]] = deque()
+            for j, value in enumerate(range(start, size + 1, step)):
+                key = best[value] - j
+                while window and window[-1][1] >= key:
+                    window.pop()
+                window.append((j, key))
+                if window[0][0] < j - limit:
+                    window.popleft()
+                origin, key = window[0]
+                if key + j < inf:
+                    new_best[value] = key + j
+                    used[value] = j - origin
+        best = new_best
+        layers.append(used)
+
+    value = size
+    while best[value] >= inf:
+        value -= 1
+    shortfall = amount - value * unit
+
+    coins = {}
+    for currency, used in zip(reversed(denominations), reversed(layers)):
+        count = used[value]
+        if count:
+            coins[currency] = count
+            value -= count * (currency // unit)
+    return Change(dict(sorted(coins.items(), reverse=True)), shortfall)
+
+
+class ChangeIndex:
+    """현재 시재로 만들 수 있는 거스름돈 금액을 비트셋으로 유지한다.
+
+    ``unit``(모든 화폐 단위의 최대공약수) 간격의 금액마다 비트 하나를 두고,
+    ``horizon`` 이하의 금액 중 만들 수 있는 금액의 비트를 켠다. 시재가 늘면
+    기존 비트셋을 밀어서 합치는 방식으로 갱신하고, 줄어들 때만 다시 계산한다.
+    ``horizon``을 넘는 금액은 쓰이지 않으므로 화폐 개수도 그 범위 안으로 잘라
+    관리하며, 시재가 아무리 많아도 갱신 비용이 늘지 않는다.
+    """
+
+    def __init__(self, cashes: Dict[int, int], horizon: int = 0) -> None:
+        """시재 딕셔너리를 참조하는 인덱스를 만든다.
+
+        Parameters
+        ----------
+        cashes : Dict[int, int]
+            ``{화폐단위: 보유 개수}`` 형태의 시재. 인덱스는 이 딕셔너리를 계속
+            참조하므로 값이 바뀌면 :py:meth:`update`를 호출해야 한다.
+        horizon : int, optional
+            비트셋으로 관리할 최대 금액. 이를 넘는 금액은 :func:`make_change`로
+            판단한다.
+        """
+        self.cashes = cashes
+        self.unit = 1
+        self.largest = 0
+        self.horizon = -1
+        self._requested = horizon
+        self._order: List[int] = []
+        self._rebuild()
+
+    def set_horizon(self, horizon: int) -> None:
+        """관리할 최대 금액을 바꾸고 비트셋을 다시 계산한다."""
+        self._requested = horizon
+        if max(horizon, self.largest) != self.horizon:
+            self._rebuild()
+
+    def update(self) -> None:
+        """``cashes`` 변경 사항을 비트셋에 반영한다.
+
+        늘어난 화폐만 있으면 기존 비트셋에 증분으로 더하고, 줄어든 화폐가
+        있을 때만 처음부터 다시 계산한다. 잘라낸 개수가 그대로면 아무것도 하지
+        않는다.
+        """
+        if len(self.cashes) != len(self._order):
+            self._rebuild()
+            return
+        counts = self._capped()
+        if counts == self._counts:
+            return
+        if any(new < old for new, old in zip(counts, self._counts)):
+            self._rebuild(counts)
+            return
+        for currency, new, old in zip(self._order, counts, self._counts):
+            if new > old:
+                self._add(currency, new - old)
+        self._counts = counts
+
+    def can_make(self, amount: int) -> bool:
+        """``amount``만큼의 거스름돈을 정확히 만들 수 있는지 반환한다."""
+        if amount <= 0:
+            return amount == 0
+        if amount % self.unit:
+            return False
+        if amount > self.horizon:
+            return make_change(amount, self.cashes).exact
+        return bool(self._reach >> (amount // self.unit) & 1)
+
+    def covers_next_coin(self, offset: int) -> bool:
+        """다음 투입 이후 생길 수 있는 모든 거스름돈을 만들 수 있는지 반환한다.
+
+        Parameters
+        ----------
+        offset : int
+            현재 투입 금액에서 가격을 뺀 값(음수).
+
+        화폐를 하나씩 넣어 부족액을 채울 때 마지막 화폐로 생기는 거스름돈만
+        확인한다. 그 금액들의 비트 마스크는 화폐 단위 구성에만 달려 있으므로
+        ``offset``별로 한 번만 구해 둔다. 넣은 화폐는 자기보다 작은 거스름돈에
+        쓰일 수 없으므로 현재 시재의 비트셋으로 판단하면 된다.
+        """
+        if offset % self.unit:
+            return False
+        needed = self._next_changes.get(offset)
+        if needed is None:
+            needed = self._next_changes[offset] = self._changes_after(-offset // self.unit)
+        return self._reach & needed == needed
+
+    def _changes_after(self, deficit: int) -> int:
+        # 남은 부족액(칸 단위)을 상태로 화폐를 하나씩 넣어 보며, 부족액을 넘기는
+        # 화폐를 넣었을 때 남는 거스름돈의 비트를 모은다
+        steps = [currency // self.unit for currency in self._order]
+        changes = 0
+        seen = {deficit}
+        pending = [deficit]
+        while pending:
+            remaining = pending.pop()
+            for step in steps:
+                if step >= remaining:
+                    changes |= 1 << (step - remaining)
+                elif remaining - step not in seen:
+                    seen.add(remaining - step)
+                    pending.append(remaining - step)
+        return changes
+
+    def _capped(self) -> List[int]:
+        limit = self.horizon
+        return [min(self.cashes[currency], limit // currency) for currency in self._order]
+
+    def _rebuild(self, counts: Optional[List[int]] = None) -> None:
+        order = sorted(self.cashes)
+        if order != self._order:
+            # 화폐 단위 구성이 바뀌면 한 칸의 크기와 창 범위도 다시 정한다
+            self._order = order
+            self.unit = 0
+            for currency in order:
+                self.unit = gcd(self.unit, currency)
+            self.unit = self.unit or 1
+            self.largest = order[-1] if order else 0
+            # 부족액별로 다음 투입 후 생길 수 있는 거스름돈(최대 화폐 단위 미만)의 비트
+            self._next_changes: Dict[int, int] = {}
+            self.horizon = -1
+        horizon = max(self._requested, self.largest)
+        if horizon != self.horizon:
+            self.horizon = horizon
+            self._mask = (1 << (horizon // self.unit + 1)) - 1
+            counts = None
+        self._counts = counts if counts is not None else self._capped()
+        self._reach = 1
+        for currency, count in zip(self._order, self._counts):
+            self._add(currency, count)
+
+    def _add(self, currency: int, count: int) -> None:
+        # 개수를 1, 2, 4, ... 묶음으로 나누어 묶음마다 한 번씩 밀어서 합친다
+        step = currency // self.unit
+        chunk = 1
+        reach = self._reach
+        while count > 0:
+            taken = min(chunk, count)
+            reach |= reach << (taken * step)
+            count -= taken
+            chunk <<= 1
+        self._reach = reach & self._mask
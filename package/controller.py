@@ -1,13 +1,75 @@
-from typing import Dict, List
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TypeVar
+from . import metrics
 from .drink import Drink
 from .card import Card
+from .change import ChangeIndex, make_change
+from .inventory import Inventory, ProductIndex, SlotView
+
+# 변경 알림 이벤트 이름
+STOCK_CHANGED = "stock"
+PRICE_CHANGED = "price"
+CASH_CHANGED = "cash"
+CARD_CHANGED = "card"
+CARD_DENIED = "deny"
+LAYOUT_CHANGED = "layout"
+SLOT_CHANGED = "slot"
+SALE_COMPLETED = "sale"
+CASH_REFUNDED = "refund"
+
+Listener = Callable[[str, Dict[str, Any]], None]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Reservation(NamedTuple):
+    """장바구니에 잡아 둔 음료 하나.
+
+    Attributes
+    ----------
+    source : :class:`SlotView`
+        재고를 미리 뺀 슬롯. 선택한 슬롯이 비었으면 같은 상품의 다른 슬롯이다.
+    price : int
+        담을 때의 판매 가격.
+    """
+
+    source: SlotView
+    price: int
+
+
+def _atomic(method: F) -> F:
+    """컨트롤러의 ``lock``을 잡은 채로 메서드를 실행하는 데코레이터."""
+
+    @wraps(method)
+    def wrapper(self: "Controller", *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
 
 
 class Controller:
     """현금과 재고 관리를 처리하는 비즈니스 로직 클래스.
 
-    ``cashes``(화폐 단위별 시재), ``drinks``(음료 리스트), ``card``(카드 모듈)
-    그리고 ``inserted_cash``(투입된 총 금액)을 속성으로 보유한다.
+    ``cashes``(화폐 단위별 시재), ``drinks``(음료 슬롯을 담은 :class:`Inventory`),
+    ``card``(카드 모듈) 그리고 ``inserted_cash``(투입된 총 금액)을 속성으로
+    보유한다. ``drinks``의 원소는 :class:`SlotView`이며 ``Drink``처럼 사용한다.
+    ``products``는 같은 음료가 들어 있는 슬롯들과 상품별 총 재고를 관리한다.
+
+    상태가 바뀔 때마다 :py:meth:`subscribe`로 등록된 리스너에게
+    ``(이벤트 이름, 내용)`` 형태로 변경 알림을 보낸다. 음료 관련 알림의 내용에는
+    ``drinks`` 안의 위치인 ``slot``이 포함된다.
+
+    동전·지폐 투입기와 카드 단말기가 각자의 스레드에서 호출할 수 있도록 상태를
+    바꾸거나 여러 값을 함께 읽는 메서드는 재진입 가능한 ``lock``을 잡고 실행되어
+    하나의 트랜잭션처럼 동작한다. 현금 결제는 모든 구매가 같은 투입 금액과
+    시재를 건드리므로 잠금은 컨트롤러 하나에 하나만 둔다. 여러 호출을 묶어야
+    하면 ``with controller.lock:`` 안에서 호출한다. 리스너는 변경을 일으킨
+    스레드에서 잠금을 잡은 채로 호출되므로 알림 순서가 변경 순서와 같다.
+
+    여러 음료를 한 번에 사는 장바구니는 :py:meth:`reserve`로 재고를 한꺼번에
+    잡아 ``cart``에 두었다가 :py:meth:`checkout`에서 한 번에 결제하고,
+    결제하지 못하면 :py:meth:`release_cart`로 재고를 되돌린다.
     """
 
     def __init__(self) -> None:
@@ -18,10 +80,44 @@ class Controller:
         """
         # 화폐 단위별 초기 시재
         self.cashes: Dict[int, int] = {1000: 10, 500: 10, 100: 10, 50: 10}
-        self.drinks: List[Drink] = []
+        self.drinks = Inventory()
+        self.products = ProductIndex()
         self.card = Card()
         self.inserted_cash = 0
+        # 거스름돈으로 만들 수 있는 금액의 비트셋
+        self._change_index = ChangeIndex(self.cashes)
+        # 거스름돈 범위 계산에 쓰는 가장 비싼 음료 가격
+        self._top_price = 0
+        self._listeners: List[Listener] = []
+        self.lock = threading.RLock()
+        # 재고를 잡아 두고 결제를 기다리는 장바구니
+        self.cart: List[Reservation] = []
 
+    @_atomic
+    def subscribe(self, listener: Listener) -> None:
+        """상태 변경 알림을 받을 리스너를 등록한다.
+
+        Parameters
+        ----------
+        listener : Callable[[str, Dict[str, Any]], None]
+            ``(이벤트 이름, 내용)``을 인자로 받는 호출 가능 객체.
+        """
+        self._listeners.append(listener)
+
+    @_atomic
+    def unsubscribe(self, listener: Listener) -> None:
+        """등록된 리스너를 해제한다."""
+        self._listeners.remove(listener)
+
+    def _notify(self, event: str, **payload: Any) -> None:
+        for listener in self._listeners:
+            listener(event, payload)
+
+    def slot_of(self, drink: SlotView) -> int:
+        """음료 슬롯 뷰가 ``drinks`` 안에서 차지하는 위치를 반환한다."""
+        return drink.index
+
+    @_atomic
     def input_cash(self, amounts: Dict[int, int]) -> None:
         """투입된 현금을 누적하여 시재에 반영한다.
 
@@ -31,30 +127,46 @@ class Controller:
             ``{화폐단위: 개수}`` 형태로 전달되는 투입 금액 정보.
 
         각 화폐 단위를 ``cashes``에 더하고 ``inserted_cash`` 총액을 갱신한다.
+        ``cash`` 알림의 ``deposited``는 이번에 투입된 금액이다.
         """
+        deposited = 0
         for currency, count in amounts.items():
             if currency not in self.cashes:
                 continue
             self.cashes[currency] += count
-            self.inserted_cash += currency * count
+            deposited += currency * count
+        self.inserted_cash += deposited
+        self._change_index.update()
+        self._notify(CASH_CHANGED, inserted=self.inserted_cash, deposited=deposited)
 
+    @_atomic
     def refund_cash(self) -> Dict[int, int]:
         """투입된 금액을 화폐 단위별로 반환한다.
 
-        ``cashes``에서 거스름돈을 차감하며 ``inserted_cash``를 0으로 초기화한다.
-        반환 값은 거슬러 준 화폐 단위별 개수를 담은 딕셔너리이다.
+        :func:`make_change`로 가장 적은 개수의 거스름돈을 계산하여 ``cashes``에서
+        단위별로 한 번에 차감한다. 반환 값은 거슬러 준 화폐 단위별 개수를 담은
+        딕셔너리이다. 시재가 부족해 정확히 거슬러 줄 수 없으면 지급하지 못한
+        금액을 ``inserted_cash``에 남겨 고객의 잔액이 사라지지 않도록 한다.
+        지급한 금액과 부족액은 ``refund`` 알림으로 보낸다.
         """
-        refunds: Dict[int, int] = {}
-        total_change = self.inserted_cash
-        for currency in sorted(self.cashes.keys(), reverse=True):
-            while self.cashes[currency] > 0 and total_change >= currency:
-                self.cashes[currency] -= 1
-                refunds[currency] = refunds.get(currency, 0) + 1
-                total_change -= currency
-        self.inserted_cash = 0
-        return refunds
+        change = make_change(self.inserted_cash, self.cashes)
+        for currency, count in change.coins.items():
+            self.cashes[currency] -= count
+        self.inserted_cash = change.shortfall
+        if metrics.enabled:
+            metrics.REFUNDS.inc()
+            if change.shortfall:
+                metrics.CHANGE_FAILURES.inc()
+                metrics.CHANGE_SHORTFALL.inc(amount=change.shortfall)
+        self._change_index.update()
+        self._notify(CASH_CHANGED, inserted=self.inserted_cash)
+        paid = sum(currency * count for currency, count in change.coins.items())
+        if paid or change.shortfall:
+            self._notify(CASH_REFUNDED, amount=paid, shortfall=change.shortfall)
+        return change.coins
 
-    def add_drinks(self, drink: Drink) -> None:
+    @_atomic
+    def add_drinks(self, drink: Drink) -> SlotView:
         """음료 객체를 재고 목록에 추가한다.
 
         Parameters
@@ -62,28 +174,420 @@ class Controller:
         drink : :class:`Drink`
             재고 목록에 등록할 음료 객체.
 
-        ``drinks`` 리스트에 전달된 음료를 추가한다.
+        전달된 음료의 값을 ``drinks``의 새 슬롯에 복사하고 그 슬롯의
+        :class:`SlotView`를 반환한다. 이후의 변경은 반환된 뷰로 한다.
         """
-        self.drinks.append(drink)
+        view = self.drinks.append(drink)
+        self.products.add(view.index, view.name, view.count)
+        self._update_change_horizon(view.price)
+        self._notify(LAYOUT_CHANGED, slots=len(self.drinks), first=view.index)
+        return view
 
-    def dispense(self, drink: Drink) -> str:
-        """음료 재고와 결제 상태를 확인하여 상품을 제공한다.
+    @_atomic
+    def extend_drinks(self, drinks: Iterable[Drink]) -> List[SlotView]:
+        """여러 음료를 한 번에 새 슬롯으로 추가한다.
+
+        Parameters
+        ----------
+        drinks : Iterable[:class:`Drink`]
+            추가할 음료 객체들. 이터레이터를 그대로 받아 차례로 복사한다.
+
+        거스름돈 범위 갱신과 ``layout`` 알림은 마지막에 한 번만 한다. 알림의
+        ``first``는 처음 추가된 슬롯 위치이다. 추가된 슬롯 뷰 목록을 반환한다.
+        """
+        first = len(self.drinks)
+        views = self.drinks.extend(drinks)
+        for view in views:
+            self.products.add(view.index, view.name, view.count)
+        if views:
+            self._update_change_horizon(max(self.drinks.prices[first:]))
+            self._notify(LAYOUT_CHANGED, slots=len(self.drinks), first=first)
+        return views
+
+    @_atomic
+    def replace_drink(self, slot: int, drink: Drink) -> SlotView:
+        """``slot``에 다른 음료를 넣는다.
 
         Parameters
         ----------
+        slot : int
+            바꿀 슬롯 위치.
         drink : :class:`Drink`
+            새로 넣을 음료 객체. 이름, 이미지, 가격, 재고를 모두 복사한다.
+
+        슬롯 뷰는 그대로 두고 값만 바꾼 뒤 ``slot`` 알림을 보낸다.
+        """
+        view = self.drinks[slot]
+        old_count, old_price = view.count, view.price
+        self.drinks.replace(slot, drink)
+        self.products.move(slot, view.name, old_count, view.count)
+        self._price_changed(old_price, view.price)
+        self._notify(SLOT_CHANGED, slot=slot)
+        return view
+
+    @_atomic
+    def set_stock(self, drink: SlotView, count: int) -> None:
+        """관리자 입력으로 음료 재고를 변경한다.
+
+        Parameters
+        ----------
+        drink : :class:`SlotView`
+            재고를 바꿀 음료 객체.
+        count : int
+            새 재고 수량. 음수는 0으로 처리한다.
+        """
+        count = max(0, count)
+        if drink.count != count:
+            self.products.adjust(drink.index, count - drink.count)
+            drink.count = count
+            self._notify(STOCK_CHANGED, slot=self.slot_of(drink), count=count)
+
+    @_atomic
+    def set_price(self, drink: SlotView, price: int) -> None:
+        """관리자 입력으로 음료 가격을 변경한다.
+
+        Parameters
+        ----------
+        drink : :class:`SlotView`
+            가격을 바꿀 음료 객체.
+        price : int
+            새 판매 가격. 음수는 0으로 처리한다.
+        """
+        price = max(0, price)
+        if drink.price != price:
+            old_price, drink.price = drink.price, price
+            self._price_changed(old_price, price)
+            self._notify(PRICE_CHANGED, slot=self.slot_of(drink), price=price)
+
+    @_atomic
+    def restock_all(self, count: int) -> None:
+        """모든 슬롯의 재고를 ``count``로 채운다.
+
+        Parameters
+        ----------
+        count : int
+            새 재고 수량. 음수는 0으로 처리한다.
+
+        배열을 한 번에 바꾼 뒤 값이 바뀐 슬롯만 알린다.
+        """
+        count = max(0, count)
+        changed = self.drinks.restock_all(count)
+        self.products.fill(count)
+        for slot in changed:
+            self._notify(STOCK_CHANGED, slot=slot, count=count)
+
+    @_atomic
+    def set_prices(self, slots: Iterable[int], price: int) -> None:
+        """여러 슬롯의 가격을 한 번에 변경한다.
+
+        Parameters
+        ----------
+        slots : Iterable[int]
+            가격을 바꿀 슬롯 위치 목록.
+        price : int
+            새 판매 가격. 음수는 0으로 처리한다.
+        """
+        changed = self.drinks.set_prices(slots, max(0, price))
+        if changed:
+            self._update_change_horizon()
+        for slot in changed:
+            self._notify(PRICE_CHANGED, slot=slot, price=self.drinks.prices[slot])
+
+    @_atomic
+    def empty_slots(self) -> List[int]:
+        """재고가 없는 슬롯 위치 목록을 반환한다."""
+        return self.drinks.empty_slots()
+
+    @_atomic
+    def set_cash(self, currency: int, count: int) -> None:
+        """관리자 입력으로 특정 화폐 단위의 시재를 변경한다.
+
+        Parameters
+        ----------
+        currency : int
+            화폐 단위.
+        count : int
+            새 보유 개수. 음수는 0으로 처리한다.
+        """
+        count = max(0, count)
+        if self.cashes.get(currency) != count:
+            self.cashes[currency] = count
+            self._change_index.update()
+            self._notify(CASH_CHANGED, inserted=self.inserted_cash)
+
+    @_atomic
+    def set_inserted_cash(self, amount: int) -> None:
+        """투입된 총 금액을 ``amount``로 되돌린다.
+
+        Parameters
+        ----------
+        amount : int
+            새 투입 금액. 음수는 0으로 처리한다.
+
+        기록에서 상태를 복구할 때 쓰며, 시재는 바꾸지 않는다. 값이 바뀌면
+        ``cash`` 알림을 보낸다.
+        """
+        amount = max(0, amount)
+        if self.inserted_cash != amount:
+            self.inserted_cash = amount
+            self._notify(CASH_CHANGED, inserted=amount)
+
+    @_atomic
+    def load_state(
+        self,
+        drinks: Inventory,
+        products: ProductIndex,
+        cashes: Dict[int, int],
+        inserted_cash: int,
+        card: Optional[Card] = None,
+    ) -> None:
+        """음료 슬롯, 시재, 투입 금액(그리고 카드 모듈)을 한 번에 교체한다.
+
+        Parameters
+        ----------
+        drinks : :class:`Inventory`
+            새 음료 저장소. 복사하지 않고 그대로 쓴다.
+        products : :class:`ProductIndex`
+            ``drinks``와 맞는 상품 인덱스.
+        cashes : Dict[int, int]
+            ``{화폐단위: 보유 개수}`` 형태의 새 시재.
+        inserted_cash : int
+            투입된 총 금액.
+        card : :class:`Card`, optional
+            주어지면 카드 모듈도 바꾼다.
+
+        스냅샷 복원처럼 상태 전체를 바꿀 때 쓰며, 기존 슬롯을 가리키던
+        장바구니는 비운다. 거스름돈 인덱스는 한 번만 다시 계산하고,
+        ``layout``(``first=0``)과 ``cash`` 알림을 한 번씩 보낸다.
+        """
+        self.drinks = drinks
+        self.products = products
+        self.cart = []
+        self.cashes = dict(cashes)
+        self.inserted_cash = inserted_cash
+        if card is not None:
+            self.card = card
+        # 화폐 단위 구성이 달라질 수 있으므로 최종 범위로 인덱스를 한 번에 새로 만든다
+        self._top_price = max(drinks.prices, default=0)
+        self._change_index = ChangeIndex(self.cashes, self._top_price + max(self.cashes, default=0))
+        self._notify(LAYOUT_CHANGED, slots=len(drinks), first=0)
+        self._notify(CASH_CHANGED, inserted=inserted_cash)
+
+    @_atomic
+    def can_make_change(self, amount: int) -> bool:
+        """현재 시재로 ``amount``만큼의 거스름돈을 정확히 줄 수 있는지 반환한다.
+
+        가장 비싼 음료 가격에 최대 화폐 단위를 더한 금액까지는 비트셋 조회로
+        바로 답하고, 그보다 큰 금액만 :func:`make_change`로 계산한다.
+        """
+        return self._change_index.can_make(amount)
+
+    @_atomic
+    def exact_change_only(self, drink: SlotView) -> bool:
+        """음료를 구매하면 거스름돈을 다 받지 못할 수 있는지 반환한다.
+
+        Parameters
+        ----------
+        drink : :class:`SlotView`
+            확인할 음료 객체.
+
+        투입 금액이 가격 이상이면 지금 생길 거스름돈을, 부족하면 다음 투입으로
+        생길 수 있는 모든 거스름돈을 현재 시재로 만들 수 있는지 확인한다.
+        """
+        change = self.inserted_cash - drink.price
+        if change >= 0:
+            return not self._change_index.can_make(change)
+        return not self._change_index.covers_next_coin(change)
+
+    def _update_change_horizon(self, raised: Optional[int] = None) -> None:
+        # 가격이 오르기만 했으면 전체 가격을 훑지 않고 최고가와만 비교한다
+        if raised is not None:
+            if raised <= self._top_price:
+                return
+            top = raised
+        else:
+            top = max(self.drinks.prices, default=0)
+        self._top_price = top
+        self._change_index.set_horizon(top + self._change_index.largest)
+
+    def _price_changed(self, old: int, new: int) -> None:
+        if new < old and old >= self._top_price:
+            # 최고가 음료의 가격이 내려갔을 때만 다시 계산한다
+            self._update_change_horizon()
+        else:
+            self._update_change_horizon(new)
+
+    @_atomic
+    def insert_card(self, number: str) -> bool:
+        """카드를 삽입하고 성공하면 카드 상태 변경을 알린다."""
+        if self.card.insert_card(number):
+            self._notify(CARD_CHANGED, inserted=True, status=False)
+            return True
+        return False
+
+    @_atomic
+    def approve_card(self) -> None:
+        """삽입된 카드의 결제를 승인한다."""
+        self.card.approve()
+        self._notify(CARD_CHANGED, inserted=self.card.inserted, status=True)
+
+    @_atomic
+    def reset_card(self) -> None:
+        """거래가 끝난 카드 정보를 초기화한다."""
+        self.card.reset()
+        self._notify(CARD_CHANGED, inserted=False, status=False)
+
+    @_atomic
+    def deny_card(self, number: str) -> None:
+        """카드 번호를 차단 목록에 추가하고 ``deny`` 알림을 보낸다.
+
+        삽입되어 있던 카드면 먼저 카드를 초기화하므로, 알림을 받은 쪽은 이미
+        카드가 빠진 상태를 본다. 승인 캐시는 이 알림으로 항목을 지운다.
+        """
+        self.card.deny(number)
+        if self.card.number == number:
+            self.reset_card()
+        self._notify(CARD_DENIED, number=number)
+
+    @_atomic
+    def in_stock_slot(self, drink: SlotView) -> Optional[SlotView]:
+        """선택한 음료를 실제로 꺼낼 슬롯을 반환한다.
+
+        Parameters
+        ----------
+        drink : :class:`SlotView`
+            선택된 음료 슬롯.
+
+        선택한 슬롯에 재고가 있으면 그대로, 비었으면 같은 이름과 가격의 음료가
+        남아 있는 다른 슬롯을 반환한다. 상품 전체 재고가 없으면 형제 슬롯을
+        훑지 않고 바로 ``None``을 반환한다.
+        """
+        if drink.count > 0:
+            return drink
+        if self.products.stock(drink.name) <= 0:
+            return None
+        for slot in self.products.siblings(drink.index):
+            sibling = self.drinks[slot]
+            if sibling.count > 0 and sibling.price == drink.price:
+                return sibling
+        return None
+
+    @_atomic
+    def dispense(self, drink: SlotView, by_card: bool = False) -> str:
+        """음료 재고와 결제 상태를 확인하여 상품을 제공한다.
+
+        Parameters
+        ----------
+        drink : :class:`SlotView`
             선택된 음료 객체.
+        by_card : bool, optional
+            참이면 투입 금액과 상관없이 승인된 카드로만 결제한다. 카드 승인을
+            기다리는 동안 넣은 현금이 승인 대신 쓰이지 않게 할 때 쓴다.
 
         ``inserted_cash``나 ``card.status``가 충분하면 재고를 차감하고 결과
-        문자열을 반환한다.
+        문자열을 반환한다. 선택한 슬롯이 비었으면 :py:meth:`in_stock_slot`이
+        찾은 같은 상품의 다른 슬롯에서 꺼낸다. 판매가 끝나면 꺼낸 슬롯과 가격,
+        결제 수단을 ``sale`` 알림으로 보낸다.
         """
-        if drink.count <= 0:
+        source = self.in_stock_slot(drink)
+        if source is None:
+            if metrics.enabled:
+                metrics.PURCHASES.inc("out_of_stock")
             return "재고 없음"
-        if self.inserted_cash >= drink.price:
-            drink.count -= 1
+        if not by_card and self.inserted_cash >= drink.price:
             self.inserted_cash -= drink.price
+            self._take(source)
+            self._notify(CASH_CHANGED, inserted=self.inserted_cash)
+            self._notify(SALE_COMPLETED, slot=source.index, product=source.name, price=drink.price, payment="cash")
+            if metrics.enabled:
+                metrics.PURCHASES.inc("cash")
             return "음료 제공"
         if self.card.status:
-            drink.count -= 1
+            self._take(source)
+            self._notify(SALE_COMPLETED, slot=source.index, product=source.name, price=drink.price, payment="card")
+            if metrics.enabled:
+                metrics.PURCHASES.inc("card")
             return "음료 제공"
+        if metrics.enabled:
+            metrics.PURCHASES.inc("insufficient_funds")
         return "잔액 부족"
+
+    @_atomic
+    def reserve(self, drinks: Iterable[SlotView]) -> bool:
+        """여러 음료의 재고를 한꺼번에 잡아 ``cart``에 담는다.
+
+        Parameters
+        ----------
+        drinks : Iterable[:class:`SlotView`]
+            담을 음료 슬롯. 같은 슬롯을 여러 번 주면 그만큼 담는다.
+
+        음료마다 :py:meth:`in_stock_slot`이 찾은 슬롯의 재고를 하나씩 빼며,
+        하나라도 꺼낼 수 없으면 이번 호출에서 뺀 재고를 모두 되돌리고
+        ``False``를 반환한다. 잠금 안에서 처리하므로 다른 구매와 섞이지 않는다.
+        """
+        reserved: List[Reservation] = []
+        for drink in drinks:
+            source = self.in_stock_slot(drink)
+            if source is None:
+                self._restore(reserved)
+                return False
+            self._take(source)
+            reserved.append(Reservation(source, drink.price))
+        self.cart.extend(reserved)
+        return True
+
+    @_atomic
+    def cart_total(self) -> int:
+        """장바구니에 담긴 음료의 가격 합계를 반환한다."""
+        return sum(reservation.price for reservation in self.cart)
+
+    @_atomic
+    def release_cart(self) -> int:
+        """결제하지 않은 장바구니의 재고를 되돌리고 되돌린 음료 수를 반환한다."""
+        released = len(self.cart)
+        self._restore(self.cart)
+        self.cart = []
+        return released
+
+    @_atomic
+    def checkout(self, by_card: bool = False) -> str:
+        """장바구니 전체를 한 번에 결제하고 결과 문자열을 반환한다.
+
+        ``inserted_cash``가 합계 이상이면 현금으로, 아니면 승인된 카드로
+        결제한다. ``by_card``가 참이면 승인된 카드로만 결제한다. 결제되면
+        음료마다 ``sale`` 알림을 보내고 장바구니를 비우며, 현금 결제의
+        ``cash`` 알림은 한 번만 보낸다. 결제할 수 없으면
+        장바구니를 그대로 두므로 금액을 더 넣거나 :py:meth:`release_cart`로
+        취소한다.
+        """
+        if not self.cart:
+            return "장바구니 비어 있음"
+        total = self.cart_total()
+        if not by_card and self.inserted_cash >= total:
+            self.inserted_cash -= total
+            payment = "cash"
+        elif self.card.status:
+            payment = "card"
+        else:
+            if metrics.enabled:
+                metrics.PURCHASES.inc("insufficient_funds")
+            return "잔액 부족"
+        cart, self.cart = self.cart, []
+        if payment == "cash":
+            self._notify(CASH_CHANGED, inserted=self.inserted_cash)
+        for source, price in cart:
+            self._notify(SALE_COMPLETED, slot=source.index, product=source.name, price=price, payment=payment)
+        if metrics.enabled:
+            metrics.PURCHASES.inc(payment, amount=len(cart))
+        return "음료 제공"
+
+    def _restore(self, reservations: Iterable[Reservation]) -> None:
+        for source, _ in reservations:
+            source.count += 1
+            self.products.adjust(source.index, 1)
+            self._notify(STOCK_CHANGED, slot=source.index, count=source.count)
+
+    def _take(self, drink: SlotView) -> None:
+        drink.count -= 1
+        self.products.adjust(drink.index, -1)
+        self._notify(STOCK_CHANGED, slot=drink.index, count=drink.count)
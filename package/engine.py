@@ -0,0 +1,207 @@
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO
+
+from .controller import Controller
+
+# 이벤트 종류
+COIN = "coin"
+CARD = "card"
+SELECT = "select"
+CART = "cart"
+REFUND = "refund"
+
+
+class Result(NamedTuple):
+    """이벤트 하나를 적용한 결과.
+
+    Attributes
+    ----------
+    kind : str
+        이벤트 종류. ``coin``, ``card``, ``select``, ``cart``, ``refund`` 중 하나.
+    target : Any
+        이벤트 대상. 화폐 단위, 카드 번호, 슬롯 번호 또는 슬롯 번호 목록이며
+        반환은 ``None``.
+    outcome : str
+        처리 결과 문자열. 음료 선택은 :py:meth:`Controller.dispense` 결과와 같다.
+    inserted : int
+        이벤트 적용 후 ``inserted_cash`` 값.
+    change : Optional[Dict[int, int]]
+        반환 이벤트에서 지급한 화폐 단위별 개수.
+    """
+
+    kind: str
+    target: Any
+    outcome: str
+    inserted: int
+    change: Optional[Dict[int, int]] = None
+
+
+class Engine:
+    """이벤트 스트림을 묶음 단위로 :class:`Controller`에 적용하는 헤드리스 엔진.
+
+    tkinter와 PIL을 가져오지 않으므로 화면 없이 기록된 세션을 재생할 수 있다.
+
+    이벤트는 ``("coin", 500)``, ``("card", "ABCDE12345")``, ``("select", 3)``,
+    ``("cart", [3, 3, 5])``, ``("refund",)`` 형태의 시퀀스이다. 카드 결제는 :class:`Machine`과 같은
+    순서(승인 → 제공 → 카드 초기화)로 즉시 처리하며, 메시지 박스나 지연은 없다.
+    """
+
+    def __init__(self, controller: Optional[Controller] = None) -> None:
+        """엔진을 생성한다.
+
+        Parameters
+        ----------
+        controller : :class:`Controller`, optional
+            구동할 컨트롤러. 생략하면 새로 만든다.
+        """
+        self.controller = controller if controller is not None else Controller()
+        self._handlers = {
+            COIN: self._coin,
+            CARD: self._card,
+            SELECT: self._select,
+            CART: self._cart,
+            REFUND: self._refund,
+        }
+
+    def apply(self, event: Sequence[Any]) -> Result:
+        """이벤트 하나를 적용하고 결과를 반환한다.
+
+        알 수 없는 이벤트 종류는 :class:`ValueError`를 일으킨다.
+        """
+        try:
+            handler = self._handlers[event[0]]
+        except KeyError:
+            raise ValueError(f"알 수 없는 이벤트: {event[0]!r}") from None
+        return handler(event)
+
+    def apply_batch(self, events: Sequence[Sequence[Any]]) -> List[Result]:
+        """이벤트 묶음을 적용하고 결과 목록을 반환한다.
+
+        연속된 동전 투입은 :py:meth:`Controller.input_cash` 한 번으로 합쳐서
+        반영하므로, 결과의 ``inserted``는 합쳐진 투입이 모두 끝난 뒤의 값이다.
+        """
+        results: List[Result] = []
+        pending: Dict[int, int] = {}
+        coins: List[Sequence[Any]] = []
+        for event in events:
+            if event[0] == COIN:
+                pending[event[1]] = pending.get(event[1], 0) + 1
+                coins.append(event)
+                continue
+            if coins:
+                self._flush_coins(pending, coins, results)
+            results.append(self.apply(event))
+        if coins:
+            self._flush_coins(pending, coins, results)
+        return results
+
+    def run(self, events: Iterable[Sequence[Any]], batch_size: int = 1024) -> Iterator[List[Result]]:
+        """이벤트 스트림을 ``batch_size``개씩 적용하며 결과 묶음을 내보낸다."""
+        iterator = iter(events)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield self.apply_batch(batch)
+
+    def replay(self, events: Iterable[Sequence[Any]], batch_size: int = 1024) -> Dict[str, int]:
+        """결과 객체를 보관하지 않고 이벤트를 적용하여 결과별 건수만 집계한다."""
+        counts: Dict[str, int] = {}
+        for results in self.run(events, batch_size):
+            for result in results:
+                counts[result.outcome] = counts.get(result.outcome, 0) + 1
+        return counts
+
+    def state(self) -> Dict[str, Any]:
+        """현재 시재, 투입 금액, 슬롯별 재고와 가격을 딕셔너리로 반환한다."""
+        controller = self.controller
+        with controller.lock:
+            return {
+                "cashes": dict(controller.cashes),
+                "inserted_cash": controller.inserted_cash,
+                "stock": controller.drinks.counts.tolist(),
+                "prices": controller.drinks.prices.tolist(),
+            }
+
+    def _flush_coins(
+        self,
+        pending: Dict[int, int],
+        coins: List[Sequence[Any]],
+        results: List[Result],
+    ) -> None:
+        controller = self.controller
+        controller.input_cash(pending)
+        inserted = controller.inserted_cash
+        for event in coins:
+            outcome = "투입" if event[1] in controller.cashes else "사용 불가 화폐"
+            results.append(Result(COIN, event[1], outcome, inserted))
+        pending.clear()
+        coins.clear()
+
+    def _coin(self, event: Sequence[Any]) -> Result:
+        controller = self.controller
+        currency = event[1]
+        if currency not in controller.cashes:
+            return Result(COIN, currency, "사용 불가 화폐", controller.inserted_cash)
+        controller.input_cash({currency: 1})
+        return Result(COIN, currency, "투입", controller.inserted_cash)
+
+    def _card(self, event: Sequence[Any]) -> Result:
+        controller = self.controller
+        outcome = "카드 삽입" if controller.insert_card(event[1]) else "유효하지 않은 카드"
+        return Result(CARD, event[1], outcome, controller.inserted_cash)
+
+    def _select(self, event: Sequence[Any]) -> Result:
+        controller = self.controller
+        slot = event[1]
+        if not 0 <= slot < len(controller.drinks):
+            return Result(SELECT, slot, "없는 슬롯", controller.inserted_cash)
+        drink = controller.drinks[slot]
+        card = controller.card
+        if card.inserted and not card.status:
+            # 화면과 같이 선택한 슬롯이 비었으면 같은 상품의 다른 슬롯에서 꺼낸다
+            if controller.in_stock_slot(drink) is None:
+                return Result(SELECT, slot, "재고 없음", controller.inserted_cash)
+            controller.approve_card()
+            outcome = controller.dispense(drink, by_card=True)
+            controller.reset_card()
+            return Result(SELECT, slot, outcome, controller.inserted_cash)
+        return Result(SELECT, slot, controller.dispense(drink), controller.inserted_cash)
+
+    def _cart(self, event: Sequence[Any]) -> Result:
+        controller = self.controller
+        slots = list(event[1])
+        if not all(0 <= slot < len(controller.drinks) for slot in slots):
+            return Result(CART, slots, "없는 슬롯", controller.inserted_cash)
+        card = controller.card
+        with controller.lock:
+            if not controller.reserve([controller.drinks[slot] for slot in slots]):
+                return Result(CART, slots, "재고 없음", controller.inserted_cash)
+            # 카드는 장바구니 합계로 한 번만 승인한다
+            paying_by_card = card.inserted and not card.status and controller.inserted_cash < controller.cart_total()
+            if paying_by_card:
+                controller.approve_card()
+            outcome = controller.checkout()
+            if outcome != "음료 제공":
+                controller.release_cart()
+            if paying_by_card:
+                controller.reset_card()
+        return Result(CART, slots, outcome, controller.inserted_cash)
+
+    def _refund(self, event: Sequence[Any]) -> Result:
+        controller = self.controller
+        change = controller.refund_cash()
+        return Result(REFUND, None, "거스름돈 반환", controller.inserted_cash, change)
+
+
+def read_sessions(stream: TextIO) -> Iterator[Sequence[Any]]:
+    """JSON Lines 형식의 세션 기록에서 이벤트를 순서대로 읽는다.
+
+    한 줄은 한 세션이며 ``[["coin", 1000], ["select", 0], ["refund"]]``처럼
+    이벤트 배열의 배열로 기록된다.
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield from json.loads(line)
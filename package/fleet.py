@@ -0,0 +1,208 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .analytics import SalesReport
+from .catalog import default_drinks
+from .controller import SALE_COMPLETED, Controller
+from .engine import CARD, COIN, REFUND, SELECT, Engine, read_sessions
+from .snapshot import Snapshot
+
+
+@dataclass
+class MachineJob:
+    """자판기 한 대에 적용할 이벤트 스트림 정의.
+
+    Attributes
+    ----------
+    machine_id : int
+        자판기 번호.
+    events_path : str, optional
+        JSON Lines 세션 기록 파일. 주어지면 이 파일을 재생한다.
+    sessions : int
+        ``events_path``가 없을 때 만들 가상 세션 수.
+    seed : int
+        가상 세션 생성에 사용할 난수 시드.
+    """
+
+    machine_id: int
+    events_path: Optional[str] = None
+    sessions: int = 1000
+    seed: int = 0
+
+
+@dataclass
+class MachineReport:
+    """자판기 한 대의 재생 결과."""
+
+    machine_id: int
+    events: int
+    sales: int
+    revenue: int
+    cashes: Dict[int, int]
+    stockouts: List[int]
+    outcomes: Dict[str, int]
+
+
+@dataclass
+class FleetReport:
+    """여러 자판기의 재생 결과를 합친 보고서."""
+
+    machines: int = 0
+    events: int = 0
+    sales: int = 0
+    revenue: int = 0
+    cashes: Dict[int, int] = field(default_factory=dict)
+    stockouts: Dict[int, List[int]] = field(default_factory=dict)
+    outcomes: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, report: MachineReport) -> None:
+        """자판기 한 대의 결과를 보고서에 더한다."""
+        self.machines += 1
+        self.events += report.events
+        self.sales += report.sales
+        self.revenue += report.revenue
+        for currency, count in report.cashes.items():
+            self.cashes[currency] = self.cashes.get(currency, 0) + count
+        if report.stockouts:
+            self.stockouts[report.machine_id] = report.stockouts
+        for outcome, count in report.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+
+    def merge(self, other: "FleetReport") -> None:
+        """다른 보고서의 결과를 이 보고서에 합친다."""
+        self.machines += other.machines
+        self.events += other.events
+        self.sales += other.sales
+        self.revenue += other.revenue
+        for currency, count in other.cashes.items():
+            self.cashes[currency] = self.cashes.get(currency, 0) + count
+        self.stockouts.update(other.stockouts)
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "machines": self.machines,
+            "events": self.events,
+            "sales": self.sales,
+            "revenue": self.revenue,
+            "cashes": self.cashes,
+            "stockouts": self.stockouts,
+            "outcomes": self.outcomes,
+        }
+
+
+def synthetic_sessions(seed: int, sessions: int, slots: int) -> Iterator[Sequence[Any]]:
+    """재현 가능한 가상 구매 세션의 이벤트를 순서대로 만든다.
+
+    세션마다 동전 1~3개 또는 카드를 넣고, 음료 하나를 고른 뒤 반환한다.
+    """
+    rng = random.Random(seed)
+    currencies = (1000, 500, 100, 50)
+    for _ in range(sessions):
+        if rng.random() < 0.1:
+            yield (CARD, "ABCDE12345")
+        else:
+            for _ in range(rng.randint(1, 3)):
+                yield (COIN, rng.choice(currencies))
+        yield (SELECT, rng.randrange(slots))
+        yield (REFUND,)
+
+
+def base_snapshot(slots: int = 24, stock: int = 10) -> Snapshot:
+    """기본 음료 ``slots``개를 재고 ``stock``으로 채운 자판기의 스냅샷을 만든다."""
+    controller = Controller()
+    controller.extend_drinks(default_drinks(slots, stock))
+    return Snapshot.of(controller)
+
+
+def run_machine(
+    job: MachineJob,
+    slots: int = 24,
+    stock: int = 10,
+    base: Optional[Snapshot] = None,
+) -> MachineReport:
+    """새 :class:`Controller`에 ``job``의 이벤트를 재생하고 결과를 반환한다.
+
+    ``base``를 주면 음료를 하나씩 채우는 대신 그 스냅샷에서 컨트롤러를 복제한다.
+    ``base``는 ``slots``와 ``stock``으로 만든 것이어야 한다. 판매 수와 매출은
+    ``sale`` 알림의 판매 가격으로 세므로 슬롯마다 초기 재고가 달라도 맞다.
+    """
+    if base is not None:
+        controller = base.clone()
+    else:
+        controller = Controller()
+        for drink in default_drinks(slots, stock):
+            controller.add_drinks(drink)
+    totals = SalesReport()
+
+    def on_change(event: str, payload: Dict[str, Any]) -> None:
+        if event == SALE_COMPLETED:
+            totals.add_sale(payload["slot"], payload["product"], payload["price"])
+
+    controller.subscribe(on_change)
+    engine = Engine(controller)
+    if job.events_path is not None:
+        with open(job.events_path, encoding="utf-8") as fp:
+            outcomes = engine.replay(read_sessions(fp))
+    else:
+        outcomes = engine.replay(synthetic_sessions(job.seed, job.sessions, slots))
+    controller.unsubscribe(on_change)
+    return MachineReport(
+        machine_id=job.machine_id,
+        events=sum(outcomes.values()),
+        sales=totals.sales,
+        revenue=totals.revenue,
+        cashes=dict(controller.cashes),
+        stockouts=controller.empty_slots(),
+        outcomes=outcomes,
+    )
+
+
+def _run_shard(jobs: List[MachineJob], slots: int, stock: int) -> FleetReport:
+    # 프로세스마다 결과를 먼저 합쳐서 주고받는 데이터를 줄인다
+    report = FleetReport()
+    # 같은 초기 상태를 자판기마다 다시 만들지 않고 스냅샷에서 복제한다
+    base = base_snapshot(slots, stock)
+    for job in jobs:
+        report.add(run_machine(job, slots, stock, base))
+    return report
+
+
+def run_fleet(
+    jobs: List[MachineJob],
+    processes: Optional[int] = None,
+    slots: int = 24,
+    stock: int = 10,
+) -> FleetReport:
+    """여러 자판기를 프로세스 풀에 나누어 재생하고 하나의 보고서로 합친다.
+
+    Parameters
+    ----------
+    jobs : List[:class:`MachineJob`]
+        자판기별 이벤트 스트림 정의.
+    processes : int, optional
+        사용할 프로세스 수. 생략하면 CPU 수를 사용하고, 1이면 현재 프로세스에서
+        바로 실행한다.
+    slots : int, optional
+        자판기마다 채울 음료 슬롯 수.
+    stock : int, optional
+        슬롯별 초기 재고.
+
+    자판기들은 프로세스 수만큼의 묶음으로 나뉘며, 각 프로세스는 맡은 자판기의
+    결과를 합친 보고서 하나만 돌려준다.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) <= 1:
+        return _run_shard(jobs, slots, stock)
+
+    shards = [jobs[i::processes] for i in range(processes)]
+    report = FleetReport()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_run_shard, shard, slots, stock) for shard in shards if shard]
+        for future in futures:
+            report.merge(future.result())
+    return report
@@ -0,0 +1,116 @@
+import base64
+import os
+import tkinter as tk
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .thumbnails import ThumbnailStore, render
+
+# 기본 메모리 상한 (바이트). 70x70 버튼 이미지 수백 개를 담을 수 있는 크기이다.
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class ImageCache:
+    """``(경로, 크기)``를 키로 이미지를 보관하는 LRU 캐시.
+
+    크기를 줄인 PNG로 만든 :class:`tk.PhotoImage`를 저장하며, 추정 메모리
+    사용량이 ``max_bytes``를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+    ``hits``와 ``misses``로 적중 횟수를 집계한다.
+
+    ``thumbnails``가 주어지면 메모리에 없는 이미지를 먼저 디스크의 썸네일
+    묶음에서 찾으므로, 원본 디코딩과 PIL 로딩 없이 Tk가 바로 PNG를 읽는다.
+    새로 만든 썸네일은 :py:meth:`flush`에서 저장된다. 디코딩된 PIL 이미지는
+    보관하지 않는다. 썸네일을 Tk가 직접 읽으므로 PIL 이미지가 만들어지지 않고,
+    보관하려면 첫 화면 전에 PIL을 가져와 디코딩해야 하기 때문이다.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, thumbnails: Optional[ThumbnailStore] = None) -> None:
+        """빈 캐시를 생성한다.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            캐시가 보유할 수 있는 추정 메모리의 상한.
+        thumbnails : :class:`ThumbnailStore`, optional
+            크기를 줄인 이미지를 보관하는 디스크 캐시.
+        """
+        self.max_bytes = max_bytes
+        self.thumbnails = thumbnails
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Tuple[int, int]], Tuple[tk.PhotoImage, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, size: Tuple[int, int] = (70, 70)) -> tk.PhotoImage:
+        """캐시된 ``PhotoImage``를 반환하고, 없으면 디스크에서 읽어 저장한다.
+
+        Parameters
+        ----------
+        path : str
+            이미지 파일 경로.
+        size : tuple[int, int], optional
+            변환할 이미지 크기. 기본값은 ``(70, 70)``.
+
+        경로가 없으면 회색 이미지로 대체한다. 적중 시 해당 항목을 가장 최근
+        사용 위치로 옮긴다.
+        """
+        key = (path, tuple(size))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        photo = self._load(path, key[1])
+        # Tk 사진 버퍼는 픽셀당 4바이트
+        nbytes = photo.width() * photo.height() * 4
+        self._entries[key] = (photo, nbytes)
+        self.current_bytes += nbytes
+        self._evict()
+        return photo
+
+    def flush(self) -> None:
+        """새로 만든 썸네일이 있으면 디스크에 저장한다."""
+        if self.thumbnails is None:
+            return
+        try:
+            self.thumbnails.save()
+        except OSError:
+            # 쓸 수 없는 위치여도 화면은 계속 동작해야 한다. 다음 실행에서 다시 만든다
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """적중/미스 횟수와 현재 항목 수, 메모리 사용량을 반환한다."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
+
+    def clear(self) -> None:
+        """모든 항목을 제거한다. 집계된 적중/미스 횟수는 유지된다."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _evict(self) -> None:
+        # 방금 추가한 항목 하나는 상한을 넘더라도 남겨둔다.
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+
+    def _load(self, path: str, size: Tuple[int, int]) -> tk.PhotoImage:
+        data = self.thumbnails.get(path, size) if self.thumbnails is not None else None
+        if data is None:
+            if not os.path.exists(path):
+                photo = tk.PhotoImage(width=size[0], height=size[1])
+                photo.put("gray", to=(0, 0, size[0], size[1]))
+                return photo
+            data = render(path, size)
+            if self.thumbnails is not None:
+                self.thumbnails.put(path, size, data)
+        return tk.PhotoImage(data=base64.b64encode(data), format="png")
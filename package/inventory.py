@@ -0,0 +1,309 @@
+import bisect
+from array import array
+from typing import Dict, Iterable, Iterator, List, Union, overload
+
+from .drink import Drink
+
+# 재고와 가격 배열의 자료형(부호 있는 64비트 정수)
+TYPECODE = "q"
+# 재고와 가격 배열에 넣을 수 있는 가장 큰 값
+MAX_VALUE = (1 << 8 * array(TYPECODE).itemsize - 1) - 1
+
+
+class _InternTable:
+    """같은 문자열을 한 번만 저장하고 번호로 가리키는 표."""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "_InternTable":
+        """중복 없는 문자열 목록을 번호 순서 그대로 담은 표를 만든다."""
+        table = cls()
+        table.values = list(values)
+        table._ids = {value: index for index, value in enumerate(table.values)}
+        return table
+
+
+class SlotView:
+    """:class:`Inventory`의 슬롯 하나를 :class:`Drink`처럼 보여주는 뷰.
+
+    값을 따로 저장하지 않고 인벤토리 배열을 직접 읽고 쓴다. 슬롯마다 뷰 객체는
+    하나만 만들어지므로 같은 슬롯은 항상 같은 객체이며 딕셔너리 키로 쓸 수 있다.
+
+    Attributes
+    ----------
+    index : int
+        인벤토리 안의 슬롯 위치.
+    """
+
+    __slots__ = ("_inventory", "index")
+
+    def __init__(self, inventory: "Inventory", index: int) -> None:
+        self._inventory = inventory
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        inventory = self._inventory
+        return inventory._names.values[inventory._name_ids[self.index]]
+
+    @property
+    def image_path(self) -> str:
+        inventory = self._inventory
+        return inventory._images.values[inventory._image_ids[self.index]]
+
+    @property
+    def count(self) -> int:
+        return self._inventory.counts[self.index]
+
+    @count.setter
+    def count(self, value: int) -> None:
+        self._inventory.counts[self.index] = value
+
+    @property
+    def price(self) -> int:
+        return self._inventory.prices[self.index]
+
+    @price.setter
+    def price(self, value: int) -> None:
+        self._inventory.prices[self.index] = value
+
+    def to_drink(self) -> Drink:
+        """현재 값을 복사한 :class:`Drink` 객체를 반환한다."""
+        return Drink(self.name, self.price, self.count, self.image_path)
+
+    def __repr__(self) -> str:
+        return (
+            f"SlotView(index={self.index}, name={self.name!r}, price={self.price}, "
+            f"count={self.count}, image_path={self.image_path!r})"
+        )
+
+
+class Inventory:
+    """음료 슬롯을 연속된 배열에 보관하는 재고 저장소.
+
+    이름과 이미지 경로는 중복 없이 표에 한 번만 저장하고 슬롯에는 그 번호만
+    남기며, 재고와 가격은 ``array`` 모듈의 정수 배열 ``counts``와 ``prices``에
+    보관한다. 인덱싱이나 순회로 얻는 :class:`SlotView`는 ``List[Drink]``의
+    원소처럼 ``name``, ``price``, ``count``, ``image_path``를 제공하므로
+    ``Controller.drinks``를 쓰던 코드는 그대로 동작한다.
+    """
+
+    def __init__(self, drinks: Iterable[Drink] = ()) -> None:
+        """빈 저장소를 만들고 ``drinks``가 있으면 차례로 추가한다."""
+        self.counts = array(TYPECODE)
+        self.prices = array(TYPECODE)
+        self._name_ids = array("l")
+        self._image_ids = array("l")
+        self._names = _InternTable()
+        self._images = _InternTable()
+        self._views: List[SlotView] = []
+        for drink in drinks:
+            self.append(drink)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        names: Iterable[str],
+        images: Iterable[str],
+        name_ids: array,
+        image_ids: array,
+        counts: array,
+        prices: array,
+    ) -> "Inventory":
+        """이미 만들어진 표와 배열을 그대로 가져와 저장소를 만든다.
+
+        Parameters
+        ----------
+        names, images : Iterable[str]
+            중복 없는 음료 이름과 이미지 경로 표.
+        name_ids, image_ids : array
+            슬롯별 이름과 이미지 번호. 자료형은 ``"l"``이어야 한다.
+        counts, prices : array
+            슬롯별 재고와 가격. 자료형은 :data:`TYPECODE`이어야 한다.
+
+        음료를 하나씩 복사하지 않으므로 스냅샷 복원처럼 많은 슬롯을 한 번에
+        채울 때 쓴다. 배열은 복사하지 않고 그대로 소유한다.
+        """
+        if not len(name_ids) == len(image_ids) == len(counts) == len(prices):
+            raise ValueError("슬롯 배열의 길이가 서로 다릅니다")
+        inventory = cls()
+        inventory._names = _InternTable.from_values(names)
+        inventory._images = _InternTable.from_values(images)
+        inventory._name_ids = name_ids
+        inventory._image_ids = image_ids
+        inventory.counts = counts
+        inventory.prices = prices
+        inventory._views = [SlotView(inventory, index) for index in range(len(counts))]
+        return inventory
+
+    def append(self, drink: Drink) -> SlotView:
+        """음료 정보를 새 슬롯에 복사하고 그 슬롯의 뷰를 반환한다."""
+        self._name_ids.append(self._names.intern(drink.name))
+        self._image_ids.append(self._images.intern(drink.image_path))
+        self.counts.append(drink.count)
+        self.prices.append(drink.price)
+        view = SlotView(self, len(self._views))
+        self._views.append(view)
+        return view
+
+    def extend(self, drinks: Iterable[Drink]) -> List[SlotView]:
+        """여러 음료를 차례로 새 슬롯에 복사하고 추가된 뷰 목록을 반환한다."""
+        return [self.append(drink) for drink in drinks]
+
+    def replace(self, slot: int, drink: Drink) -> None:
+        """``slot``의 이름, 이미지, 가격, 재고를 ``drink`` 값으로 바꾼다.
+
+        슬롯의 뷰 객체는 그대로 유지된다.
+        """
+        self._name_ids[slot] = self._names.intern(drink.name)
+        self._image_ids[slot] = self._images.intern(drink.image_path)
+        self.counts[slot] = drink.count
+        self.prices[slot] = drink.price
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    @overload
+    def __getitem__(self, index: int) -> SlotView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SlotView]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[SlotView, List[SlotView]]:
+        return self._views[index]
+
+    def __iter__(self) -> Iterator[SlotView]:
+        return iter(self._views)
+
+    def restock_all(self, count: int) -> List[int]:
+        """모든 슬롯의 재고를 ``count``로 채우고 값이 바뀐 슬롯 목록을 반환한다."""
+        changed = [slot for slot, current in enumerate(self.counts) if current != count]
+        self.counts[:] = array(TYPECODE, [count]) * len(self._views)
+        return changed
+
+    def set_prices(self, slots: Iterable[int], price: int) -> List[int]:
+        """``slots``의 가격을 ``price``로 바꾸고 값이 바뀐 슬롯 목록을 반환한다."""
+        prices = self.prices
+        changed = []
+        for slot in slots:
+            if prices[slot] != price:
+                prices[slot] = price
+                changed.append(slot)
+        return changed
+
+    def empty_slots(self) -> List[int]:
+        """재고가 없는 슬롯 위치 목록을 반환한다."""
+        return [slot for slot, count in enumerate(self.counts) if count <= 0]
+
+    def names(self) -> List[str]:
+        """슬롯 순서대로 음료 이름 목록을 반환한다."""
+        values = self._names.values
+        return [values[index] for index in self._name_ids]
+
+
+class ProductIndex:
+    """슬롯과 상품(음료 이름)의 대응과 상품별 총 재고를 관리하는 인덱스.
+
+    같은 음료가 여러 슬롯에 들어 있을 때 슬롯 번호나 상품 이름으로 O(1)에
+    상품, 형제 슬롯, 총 재고를 찾는다. 전체를 다시 훑지 않도록 슬롯 추가와
+    재고 변경이 있을 때마다 :py:meth:`add`와 :py:meth:`adjust`로 갱신한다.
+    """
+
+    def __init__(self) -> None:
+        self._product_of: List[str] = []
+        # 상품 이름 -> 슬롯 위치 목록(추가 순서 = 오름차순)
+        self._slots: Dict[str, List[int]] = {}
+        self._stock: Dict[str, int] = {}
+
+    @classmethod
+    def build(cls, inventory: Inventory) -> "ProductIndex":
+        """``inventory``의 모든 슬롯으로 인덱스를 한 번에 만든다."""
+        index = cls()
+        names = inventory._names.values
+        index._product_of = [names[name_id] for name_id in inventory._name_ids]
+        slots = index._slots
+        stock = index._stock
+        for slot, (product, count) in enumerate(zip(index._product_of, inventory.counts)):
+            siblings = slots.get(product)
+            if siblings is None:
+                slots[product] = [slot]
+                stock[product] = count
+            else:
+                siblings.append(slot)
+                stock[product] += count
+        return index
+
+    def add(self, slot: int, product: str, count: int) -> None:
+        """새 슬롯 ``slot``을 ``product``에 연결하고 재고 ``count``를 더한다."""
+        self._product_of.append(product)
+        self._slots.setdefault(product, []).append(slot)
+        self._stock[product] = self._stock.get(product, 0) + count
+
+    def adjust(self, slot: int, delta: int) -> None:
+        """``slot``의 재고 변화량 ``delta``를 상품 총 재고에 반영한다."""
+        product = self._product_of[slot]
+        self._stock[product] += delta
+
+    def move(self, slot: int, product: str, old_count: int, count: int) -> None:
+        """``slot``의 상품을 ``product``로 바꾸고 재고를 ``count``로 옮긴다.
+
+        ``old_count``는 바꾸기 전 슬롯 재고로, 이전 상품의 총 재고에서 뺀다.
+        """
+        old = self._product_of[slot]
+        self._stock[old] -= old_count
+        if old != product:
+            slots = self._slots[old]
+            slots.remove(slot)
+            if not slots:
+                del self._slots[old]
+                del self._stock[old]
+            siblings = self._slots.setdefault(product, [])
+            # 슬롯 목록의 오름차순을 유지한다
+            siblings.insert(bisect.bisect_left(siblings, slot), slot)
+            self._product_of[slot] = product
+        self._stock[product] = self._stock.get(product, 0) + count
+
+    def fill(self, count: int) -> None:
+        """모든 슬롯의 재고가 ``count``가 되었을 때 총 재고를 다시 맞춘다."""
+        for product, slots in self._slots.items():
+            self._stock[product] = count * len(slots)
+
+    def product_of(self, slot: int) -> str:
+        """슬롯에 들어 있는 상품 이름을 반환한다."""
+        return self._product_of[slot]
+
+    def slots_of(self, product: str) -> List[int]:
+        """상품이 들어 있는 슬롯 위치 목록을 반환한다."""
+        return self._slots.get(product, [])
+
+    def siblings(self, slot: int) -> List[int]:
+        """``slot``과 같은 상품이 들어 있는 슬롯 목록(자기 자신 포함)을 반환한다."""
+        return self._slots[self._product_of[slot]]
+
+    def stock(self, product: str) -> int:
+        """상품의 모든 슬롯 재고 합계를 반환한다."""
+        return self._stock.get(product, 0)
+
+    def products(self) -> List[str]:
+        """등록된 상품 이름 목록을 반환한다."""
+        return list(self._slots)
+
+    def copy(self) -> "ProductIndex":
+        """같은 대응과 재고를 가진 독립된 인덱스를 반환한다."""
+        index = ProductIndex()
+        index._product_of = list(self._product_of)
+        index._slots = {product: list(slots) for product, slots in self._slots.items()}
+        index._stock = dict(self._stock)
+        return index
@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .controller import (
+    CASH_CHANGED,
+    LAYOUT_CHANGED,
+    PRICE_CHANGED,
+    SLOT_CHANGED,
+    STOCK_CHANGED,
+    Controller,
+)
+from .drink import Drink
+
+JOURNAL_FILE = "journal.log"
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def _state_of(controller: Controller) -> Dict[str, Any]:
+    return {
+        "cashes": {str(currency): count for currency, count in controller.cashes.items()},
+        "inserted": controller.inserted_cash,
+        "slots": [[d.name, d.price, d.count, d.image_path] for d in controller.drinks],
+    }
+
+
+class Journal:
+    """컨트롤러 상태 변경을 기록하는 추가 전용 로그.
+
+    ``controller``의 변경 알림마다 변경된 값을 한 줄짜리 JSON 레코드로 만들어
+    메모리 버퍼에 넣기만 하고, 별도의 쓰기 스레드가 ``sync_interval``마다 모인
+    레코드를 한 번에 기록하고 ``fsync``한다(그룹 커밋). 레코드가
+    ``snapshot_every``개 쌓이면 전체 상태를 스냅샷 파일로 저장하고 로그를
+    비운다. 시작할 때는 :func:`recover`로 스냅샷과 로그 뒷부분을 읽어 상태를
+    되살린다.
+    """
+
+    def __init__(
+        self,
+        controller: Controller,
+        directory: str,
+        sync_interval: float = 0.005,
+        snapshot_every: int = 10000,
+        start_seq: int = 0,
+    ) -> None:
+        """로그 파일을 열고 변경 알림 구독과 쓰기 스레드를 시작한다.
+
+        Parameters
+        ----------
+        controller : :class:`Controller`
+            기록할 컨트롤러.
+        directory : str
+            로그와 스냅샷 파일을 둘 디렉터리.
+        sync_interval : float, optional
+            모인 레코드를 기록하고 ``fsync``하는 주기(초).
+        snapshot_every : int, optional
+            스냅샷을 남길 레코드 수 간격.
+        start_seq : int, optional
+            마지막으로 복구된 레코드 번호. :func:`recover`의 반환 값을 넘긴다.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.controller = controller
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = start_seq
+        self._since_snapshot = 0
+        self._file = open(os.path.join(directory, JOURNAL_FILE), "ab")
+        self._buffer: List[bytes] = []
+        # (레코드 번호, 상태, 스냅샷 시점의 버퍼 길이)
+        self._snapshot: Optional[Tuple[int, Dict[str, Any], int]] = None
+        self._written_seq = start_seq
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+        controller.subscribe(self._on_change)
+
+    @classmethod
+    def open(cls, controller: Controller, directory: str, **options: Any) -> "Journal":
+        """``directory``의 기록으로 ``controller`` 상태를 복구한 뒤 로그를 연다."""
+        seq = recover(controller, directory)
+        return cls(controller, directory, start_seq=seq, **options)
+
+    def snapshot(self) -> None:
+        """현재 상태의 스냅샷을 쓰기 스레드에 요청한다."""
+        # 변경 알림과 같은 순서(컨트롤러 잠금 -> 버퍼 잠금)로 잠근다
+        with self.controller.lock, self._cond:
+            self._snapshot = (self.seq, _state_of(self.controller), len(self._buffer))
+            self._since_snapshot = 0
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """지금까지의 레코드가 디스크에 기록될 때까지 기다린다."""
+        with self._cond:
+            target = self.seq
+            self._cond.notify()
+            while self._written_seq < target and self._writer.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self) -> None:
+        """남은 레코드를 기록하고 로그를 닫는다."""
+        self.controller.unsubscribe(self._on_change)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self._file.close()
+
+    def _on_change(self, event: str, payload: Dict[str, Any]) -> None:
+        controller = self.controller
+        if event == CASH_CHANGED:
+            record: Dict[str, Any] = {
+                "t": "c",
+                "c": {str(currency): count for currency, count in controller.cashes.items()},
+                "i": controller.inserted_cash,
+            }
+        elif event == STOCK_CHANGED:
+            record = {"t": "s", "s": payload["slot"], "n": payload["count"]}
+        elif event == PRICE_CHANGED:
+            record = {"t": "p", "s": payload["slot"], "v": payload["price"]}
+        elif event == LAYOUT_CHANGED:
+            self._append_drinks(range(payload.get("first", payload["slots"] - 1), payload["slots"]))
+            return
+        elif event == SLOT_CHANGED:
+            self._append_drinks([payload["slot"]])
+            return
+        else:
+            return
+        self._append([record])
+
+    def _append_drinks(self, slots: Iterable[int]) -> None:
+        drinks = self.controller.drinks
+        self._append([
+            {"t": "d", "s": slot, "d": [drinks[slot].name, drinks[slot].price,
+                                        drinks[slot].count, drinks[slot].image_path]}
+            for slot in slots
+        ])
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        with self._cond:
+            for record in records:
+                self.seq += 1
+                record["q"] = self.seq
+                self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n")
+            self._since_snapshot += len(records)
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot = (self.seq, _state_of(self.controller), len(self._buffer))
+                self._since_snapshot = 0
+                self._cond.notify()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self.sync_interval)
+                batch, self._buffer = self._buffer, []
+                snapshot, self._snapshot = self._snapshot, None
+                closed = self._closed
+                seq = self.seq
+            if snapshot is not None:
+                snapshot_seq, state, split = snapshot
+                self._write_batch(batch[:split])
+                self._write_snapshot(snapshot_seq, state)
+                batch = batch[split:]
+            self._write_batch(batch)
+            with self._cond:
+                self._written_seq = seq
+                self._cond.notify_all()
+            if closed:
+                return
+
+    def _write_batch(self, batch: List[bytes]) -> None:
+        if batch:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _write_snapshot(self, seq: int, state: Dict[str, Any]) -> None:
+        # 임시 파일에 쓰고 교체하여 스냅샷이 반쯤 쓰인 채로 남지 않게 한다
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as fp:
+            json.dump({"seq": seq, **state}, fp, ensure_ascii=False, separators=(",", ":"))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp, path)
+        # 스냅샷에 포함된 레코드는 필요 없으므로 로그를 비운다. 스냅샷 이후의
+        # 레코드는 이어서 기록된다.
+        self._file.truncate(0)
+        self._file.seek(0)
+        os.fsync(self._file.fileno())
+
+
+def recover(controller: Controller, directory: str) -> int:
+    """스냅샷과 그 이후의 로그 레코드로 ``controller`` 상태를 되살린다.
+
+    Parameters
+    ----------
+    controller : :class:`Controller`
+        상태를 복구할 컨트롤러. 기존 음료 슬롯은 기록된 값으로 덮어쓰고,
+        기록에만 있는 슬롯은 새로 추가한다.
+    directory : str
+        로그와 스냅샷 파일이 있는 디렉터리.
+
+    레코드는 변경된 최종 값을 담고 있으므로 키별 마지막 값만 모은 뒤 한 번에
+    반영한다. 정전으로 마지막 줄이 잘렸으면 그 줄을 잘라내고, 줄바꿈만 빠졌으면
+    줄바꿈을 채워 이어서 추가할 수 있게 한다. 마지막으로 반영한 레코드 번호를
+    반환한다.
+    """
+    seq = 0
+    cashes: Optional[Dict[str, int]] = None
+    inserted: Optional[int] = None
+    slots: Dict[int, List[Any]] = {}
+
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, encoding="utf-8") as fp:
+            snapshot = json.load(fp)
+        seq = snapshot["seq"]
+        cashes = snapshot["cashes"]
+        inserted = snapshot["inserted"]
+        slots = dict(enumerate(snapshot["slots"]))
+
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    if os.path.exists(journal_path):
+        with open(journal_path, "r+b") as fp:
+            valid = 0
+            line = b"\n"
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 잘린 마지막 줄을 잘라내어 이후 레코드가 그 뒤에 붙지 않게 한다
+                    fp.truncate(valid)
+                    line = b"\n"
+                    break
+                valid += len(line)
+                if record["q"] <= seq:
+                    continue
+                seq = record["q"]
+                kind = record["t"]
+                if kind == "c":
+                    cashes, inserted = record["c"], record["i"]
+                elif kind == "s":
+                    slots.setdefault(record["s"], [None, None, None, None])[2] = record["n"]
+                elif kind == "p":
+                    slots.setdefault(record["s"], [None, None, None, None])[1] = record["v"]
+                elif kind == "d":
+                    slots[record["s"]] = record["d"]
+            if not line.endswith(b"\n"):
+                # 줄바꿈 직전에 끊긴 마지막 레코드는 읽히지만, 그대로 두면 다음
+                # 레코드가 같은 줄에 붙어 다음 복구 때 둘 다 잘려 나간다
+                fp.seek(valid)
+                fp.write(b"\n")
+
+    if cashes is not None:
+        for currency, count in cashes.items():
+            controller.set_cash(int(currency), count)
+    if inserted is not None:
+        controller.set_inserted_cash(inserted)
+    added = []
+    for slot in sorted(slots):
+        name, price, count, image_path = slots[slot]
+        if slot < len(controller.drinks):
+            drink = controller.drinks[slot]
+            if name is not None and (name, image_path) != (drink.name, drink.image_path):
+                # 카탈로그 갱신으로 다른 음료가 들어간 슬롯
+                controller.replace_drink(slot, Drink(name, price, count, image_path))
+                continue
+            if price is not None:
+                controller.set_price(drink, price)
+            if count is not None:
+                controller.set_stock(drink, count)
+        elif slot == len(controller.drinks) + len(added) and name is not None:
+            added.append(Drink(name, price, count, image_path))
+    controller.extend_drinks(added)
+    return seq
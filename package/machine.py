@@ -1,27 +1,105 @@
-import os
+import contextlib
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from .controller import Controller
-from .drink import Drink
+from . import metrics
+from .auth import ApprovalCache, AuthPipeline, AuthResult, Authorizer, StubAuthorizer
+from .controller import (
+    CARD_CHANGED,
+    CARD_DENIED,
+    CASH_CHANGED,
+    LAYOUT_CHANGED,
+    PRICE_CHANGED,
+    SLOT_CHANGED,
+    STOCK_CHANGED,
+    Controller,
+)
+from .atlas import SpriteAtlas
+from .inventory import SlotView
+from .notice import ERROR, INFO, WARNING, NoticeQueue
+from .image_cache import ImageCache
+from .slot_grid import BUTTONS, CANVAS, ButtonGrid, CanvasGrid, make_grid
+from .thumbnails import DEFAULT_PATH as THUMBNAIL_PATH, ThumbnailStore
+
+# 카드 승인 결과를 확인하는 주기 (밀리초)
+AUTH_POLL_MS = 50
+# 다른 스레드에서 온 변경 알림을 확인하는 주기 (밀리초)
+CHANGE_POLL_MS = 50
+# 연달아 들어온 동전을 한 번에 투입하는 간격 (밀리초). 화면 한 프레임 정도
+COIN_BATCH_MS = 16
+# 알림 수준별 배경색
+NOTICE_COLORS = {INFO: "darkgreen", WARNING: "darkorange", ERROR: "darkred"}
+# 한 페이지에 보여줄 음료 버튼 격자 크기
+GRID_ROWS = 4
+GRID_COLUMNS = 6
 
 
 class Machine:
     """자판기의 GUI 동작을 담당하는 클래스.
 
     ``root``에 배치된 GUI 요소를 관리하며 ``controller``를 통해 비즈니스 로직을
-    수행한다. ``images``와 ``buttons`` 리스트는 동적으로 생성된 위젯과 이미지를
-    보관한다.
+    수행한다. ``images``와 ``buttons`` 리스트는 현재 화면에 표시된 위젯과 이미지를
+    보관하며, 이미지는 ``image_cache``를 통해 재사용된다.
+
+    화면은 :py:meth:`build_frame`으로 한 번 만들어지고, 이후에는 ``controller``의
+    변경 알림을 받아 해당 버튼과 ``cash_label``만 제자리에서 갱신한다.
+
+    처리 결과는 모달 메시지 박스 대신 ``notices``에 쌓여 ``notice_label``에 잠시
+    표시되므로 안내가 떠 있는 동안에도 계속 조작할 수 있다. 동전 투입은
+    :py:meth:`accept_coin`으로 모았다가 한 프레임에 한 번 투입한다.
+
+    장바구니 모드에서는 음료를 누를 때마다 ``cart_slots``에 담기만 하고,
+    :py:meth:`checkout`에서 재고를 한꺼번에 잡은 뒤 현금 또는 카드 승인 한 번으로
+    모두 결제한다. 결제하지 못하면 잡아 둔 재고를 되돌린다.
+
+    카드 승인은 ``auth`` 파이프라인의 작업 스레드에서 처리되며, 화면은 결과를
+    기다리는 동안에도 진행 상황을 보여주고 결제 취소를 받을 수 있다.
+
+    음료 칸은 한 페이지 분량(``rows`` x ``columns``)만 만들어 두고, 슬롯이 그보다
+    많으면 페이지를 넘길 때 같은 칸에 다른 슬롯을 다시 그린다. 관리자 메뉴도
+    같은 방식으로 페이지 단위로 표시한다. 칸은 ``renderer``에 따라 버튼 또는 한
+    장의 캔버스로 그린다.
     """
 
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        image_cache: Optional[ImageCache] = None,
+        authorizer: Optional[Authorizer] = None,
+        rows: int = GRID_ROWS,
+        columns: int = GRID_COLUMNS,
+        renderer: str = BUTTONS,
+        atlas: Optional[SpriteAtlas] = None,
+        approvals: Optional[ApprovalCache] = None,
+    ) -> None:
         """GUI를 초기화하고 컨트롤러를 생성한다.
 
         Parameters
         ----------
         root : :class:`tk.Tk`
             최상위 윈도우 객체로, 자판기 화면이 표시될 대상이다.
+        image_cache : :class:`ImageCache`, optional
+            여러 화면이 공유할 이미지 캐시. 생략하면 ``src/thumbnails.pack``
+            썸네일 묶음을 쓰는 캐시를 새로 만든다.
+        authorizer : :class:`Authorizer`, optional
+            카드 승인 백엔드. 생략하면 지연을 흉내 내는 :class:`StubAuthorizer`를
+            사용한다.
+        rows : int, optional
+            한 페이지의 음료 버튼 행 수.
+        columns : int, optional
+            한 페이지의 음료 버튼 열 수.
+        renderer : str, optional
+            음료 칸 렌더러. ``"buttons"``는 칸마다 버튼을, ``"canvas"``는 한
+            캔버스에 스프라이트 아틀라스로 그린다.
+        atlas : :class:`SpriteAtlas`, optional
+            캔버스 렌더러가 쓸 아틀라스. 생략하면 ``src/drinks.atlas``를 읽거나
+            새로 만든다.
+        approvals : :class:`ApprovalCache`, optional
+            같은 카드의 반복 구매에 재사용할 승인 캐시. 생략하면 기본 설정으로
+            만든다.
 
         ``controller``를 생성하고 ``images``와 ``buttons`` 리스트를 준비한다.
         """
@@ -31,46 +109,81 @@ class Machine:
         # adjust window size as requested
         self.root.geometry("948x431")
         self.root.configure(bg="black")
-        self.images: list[ImageTk.PhotoImage] = []
+        if image_cache is None:
+            image_cache = ImageCache(thumbnails=ThumbnailStore(THUMBNAIL_PATH))
+        self.image_cache = image_cache
+        self.images: list[tk.PhotoImage] = []
         self.buttons: list[tk.Widget] = []
+        self.rows = rows
+        self.columns = columns
+        self.page_size = rows * columns
+        # 현재 페이지 번호. 버튼 k는 슬롯 page * page_size + k를 표시한다
+        self.page = 0
+        # 한 페이지 분량의 음료 칸을 그리는 렌더러. 페이지를 넘겨도 다시 만들지 않는다
+        self.renderer = renderer
+        if renderer == CANVAS and atlas is None:
+            atlas = SpriteAtlas.open()
+        self.atlas = atlas
+        self.slot_grid: Optional[Union[ButtonGrid, CanvasGrid]] = None
+        self._drink_texts: list[str] = []
+        self._refresh_job: Optional[str] = None
+        self.approvals = approvals if approvals is not None else ApprovalCache()
+        self.approvals.watch(self.controller)
+        self.auth = AuthPipeline(
+            authorizer if authorizer is not None else StubAuthorizer(), cache=self.approvals
+        )
+        # 진행 중인 카드 승인 요청 번호와 (카드 번호, 요청 금액)
+        self._auth_request: Optional[int] = None
+        self._auth_charge: Optional[Tuple[str, int]] = None
+        # 화면 스레드가 아닌 곳(제어 API 등)에서 온 변경 알림
+        self._ui_thread = threading.get_ident()
+        self._remote_changes: "queue.SimpleQueue[Tuple[str, Dict[str, Any]]]" = queue.SimpleQueue()
+        # 아직 투입하지 않은 동전. 어느 스레드에서나 넣을 수 있다
+        self._pending_coins: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        self._coin_job: Optional[str] = None
+        self.notices = NoticeQueue()
+        self._notice_job: Optional[str] = None
+        # 장바구니 모드 여부와 담은 슬롯 목록
+        self.cart_var = tk.BooleanVar(master=root, value=False)
+        self.cart_slots: List[int] = []
+        # 모아서 반영할 변경. None이면 알림마다 바로 반영한다
+        self._deferred_slots: Optional[Set[int]] = None
+        self._deferred_cash = False
+        self.controller.subscribe(self.on_change)
         self.build_frame()
+        # 첫 화면을 그린 뒤 새로 만든 썸네일을 저장한다
+        self.root.after_idle(self.image_cache.flush)
+        self.root.after(AUTH_POLL_MS, self._poll_auth)
+        self.root.after(CHANGE_POLL_MS, self._poll_changes)
 
+    @metrics.timed(metrics.RENDER_SECONDS, "build_frame")
     def build_frame(self) -> None:
         """버튼과 화면 요소를 생성하여 GUI를 구성한다.
 
-        ``controller.drinks`` 정보를 사용하여 음료 버튼을 만들고 ``buttons``와
-        ``images`` 리스트에 저장한다. 금액 표시용 ``cash_label``과 각종 제어
-        위젯들도 이 단계에서 생성된다.
+        한 페이지 분량의 음료 버튼을 만들어 ``buttons``에 저장하고
+        :py:meth:`show_page`로 현재 페이지의 음료를 표시한다. 금액 표시용
+        ``cash_label``과 각종 제어 위젯들도 이 단계에서 생성된다.
         """
         # 카드 처리 중 위젯 제어를 쉽게 하기 위해 목록을 관리
         self.buttons.clear()
+        self._drink_texts.clear()
+        # 이미지는 캐시가 보관하므로 현재 화면에 쓰이는 참조만 유지
+        self.images.clear()
 
         drink_frame = tk.Frame(self.root, bg="black")
         drink_frame.grid(row=0, column=0)
 
-        for i in range(4):
-            for j in range(6):
-                index = i * 6 + j
-                if index < len(self.controller.drinks):
-                    drink = self.controller.drinks[index]
-                    state = "X 구매 불가" if drink.count <= 0 else f"{drink.price}원"
-                    fg_color = "red" if drink.count <= 0 else "white"
-                    img = self.load_image(drink.image_path)
-                    btn = tk.Button(
-                        drink_frame,
-                        text=f"{drink.name}\n{state}",
-                        image=img,
-                        compound="top",
-                        fg=fg_color,
-                        bg="black",
-                        width=100,
-                        height=100,
-                        command=lambda d=drink: self.select_drink(d),
-                        relief="groove",
-                    )
-                    self.images.append(img)
-                    btn.grid(row=i, column=j)
-                    self.buttons.append(btn)
+        self.slot_grid = make_grid(
+            self.renderer,
+            drink_frame,
+            self.rows,
+            self.columns,
+            lambda cell: self.select_cell(cell),
+            self.image_cache,
+            self.atlas,
+        )
+        self.buttons.extend(self.slot_grid.widgets)
+        self._drink_texts.extend([""] * self.page_size)
 
         right_frame = tk.Frame(self.root, bg="black")
         right_frame.grid(row=0, column=1, sticky="ns")
@@ -79,6 +192,27 @@ class Machine:
         admin_panel.pack_propagate(False)
         admin_panel.pack()
 
+        # 슬롯이 한 페이지보다 많을 때만 보이는 페이지 이동 버튼
+        self.pager = tk.Frame(admin_panel, bg="black")
+        prev_button = tk.Button(self.pager, text="◀", command=lambda: self.show_page(self.page - 1))
+        prev_button.pack(side="left")
+        self.page_label = tk.Label(self.pager, bg="black", fg="white", font=("맑은 고딕", 12, "bold"))
+        self.page_label.pack(side="left", padx=10)
+        next_button = tk.Button(self.pager, text="▶", command=lambda: self.show_page(self.page + 1))
+        next_button.pack(side="left")
+        self.buttons.extend([prev_button, next_button])
+
+        # 처리 결과를 잠시 보여주는 알림 영역. 알림이 없으면 숨긴다
+        self.notice_label = tk.Label(
+            admin_panel,
+            fg="white",
+            font=("맑은 고딕", 10, "bold"),
+            justify="left",
+            wraplength=270,
+            padx=6,
+            pady=4,
+        )
+
         cash_panel = tk.Frame(right_frame, bg="black", width=300, height=50)
         cash_panel.pack_propagate(False)
         cash_panel.pack()
@@ -142,6 +276,36 @@ class Machine:
         self.refund_button.grid(row=0, column=2, padx=5)
         self.buttons.append(self.refund_button)
 
+        self.cart_toggle = tk.Checkbutton(
+            control_panel,
+            text="장바구니",
+            variable=self.cart_var,
+            bg="black",
+            fg="white",
+            selectcolor="black",
+            activebackground="black",
+            activeforeground="white",
+        )
+        self.cart_toggle.grid(row=1, column=0, pady=3)
+        self.buttons.append(self.cart_toggle)
+
+        self.checkout_button = tk.Button(
+            control_panel,
+            bg="blue",
+            fg="white",
+            command=self.checkout,
+        )
+        self.checkout_button.grid(row=1, column=1, padx=5, pady=3)
+        self.buttons.append(self.checkout_button)
+
+        self.clear_cart_button = tk.Button(
+            control_panel,
+            text="비우기",
+            command=self.clear_cart,
+        )
+        self.clear_cart_button.grid(row=1, column=2, padx=5, pady=3)
+        self.buttons.append(self.clear_cart_button)
+
         card_frame = tk.Frame(right_frame, bg="black")
         card_frame.pack(side="bottom", pady=5)
 
@@ -174,26 +338,210 @@ class Machine:
         self.card_button.pack(side="left", padx=5)
         self.buttons.append(self.card_button)
 
+        # 승인 대기 중에만 활성화되는 결제 취소 버튼
+        self.cancel_button = tk.Button(
+            entry_button_frame,
+            text="결제 취소",
+            bg="red",
+            fg="white",
+            state=tk.DISABLED,
+            command=self.cancel_card_payment,
+        )
+        self.cancel_button.pack(side="left", padx=5)
+
         # Use a keyhole image for the admin button and place it at the
         # bottom-right corner of the admin panel
-        admin_img = self.load_image("src/drinks/keyhole.png", (15, 15))
-        admin_btn = tk.Button(admin_panel, image=admin_img, command=self.admin_menu, bg="white")
-        self.images.append(admin_img)
+        self._admin_image = self.load_image("src/drinks/keyhole.png", (15, 15))
+        admin_btn = tk.Button(admin_panel, image=self._admin_image, command=self.admin_menu, bg="white")
         admin_btn.place(relx=1.0, rely=1.0, anchor="se")
         self.buttons.append(admin_btn)
 
+        self.show_page(self.page)
+        self.update_cart_button()
+        self._show_notices()
+
+    def page_count(self) -> int:
+        """음료 슬롯을 모두 표시하는 데 필요한 페이지 수를 반환한다."""
+        return max(1, -(-len(self.controller.drinks) // self.page_size))
+
+    @metrics.timed(metrics.RENDER_SECONDS, "show_page")
+    def show_page(self, page: int) -> None:
+        """``page`` 페이지의 음료를 기존 버튼에 다시 그린다.
+
+        Parameters
+        ----------
+        page : int
+            표시할 페이지 번호. 범위를 벗어나면 가장 가까운 페이지를 표시한다.
+
+        위젯을 새로 만들지 않고 ``slot_grid``의 칸마다 문구, 이미지, 배치만
+        바꾸며, 슬롯이 없는 칸은 숨긴다.
+        """
+        drinks = self.controller.drinks
+        pages = self.page_count()
+        self.page = max(0, min(page, pages - 1))
+        offset = self.page * self.page_size
+        for cell in range(self.page_size):
+            slot = offset + cell
+            if slot >= len(drinks):
+                self.slot_grid.hide(cell)
+                continue
+            drink = drinks[slot]
+            text, fg_color = self.drink_label(drink)
+            self.slot_grid.draw(cell, text, fg_color, drink.image_path)
+            self._drink_texts[cell] = text
+        # 현재 페이지와 관리자 버튼의 이미지 참조만 유지
+        images: List[tk.PhotoImage] = [img for img in self.slot_grid.images if img is not None]
+        self.images = images + [self._admin_image]
+
+        if pages > 1:
+            self.page_label.config(text=f"{self.page + 1} / {pages}")
+            self.pager.place(relx=0.5, rely=0.0, anchor="n")
+        else:
+            self.pager.place_forget()
+
+    def visible_slots(self) -> range:
+        """현재 페이지에 표시된 슬롯 범위를 반환한다."""
+        offset = self.page * self.page_size
+        return range(offset, min(offset + self.page_size, len(self.controller.drinks)))
+
+    def select_cell(self, cell: int) -> None:
+        """현재 페이지의 ``cell``번째 버튼에 표시된 음료를 선택하거나 장바구니에 담는다."""
+        slot = self.page * self.page_size + cell
+        if slot >= len(self.controller.drinks):
+            return
+        if self.cart_var.get():
+            self.add_to_cart(self.controller.drinks[slot])
+        else:
+            self.select_drink(self.controller.drinks[slot])
+
+    @metrics.timed(metrics.RENDER_SECONDS, "refresh_gui")
     def refresh_gui(self) -> None:
         """화면을 초기화하고 다시 그린다.
 
         ``root`` 하위의 모든 위젯을 제거한 뒤 :py:meth:`build_frame`을
-        호출하여 최신 상태를 반영한다.
+        호출하여 최신 상태를 반영한다. 음료 추가와 재고·가격·금액 변경은
+        :py:meth:`on_change`가 기존 위젯에 반영하므로 화면 전체를 다시 만들어야
+        할 때만 사용한다.
         """
+        if self._refresh_job is not None:
+            self.root.after_cancel(self._refresh_job)
+            self._refresh_job = None
         for widget in self.root.winfo_children():
             widget.destroy()
         self.build_frame()
 
+    def drink_label(self, drink: SlotView) -> Tuple[str, str]:
+        """음료 버튼에 표시할 문구와 글자색을 반환한다.
+
+        같은 상품의 다른 슬롯까지 재고가 없으면 구매 불가로, 거스름돈을 다 줄
+        수 없으면 잔돈 없음으로 표시한다.
+        """
+        if self.controller.in_stock_slot(drink) is None:
+            return f"{drink.name}\nX 구매 불가", "red"
+        if self.controller.exact_change_only(drink):
+            return f"{drink.name}\n{drink.price}원 잔돈없음", "orange"
+        return f"{drink.name}\n{drink.price}원", "white"
+
+    def update_drink_button(self, slot: int) -> None:
+        """``slot`` 위치의 음료 버튼 문구와 색상만 갱신한다.
+
+        현재 페이지에 보이지 않는 슬롯은 페이지를 넘길 때 그려지므로 무시한다.
+        """
+        if slot not in self.visible_slots():
+            return
+        cell = slot - self.page * self.page_size
+        text, fg_color = self.drink_label(self.controller.drinks[slot])
+        if self._drink_texts[cell] != text:
+            self._drink_texts[cell] = text
+            self.slot_grid.relabel(cell, text, fg_color)
+
+    def update_cash_label(self) -> None:
+        """``cash_label``에 현재 투입 금액을 반영한다."""
+        self.cash_label.config(text=f"{self.controller.inserted_cash}원")
+
+    def on_change(self, event: str, payload: Dict[str, Any]) -> None:
+        """``controller``의 변경 알림을 받아 필요한 위젯만 갱신한다.
+
+        Parameters
+        ----------
+        event : str
+            변경 종류. ``stock``, ``price``, ``cash``, ``card``, ``deny``, ``layout``, ``slot`` 등.
+        payload : Dict[str, Any]
+            변경 내용. 음료 관련 알림에는 ``slot``이 포함된다.
+
+        ``layout`` 알림과 보이는 슬롯의 ``slot`` 알림은 여러 번 들어와도 유휴
+        시점에 현재 페이지를 한 번만 다시 그린다. tkinter는 화면 스레드에서만
+        다룰 수 있으므로 다른 스레드에서 온 알림은 큐에 넣었다가 화면 스레드에서
+        처리한다.
+        """
+        if threading.get_ident() != self._ui_thread:
+            self._remote_changes.put((event, payload))
+            return
+        if event in (SLOT_CHANGED, PRICE_CHANGED) and payload["slot"] in self.cart_slots:
+            if event == SLOT_CHANGED:
+                # 다른 음료로 바뀐 슬롯은 장바구니에서 뺀다
+                self.cart_slots = [slot for slot in self.cart_slots if slot != payload["slot"]]
+            self.update_cart_button()
+        if self._deferred_slots is not None and event in (STOCK_CHANGED, PRICE_CHANGED, CASH_CHANGED):
+            if event == CASH_CHANGED:
+                self._deferred_cash = True
+            else:
+                self._deferred_slots.add(payload["slot"])
+            return
+        if event in (STOCK_CHANGED, PRICE_CHANGED):
+            # 빈 형제 슬롯의 구매 가능 표시도 함께 바뀔 수 있다
+            for slot in self.controller.products.siblings(payload["slot"]):
+                self.update_drink_button(slot)
+        elif event == CASH_CHANGED:
+            self.update_cash_label()
+            # 시재와 투입 금액이 바뀌면 잔돈 없음 표시가 달라질 수 있다
+            for slot in self.visible_slots():
+                self.update_drink_button(slot)
+        elif event == CARD_CHANGED:
+            if payload["status"]:
+                self.card_status.config(text="카드 상태: 승인 완료")
+            elif payload["inserted"]:
+                self.card_status.config(text="카드 상태: 결제 대기중")
+        elif event == CARD_DENIED:
+            if self._auth_request is not None and not self.controller.card.inserted:
+                # 승인을 기다리던 카드가 차단되었다
+                self.cancel_card_payment()
+                self.card_status.config(text="카드 상태: 차단된 카드")
+        elif event == SLOT_CHANGED and payload["slot"] not in self.visible_slots():
+            return
+        elif event in (LAYOUT_CHANGED, SLOT_CHANGED) and self._refresh_job is None:
+            self._refresh_job = self.root.after_idle(self._refresh_page)
+
+    @contextlib.contextmanager
+    def coalesced(self) -> Iterator[None]:
+        """블록 안에서 온 재고·가격·현금 알림을 모아 끝날 때 한 번에 반영한다.
+
+        여러 음료를 한꺼번에 잡고 결제할 때 같은 버튼과 ``cash_label``을 여러 번
+        고치지 않도록 한다. 중첩하면 가장 바깥 블록이 끝날 때 반영한다.
+        """
+        if self._deferred_slots is not None:
+            yield
+            return
+        self._deferred_slots = set()
+        self._deferred_cash = False
+        try:
+            yield
+        finally:
+            slots, self._deferred_slots = self._deferred_slots, None
+            products = self.controller.products
+            dirty = {sibling for slot in slots for sibling in products.siblings(slot)}
+            if self._deferred_cash:
+                self.update_cash_label()
+                dirty.update(self.visible_slots())
+            for slot in sorted(dirty):
+                self.update_drink_button(slot)
+
+    def _refresh_page(self) -> None:
+        self._refresh_job = None
+        self.show_page(self.page)
+
     def disable_widgets(self) -> None:
-        """카드 결제 처리 중에는 모든 위젯을 비활성화한다.
+        """관리자 메뉴가 열려 있는 동안 모든 위젯을 비활성화한다.
 
         ``buttons`` 리스트에 저장된 위젯과 ``card_entry`` 입력창의 ``state`` 값을
         변경하여 사용자가 조작할 수 없도록 한다.
@@ -203,107 +551,358 @@ class Machine:
         self.card_entry.config(state=tk.DISABLED)
 
     def enable_widgets(self) -> None:
-        """카드 결제 완료 후 모든 위젯을 다시 활성화한다.
+        """관리자 메뉴를 닫은 뒤 모든 위젯을 다시 활성화한다.
 
-        ``disable_widgets``에서 비활성화한 위젯들의 ``state``를 되돌린다.
+        ``disable_widgets``에서 비활성화한 위젯들의 ``state``를 되돌린다. 카드
+        승인을 기다리는 중이면 음료·카드 위젯은 계속 막아 둔다.
         """
         for btn in self.buttons:
             btn.config(state=tk.NORMAL)
         self.card_entry.config(state=tk.NORMAL)
+        if self._auth_request is not None:
+            self.set_card_payment_widgets(busy=True)
 
     def insert_cash(self) -> None:
-        """투입된 금액을 컨트롤러에 전달한다.
+        """``cash_var``에 설정된 화폐 단위의 동전 하나를 투입한다.
+
+        바로 ``controller.input_cash``를 부르지 않고 :py:meth:`accept_coin`으로
+        모으므로, 연달아 누르면 한 번에 투입되고 ``cash_label``도 한 번만
+        갱신된다.
+        """
+        self.accept_coin(self.cash_var.get())
+
+    def accept_coin(self, currency: int) -> None:
+        """동전(또는 지폐) 하나를 투입 대기열에 넣는다.
+
+        Parameters
+        ----------
+        currency : int
+            투입된 화폐 단위.
+
+        화폐 인식기 스레드에서 불러도 된다. 대기열은 화면 스레드에서
+        ``COIN_BATCH_MS``마다 :py:meth:`flush_coins`로 한 번에 투입된다.
+        """
+        self._pending_coins.put(currency)
+        if threading.get_ident() == self._ui_thread and self._coin_job is None:
+            self._coin_job = self.root.after(COIN_BATCH_MS, self.flush_coins)
+
+    def flush_coins(self) -> int:
+        """대기 중인 동전을 ``controller.input_cash`` 한 번으로 투입하고 그 금액을 반환한다.
+
+        구매와 반환 전에도 호출하여 이미 넣은 동전이 빠지지 않게 한다.
+        """
+        if self._coin_job is not None:
+            self.root.after_cancel(self._coin_job)
+            self._coin_job = None
+        batch: Counter = Counter()
+        while True:
+            try:
+                batch[self._pending_coins.get_nowait()] += 1
+            except queue.Empty:
+                break
+        if batch:
+            self.controller.input_cash(dict(batch))
+        return sum(currency * count for currency, count in batch.items())
 
-        ``cash_var``에 설정된 화폐 단위를 ``controller.input_cash``에 전달하여
-        ``inserted_cash`` 값을 증가시키고, ``cash_label``에 즉시 반영한다.
+    def notify(self, title: str, message: str, level: str = INFO) -> None:
+        """처리 결과를 ``notice_label``에 잠시 표시한다.
+
+        Parameters
+        ----------
+        title : str
+            알림 제목.
+        message : str
+            알림 내용.
+        level : str, optional
+            ``info``, ``warning``, ``error`` 중 하나. 배경색과 표시 시간이 달라진다.
         """
-        amount = self.cash_var.get()
-        self.controller.input_cash({amount: 1})
-        # Update only the cash label instead of rebuilding the entire GUI
-        self.cash_label.config(
-            text=f"{self.controller.inserted_cash}원"
+        self.notices.push(title, message, level)
+        self._show_notices()
+
+    def _show_notices(self) -> None:
+        if self._notice_job is not None:
+            self.root.after_cancel(self._notice_job)
+            self._notice_job = None
+        self.notices.expire()
+        visible = self.notices.visible()
+        if not visible:
+            self.notice_label.place_forget()
+            return
+        self.notice_label.config(
+            text="\n".join(notice.text() for notice in visible),
+            bg=NOTICE_COLORS[visible[-1].level],
         )
+        self.notice_label.place(relx=0.5, rely=0.5, anchor="center")
+        # 다음 알림이 사라질 때 다시 그린다
+        delay = self.notices.next_expiry() - self.notices.clock()
+        self._notice_job = self.root.after(max(1, int(delay * 1000)), self._show_notices)
 
     def refund(self) -> None:
         """투입된 금액을 환불하고 거스름돈을 표시한다.
 
-        ``controller.refund_cash``로 계산된 거스름돈을 메시지 박스로 보여주고
-        ``cash_label``을 0원으로 갱신한다.
+        ``controller.refund_cash``로 계산된 거스름돈을 알림으로 보여준다.
+        시재가 부족해 돌려주지 못한 금액이 있으면 함께 안내한다.
+        ``cash_label``은 변경 알림으로 갱신된다.
         """
+        self.flush_coins()
         change = self.controller.refund_cash()
-        msg = "\n".join([f"{k}원: {v}개" for k, v in change.items()])
-        messagebox.showinfo("거스름돈 반환", msg or "반환할 금액이 없습니다.")
-        # Update the cash label to show that all inserted cash was returned
-        self.cash_label.config(text="0원")
+        msg = ", ".join([f"{k}원 {v}개" for k, v in change.items()])
+        if self.controller.inserted_cash:
+            msg += f"\n거스름돈이 부족하여 {self.controller.inserted_cash}원이 남아 있습니다."
+            self.notify("거스름돈 반환", msg.strip(), WARNING)
+            return
+        self.notify("거스름돈 반환", msg or "반환할 금액이 없습니다.")
 
     def use_card(self) -> None:
         """카드 번호를 입력받아 카드 삽입을 시도한다.
 
-        ``card_entry``에서 번호를 읽어 ``controller.card.insert_card``를 호출한
-        뒤 결과에 따라 ``card_status`` 라벨을 갱신한다.
+        ``card_entry``에서 번호를 읽어 ``controller.insert_card``를 호출한다.
+        성공하면 변경 알림으로 ``card_status`` 라벨이 갱신된다.
         """
         number = self.card_entry.get()
         if not number:
-            messagebox.showwarning("카드 투입", "카드 번호를 입력해주세요.")
+            self.notify("카드 투입", "카드 번호를 입력해주세요.", WARNING)
             return
-        if self.controller.card.insert_card(number):
-            self.card_status.config(text="카드 상태: 결제 대기중")
-        else:
-            messagebox.showerror("카드 오류", "유효하지 않은 카드")
+        if not self.controller.insert_card(number):
+            self.notify("카드 오류", "유효하지 않은 카드", ERROR)
 
-    def select_drink(self, drink: Drink) -> None:
+    def select_drink(self, drink: SlotView) -> None:
         """음료 버튼 클릭 시 결제 여부를 판단하여 제공한다.
 
         Parameters
         ----------
-        drink : :class:`Drink`
+        drink : :class:`SlotView`
             선택된 음료 객체.
 
-        카드가 삽입되어 있으면 ``complete_card_payment``를 예약하고, 그렇지
-        않으면 ``controller.dispense`` 결과를 메시지로 출력한다.
+        카드가 삽입되어 있으면 ``auth`` 파이프라인에 승인을 요청하고 결과가
+        오면 ``complete_card_payment``를 호출한다. 최근에 승인된 카드면 승인
+        캐시의 결과로 바로 결제를 마친다. 그렇지 않으면 대기 중인
+        동전을 먼저 투입한 뒤 ``controller.dispense`` 결과를 알림으로 보여준다.
         """
         # 카드가 삽입되었다면 먼저 카드 결제를 진행
         if self.controller.card.inserted and not self.controller.card.status:
-            if drink.count <= 0:
-                messagebox.showinfo("음료 선택", "재고 없음")
+            if self.controller.in_stock_slot(drink) is None:
+                self.notify("음료 선택", "재고 없음", WARNING)
+                return
+            if self._auth_request is not None:
                 return
             self.card_status.config(text="카드 상태: 결제 요청중")
-            self.disable_widgets()
-            # After 2 seconds approve the card and dispense the drink
-            self.root.after(2000, lambda d=drink: self.complete_card_payment(d))
+            self.set_card_payment_widgets(busy=True)
+            self._auth_charge = (self.controller.card.number, drink.price)
+            self._auth_request = self.auth.submit(
+                *self._auth_charge,
+                lambda result, d=drink: self.complete_card_payment(d, result),
+            )
+            # 캐시된 승인은 이미 결과 큐에 있으므로 다음 주기를 기다리지 않는다
+            self.auth.poll()
         else:
+            self.flush_coins()
             result = self.controller.dispense(drink)
-            messagebox.showinfo("음료 선택", result)
-            self.refresh_gui()
+            self.notify("음료 선택", result, INFO if result == "음료 제공" else WARNING)
 
-    def complete_card_payment(self, drink: Drink) -> None:
-        """승인 지연 후 카드 결제를 마무리한다.
+    def complete_card_payment(self, drink: SlotView, result: AuthResult) -> None:
+        """승인 결과를 받아 카드 결제를 마무리한다.
 
         Parameters
         ----------
-        drink : :class:`Drink`
+        drink : :class:`SlotView`
             결제를 시도한 음료 객체.
+        result : :class:`AuthResult`
+            ``auth`` 파이프라인이 돌려준 승인 결과.
 
-        ``controller.card``의 상태를 승인으로 변경한 뒤 ``dispense``를 호출하고
-        UI 요소를 원래대로 복구한다.
+        승인되면 ``controller.approve_card``로 승인한 뒤 카드로만 ``dispense``를
+        호출하므로 승인을 기다리는 동안 넣은 현금은 투입 금액으로 남고,
+        거절되거나 시간이 초과되면 사유를 안내한다. 이후 카드를 초기화하고 UI
+        요소를 원래대로 복구한다. 재고 표시는 변경 알림으로 갱신된다. 승인되고도
+        음료를 제공하지 못하면 승인 캐시에서 차감한 금액을 되돌린다.
         """
-        self.controller.card.approve()
-        result = self.controller.dispense(drink)
-        self.card_status.config(text="카드 상태: 승인 완료")
-        messagebox.showinfo("카드 결제", "결제가 완료되었습니다")
-        if result:
-            # Update inventory display
-            self.refresh_gui()
+        self._auth_request = None
+        if result.approved and not self.controller.card.inserted:
+            # 승인을 기다리는 동안 카드가 차단되어 빠졌다
+            self.card_status.config(text="카드 상태: 차단된 카드")
+            self.notify("카드 결제", "결제 실패: 차단된 카드", ERROR)
+        elif result.approved:
+            self.controller.approve_card()
+            outcome = self.controller.dispense(drink, by_card=True)
+            if outcome == "음료 제공":
+                self.notify("카드 결제", "결제가 완료되었습니다")
+            else:
+                self.refund_approval()
+                self.notify("카드 결제", outcome, WARNING)
+        else:
+            self.card_status.config(text=f"카드 상태: {result.reason}")
+            self.notify("카드 결제", f"결제 실패: {result.reason}", ERROR)
+        self._auth_charge = None
         # reset card for next transaction
-        self.controller.card.reset()
+        self.controller.reset_card()
+        self.card_entry.delete(0, tk.END)
+        self.set_card_payment_widgets(busy=False)
+
+    def add_to_cart(self, drink: SlotView) -> None:
+        """장바구니 모드에서 ``drink``를 ``cart_slots``에 담는다.
+
+        재고는 :py:meth:`checkout`에서 한꺼번에 잡으므로 여기서는 지금 꺼낼 수
+        있는 음료인지만 확인한다.
+        """
+        if self.controller.in_stock_slot(drink) is None:
+            self.notify("장바구니", f"{drink.name} 재고 없음", WARNING)
+            return
+        self.cart_slots.append(drink.index)
+        self.update_cart_button()
+
+    def clear_cart(self) -> None:
+        """장바구니에 담은 음료를 모두 뺀다."""
+        self.cart_slots.clear()
+        self.update_cart_button()
+
+    def update_cart_button(self) -> None:
+        """``checkout_button``에 담은 음료 수와 현재 가격 기준 합계를 표시한다."""
+        drinks = self.controller.drinks
+        total = sum(drinks[slot].price for slot in self.cart_slots)
+        self.checkout_button.config(text=f"결제 {len(self.cart_slots)}개 / {total}원")
+
+    def checkout(self) -> None:
+        """장바구니의 음료를 한 번에 결제하고 모두 제공한다.
+
+        대기 중인 동전을 먼저 투입한 뒤 ``controller.reserve``로 재고를
+        한꺼번에 잡는다. 카드가 삽입되어 있고 투입 금액이 모자라면 합계로 승인을
+        한 번만 요청하고 결과는 :py:meth:`complete_cart_payment`가 처리한다.
+        그 밖에는 바로 ``controller.checkout``으로 결제하며, 결제하지 못하면
+        잡아 둔 재고를 되돌리고 담은 음료는 그대로 둔다. 버튼과 금액 표시는
+        :py:meth:`coalesced`로 끝날 때 한 번만 갱신한다.
+        """
+        if not self.cart_slots:
+            self.notify("장바구니", "담은 음료가 없습니다", WARNING)
+            return
+        if self._auth_request is not None:
+            return
+        self.flush_coins()
+        controller = self.controller
+        with self.coalesced():
+            if not controller.reserve([controller.drinks[slot] for slot in self.cart_slots]):
+                self.notify("장바구니", "재고가 부족하여 담은 음료를 모두 꺼낼 수 없습니다", WARNING)
+                return
+            total = controller.cart_total()
+            card = controller.card
+            if card.inserted and not card.status and controller.inserted_cash < total:
+                self.card_status.config(text="카드 상태: 결제 요청중")
+                self.set_card_payment_widgets(busy=True)
+                self._auth_charge = (card.number, total)
+                self._auth_request = self.auth.submit(card.number, total, self.complete_cart_payment)
+                self.auth.poll()
+                return
+            result = controller.checkout()
+            if result == "음료 제공":
+                self.notify("장바구니", f"{len(self.cart_slots)}개 결제 완료 ({total}원)")
+                self.clear_cart()
+            else:
+                controller.release_cart()
+                self.notify("장바구니", result, WARNING)
+
+    def complete_cart_payment(self, result: AuthResult) -> None:
+        """장바구니 합계의 카드 승인 결과를 받아 결제를 마무리한다.
+
+        Parameters
+        ----------
+        result : :class:`AuthResult`
+            ``auth`` 파이프라인이 돌려준 승인 결과.
+
+        승인되면 잡아 둔 음료를 모두 카드로 결제하고, 거절되거나 결제할 수 없으면
+        재고를 되돌린다. 승인되고도 결제하지 못하면 승인 캐시에서 차감한 금액을
+        되돌린다. 이후 카드를 초기화하고 UI 요소를 원래대로 복구한다.
+        """
+        self._auth_request = None
+        controller = self.controller
+        with self.coalesced():
+            if result.approved and not controller.card.inserted:
+                controller.release_cart()
+                self.card_status.config(text="카드 상태: 차단된 카드")
+                self.notify("카드 결제", "결제 실패: 차단된 카드", ERROR)
+            elif result.approved:
+                total = controller.cart_total()
+                controller.approve_card()
+                outcome = controller.checkout(by_card=True)
+                if outcome == "음료 제공":
+                    self.notify("장바구니", f"{len(self.cart_slots)}개 결제 완료 ({total}원)")
+                    self.clear_cart()
+                else:
+                    controller.release_cart()
+                    self.refund_approval()
+                    self.notify("장바구니", outcome, WARNING)
+            else:
+                controller.release_cart()
+                self.card_status.config(text=f"카드 상태: {result.reason}")
+                self.notify("카드 결제", f"결제 실패: {result.reason}", ERROR)
+            controller.reset_card()
+        self._auth_charge = None
+        self.card_entry.delete(0, tk.END)
+        self.set_card_payment_widgets(busy=False)
+
+    def refund_approval(self) -> None:
+        """진행 중인 카드 결제의 요청 금액을 ``approvals`` 한도에 되돌린다."""
+        if self._auth_charge is not None:
+            self.approvals.refund(*self._auth_charge)
+
+    def cancel_card_payment(self) -> None:
+        """진행 중인 카드 승인 요청을 취소하고 카드를 반환한다.
+
+        늦게 도착한 승인 결과는 ``auth`` 파이프라인이 버린다. 장바구니 결제를
+        기다리던 중이면 잡아 둔 재고도 되돌린다.
+        """
+        if self._auth_request is None:
+            return
+        self.auth.cancel(self._auth_request)
+        self._auth_request = None
+        self._auth_charge = None
+        with self.coalesced():
+            self.controller.release_cart()
+        self.controller.reset_card()
         self.card_entry.delete(0, tk.END)
-        self.enable_widgets()
+        self.card_status.config(text="카드 상태: 결제 취소")
+        self.set_card_payment_widgets(busy=False)
+
+    def set_card_payment_widgets(self, busy: bool) -> None:
+        """카드 승인 대기 여부에 따라 음료·카드 위젯과 취소 버튼 상태를 바꾼다.
+
+        승인을 기다리는 동안에는 음료 버튼, 장바구니 결제와 카드 입력만 막고,
+        현금 투입과 반환, 결제 취소는 계속 사용할 수 있다. 승인된 결제는 카드로만
+        처리하므로 그동안 넣은 현금은 투입 금액으로 남는다.
+        """
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.slot_grid.set_state(state)
+        self.checkout_button.config(state=state)
+        self.clear_cart_button.config(state=state)
+        self.card_button.config(state=state)
+        self.card_entry.config(state=state)
+        self.cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+
+    def _poll_changes(self) -> None:
+        while True:
+            try:
+                event, payload = self._remote_changes.get_nowait()
+            except queue.Empty:
+                break
+            self.on_change(event, payload)
+        # 다른 스레드의 화폐 인식기가 넣은 동전
+        self.flush_coins()
+        self.root.after(CHANGE_POLL_MS, self._poll_changes)
+
+    def _poll_auth(self) -> None:
+        # 승인 결과를 화면 스레드에서 처리하고 진행 시간을 표시한다
+        self.auth.poll()
+        if self._auth_request is not None:
+            elapsed = self.auth.elapsed(self._auth_request)
+            self.card_status.config(text=f"카드 상태: 결제 요청중 ({elapsed:.1f}초)")
+        self.root.after(AUTH_POLL_MS, self._poll_auth)
 
     def admin_menu(self) -> None:
         """관리자용 현금 및 재고 관리 창을 연다.
 
         ``cashes``와 ``drinks`` 값을 조정할 수 있는 별도 창을 생성하여 보여주며
         창이 닫힐 때 ``apply_changes`` 내부 함수로 변경 사항을 반영한다.
+
+        음료 입력 칸은 한 페이지 분량만 만들고 페이지를 넘길 때 다시 채운다.
+        넘기기 전에 입력한 값은 슬롯별로 보관했다가 저장할 때 함께 반영한다.
         """
         self.disable_widgets()
         window = tk.Toplevel(self.root)
@@ -318,9 +917,10 @@ class Machine:
         window.protocol("WM_DELETE_WINDOW", on_close)
 
         cash_vars: dict[int, tk.IntVar] = {}
-        # use a list for drink variables to avoid hashing Drink instances
-        drink_vars: list[tk.IntVar] = []
-        price_vars: list[tk.IntVar] = []
+        # 슬롯 위치 -> 입력된 재고/가격
+        stock_edits: dict[int, int] = {}
+        price_edits: dict[int, int] = {}
+        admin_page = [0]
 
         cash_frame = tk.LabelFrame(window, text="현금 시재 관리")
         cash_frame.pack(fill="x", padx=10, pady=5)
@@ -334,54 +934,100 @@ class Machine:
         drink_frame = tk.LabelFrame(window, text="음료 재고 관리")
         drink_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-        admin_images: list[ImageTk.PhotoImage] = []
+        # 칸마다 (칸 프레임, 이미지 라벨, 이름 라벨, 재고 변수, 가격 변수)
+        cells: list[tuple[tk.Frame, tk.Label, tk.Label, tk.IntVar, tk.IntVar]] = []
+        for cell in range(self.page_size):
+            frame = tk.Frame(drink_frame)
+
+            # 음료 이미지
+            image_label = tk.Label(frame)
+            image_label.pack()
+
+            # 음료 이름
+            name_label = tk.Label(frame)
+            name_label.pack()
+
+            # 재고 입력 필드
+            stock_frame = tk.Frame(frame)
+            stock_frame.pack(fill="x", pady=2)
+            tk.Label(stock_frame, text="재고:", anchor="w").pack(side="left")
+            var = tk.IntVar()
+            tk.Entry(stock_frame, width=5, textvariable=var).pack(side="left")
 
-        for i in range(4):
-            for j in range(6):
-                idx = i * 6 + j
-                if idx >= len(self.controller.drinks):
+            # 가격 입력 필드
+            price_frame = tk.Frame(frame)
+            price_frame.pack(fill="x", pady=2)
+            tk.Label(price_frame, text="가격:", anchor="w").pack(side="left")
+            price_var = tk.IntVar()
+            tk.Entry(price_frame, width=5, textvariable=price_var).pack(side="left")
+
+            cells.append((frame, image_label, name_label, var, price_var))
+
+        pager = tk.Frame(window)
+        page_label = tk.Label(pager)
+
+        # 현재 페이지의 입력 값을 슬롯별로 보관하는 내부 함수
+        def save_page() -> None:
+            offset = admin_page[0] * self.page_size
+            for cell, (_, _, _, var, price_var) in enumerate(cells):
+                slot = offset + cell
+                if slot < len(self.controller.drinks):
+                    stock_edits[slot] = var.get()
+                    price_edits[slot] = price_var.get()
+
+        # 기존 칸에 ``page`` 페이지의 음료를 채우는 내부 함수
+        def show_admin_page(page: int) -> None:
+            drinks = self.controller.drinks
+            pages = self.page_count()
+            admin_page[0] = max(0, min(page, pages - 1))
+            offset = admin_page[0] * self.page_size
+            # 캐시에서 밀려나더라도 창이 열려 있는 동안 이미지가 유지되도록 보관
+            window.images = []
+            for cell, (frame, image_label, name_label, var, price_var) in enumerate(cells):
+                slot = offset + cell
+                if slot >= len(drinks):
+                    frame.grid_remove()
                     continue
-                drink = self.controller.drinks[idx]
-                cell = tk.Frame(drink_frame)
-                cell.grid(row=i, column=j, padx=5, pady=5)
-        
-                # 음료 이미지
+                drink = drinks[slot]
                 img = self.load_image(drink.image_path, (40, 40))
-                tk.Label(cell, image=img).pack()
-                admin_images.append(img)
-        
-                # 음료 이름
-                tk.Label(cell, text=drink.name).pack()
-        
-                # 재고 입력 필드
-                stock_frame = tk.Frame(cell)
-                stock_frame.pack(fill="x", pady=2)
-                tk.Label(stock_frame, text="재고:", anchor="w").pack(side="left")
-                var = tk.IntVar(value=drink.count)
-                tk.Entry(stock_frame, width=5, textvariable=var).pack(side="left")
-                drink_vars.append(var)
-        
-                # 가격 입력 필드
-                price_frame = tk.Frame(cell)
-                price_frame.pack(fill="x", pady=2)
-                tk.Label(price_frame, text="가격:", anchor="w").pack(side="left")
-                price_var = tk.IntVar(value=drink.price)
-                tk.Entry(price_frame, width=5, textvariable=price_var).pack(side="left")
-                price_vars.append(price_var)
+                window.images.append(img)
+                image_label.config(image=img)
+                name_label.config(text=drink.name)
+                var.set(stock_edits.get(slot, drink.count))
+                price_var.set(price_edits.get(slot, drink.price))
+                frame.grid(row=cell // self.columns, column=cell % self.columns, padx=5, pady=5)
+            page_label.config(text=f"{admin_page[0] + 1} / {pages}")
+
+        def turn_page(step: int) -> None:
+            save_page()
+            show_admin_page(admin_page[0] + step)
+
+        if self.page_count() > 1:
+            pager.pack(pady=5)
+            tk.Button(pager, text="◀", command=lambda: turn_page(-1)).pack(side="left")
+            page_label.pack(side="left", padx=10)
+            tk.Button(pager, text="▶", command=lambda: turn_page(1)).pack(side="left")
+        show_admin_page(self.page)
 
         # 입력된 값을 실제 데이터에 반영하는 내부 함수
         def apply_changes() -> None:
             for currency, var in cash_vars.items():
-                self.controller.cashes[currency] = max(0, var.get())
-            for drink, c_var, p_var in zip(self.controller.drinks, drink_vars, price_vars):
-                drink.count = max(0, c_var.get())
-                drink.price = max(0, p_var.get())
-            self.refresh_gui()
+                self.controller.set_cash(currency, var.get())
+            save_page()
+            drinks = self.controller.drinks
+            for slot, count in stock_edits.items():
+                self.controller.set_stock(drinks[slot], count)
+            for slot, price in price_edits.items():
+                self.controller.set_price(drinks[slot], price)
+            stock_edits.clear()
+            price_edits.clear()
+
+        self.root.after_idle(self.image_cache.flush)
 
         tk.Button(window, text="저장", command=apply_changes).pack(pady=5)
         tk.Button(window, text="닫기", command=on_close).pack(pady=5)
 
-    def load_image(self, path: str, size=(70, 70)) -> ImageTk.PhotoImage:
+    def load_image(self, path: str, size=(70, 70)) -> tk.PhotoImage:
         """이미지 파일을 로드하고 지정 크기로 변환한다.
 
         Parameters
@@ -391,12 +1037,7 @@ class Machine:
         size : tuple[int, int], optional
             불러올 이미지의 크기. 기본값은 ``(70, 70)``.
 
-        경로가 없으면 회색 이미지로 대체하고, ``images`` 목록에 저장되지 않은
-        새 :class:`ImageTk.PhotoImage` 객체를 반환한다.
+        ``image_cache``에 같은 경로와 크기의 이미지가 있으면 디스크를 읽지 않고
+        재사용한다. 경로가 없으면 회색 이미지로 대체한다.
         """
-        if not os.path.exists(path):
-            img = Image.new("RGB", size, color="gray")
-        else:
-            img = Image.open(path)
-        img = img.resize(size)
-        return ImageTk.PhotoImage(img)
+        return self.image_cache.get(path, size)
@@ -0,0 +1,360 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# 계측 여부. 계측 코드는 ``if metrics.enabled:`` 한 번만 확인하므로 꺼져 있을
+# 때는 비용이 거의 없다
+enabled = False
+
+# 지연 시간 히스토그램의 기본 구간 경계(초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def enable() -> None:
+    """계측을 켠다."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """계측을 끈다. 지금까지 모인 값은 유지된다."""
+    global enabled
+    enabled = False
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """레이블별로 증가만 하는 누적 값."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """``labels`` 레이블 값의 카운터를 ``amount``만큼 늘린다."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: "Histogram", labels: Labels) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, *self._labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Histogram:
+    """레이블별 관측 값을 고정 구간으로 세는 히스토그램."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 -> [구간별 개수..., 합계, 전체 개수]
+        self._values: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """관측 값 ``value``를 기록한다."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def time(self, *labels: str):
+        """``with`` 블록의 실행 시간을 기록하는 문맥 관리자를 반환한다.
+
+        계측이 꺼져 있으면 아무 일도 하지 않는 공용 객체를 반환한다.
+        """
+        if not enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return 0 if entry is None else int(entry[-1])
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            items = [(labels, list(entry)) for labels, entry in self._values.items()]
+        for labels, entry in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket", le, cumulative
+            yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, 'le="+Inf"'), entry[-1]
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), entry[-2]
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), entry[-1]
+
+
+class Callback:
+    """내보낼 때마다 함수를 호출해 값을 읽는 지표.
+
+    이미 다른 곳에서 세고 있는 값(예: 이미지 캐시 적중 수)을 계측 비용 없이
+    내보낼 때 사용한다.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, func: Callable[[], float]) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.func = func
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        yield self.name, "", float(self.func())
+
+
+class Registry:
+    """지표를 이름으로 보관하고 한꺼번에 내보낸다."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """지표를 등록하고 그대로 반환한다. 같은 이름이 있으면 교체한다."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def collect(self) -> List[object]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_text(self) -> str:
+        """모든 지표를 Prometheus 텍스트 형식으로 반환한다."""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, float]:
+        """``{이름{레이블}: 값}`` 형태로 모든 표본을 반환한다."""
+        return {
+            f"{name}{labels}": value
+            for metric in self.collect()
+            for name, labels, value in metric.samples()
+        }
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    """``REGISTRY``에 카운터를 만들어 등록한다."""
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def histogram(
+    name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    """``REGISTRY``에 히스토그램을 만들어 등록한다."""
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def register_callback(name: str, help: str, kind: str, func: Callable[[], float]) -> Callback:
+    """``REGISTRY``에 함수로 값을 읽는 지표를 등록한다. ``kind``는 ``counter`` 또는 ``gauge``."""
+    return REGISTRY.register(Callback(name, help, kind, func))
+
+
+def timed(metric: Histogram, *labels: str) -> Callable[[Callable], Callable]:
+    """함수 실행 시간을 ``metric``에 기록하는 데코레이터.
+
+    계측이 꺼져 있으면 ``enabled`` 확인 한 번 뒤 원래 함수를 그대로 호출한다.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - started, *labels)
+
+        return wrapper
+
+    return decorator
+
+
+def render_text() -> str:
+    """``REGISTRY``의 지표를 Prometheus 텍스트 형식으로 반환한다."""
+    return REGISTRY.render_text()
+
+
+# 자판기 기본 지표
+PURCHASES = counter("vending_purchases_total", "음료 선택 결과별 건수", ("outcome",))
+REFUNDS = counter("vending_refunds_total", "거스름돈 반환 횟수")
+CHANGE_FAILURES = counter("vending_change_failures_total", "시재 부족으로 거스름돈을 다 주지 못한 횟수")
+CHANGE_SHORTFALL = counter("vending_change_shortfall_won_total", "돌려주지 못한 거스름돈 합계(원)")
+CARD_AUTH = counter("vending_card_auth_total", "카드 승인 결과별 건수", ("result",))
+CARD_AUTH_SECONDS = histogram("vending_card_auth_seconds", "카드 승인 요청부터 결과까지 걸린 시간(초)")
+RENDER_SECONDS = histogram(
+    "vending_render_seconds",
+    "화면 그리기 시간(초)",
+    ("view",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+class FileExporter:
+    """주기적으로 모든 표본을 회전 로그 파일에 JSON 한 줄로 남긴다.
+
+    파일이 ``max_bytes``를 넘으면 ``logging.handlers.RotatingFileHandler``가
+    ``path.1``, ``path.2``, ...로 밀어내고 ``backups``개까지만 보관한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 10.0,
+        max_bytes: int = 1 << 20,
+        backups: int = 3,
+        registry: Optional[Registry] = None,
+    ) -> None:
+        """내보내기 스레드를 시작한다.
+
+        Parameters
+        ----------
+        path : str
+            기록할 파일 경로.
+        interval : float, optional
+            기록 주기(초).
+        max_bytes : int, optional
+            파일을 회전할 크기.
+        backups : int, optional
+            보관할 이전 파일 수.
+        registry : :class:`Registry`, optional
+            내보낼 지표 모음. 생략하면 ``REGISTRY``.
+        """
+        # 내보내기를 쓸 때만 필요하므로 시작 시간을 줄이기 위해 여기서 가져온다
+        import logging
+        from logging.handlers import RotatingFileHandler
+
+        self.interval = interval
+        self.registry = registry if registry is not None else REGISTRY
+        self._make_record = logging.makeLogRecord
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+
+    def write(self) -> None:
+        """현재 표본을 한 줄 기록한다."""
+        line = json.dumps({"time": time.time(), "metrics": self.registry.snapshot()}, ensure_ascii=False)
+        self._handler.emit(self._make_record({"msg": line}))
+
+    def close(self) -> None:
+        """마지막 표본을 기록하고 스레드를 멈춘다."""
+        self._stop.set()
+        self._thread.join()
+        self.write()
+        self._handler.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+
+def serve_http(port: int, host: str = "127.0.0.1", registry: Optional[Registry] = None) -> "ThreadingHTTPServer":
+    """``/metrics``에서 Prometheus 텍스트를 제공하는 HTTP 서버를 작업 스레드에서 시작한다.
+
+    반환된 서버의 ``shutdown()``으로 멈춘다. ``port``가 0이면 빈 포트를 골라
+    ``server_address``에 기록한다.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    source = registry if registry is not None else REGISTRY
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = source.render_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,112 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# 알림 수준
+INFO = "info"
+WARNING = "warning"
+ERROR = "error"
+
+# 수준별 기본 표시 시간 (초)
+DEFAULT_TTL: Dict[str, float] = {INFO: 3.0, WARNING: 5.0, ERROR: 8.0}
+
+
+@dataclass
+class Notice:
+    """화면에 잠시 표시되는 알림 하나.
+
+    Attributes
+    ----------
+    title, message : str
+        알림 제목과 내용.
+    level : str
+        ``info``, ``warning``, ``error`` 중 하나.
+    expires : float
+        알림이 사라지는 시각(``clock`` 기준 초).
+    count : int
+        같은 알림이 사라지기 전에 다시 들어온 횟수를 포함한 반복 수.
+    """
+
+    title: str
+    message: str
+    level: str
+    expires: float
+    count: int = 1
+
+    def text(self) -> str:
+        """한 줄로 표시할 문구. 반복된 알림은 횟수를 붙인다."""
+        suffix = f" (x{self.count})" if self.count > 1 else ""
+        return f"[{self.title}] {self.message}{suffix}"
+
+
+class NoticeQueue:
+    """자동으로 사라지는 알림 목록.
+
+    모달 메시지 박스 대신 쓰며, 최근 ``limit``개만 보관한다. 아직 보이는
+    알림과 제목·내용·수준이 같은 알림이 들어오면 새로 쌓지 않고 반복 수를
+    늘리고 표시 시간을 연장한다. 화면 갱신은 호출하는 쪽이
+    :py:meth:`next_expiry`에 맞춰 :py:meth:`expire`를 부르면 된다.
+    """
+
+    def __init__(
+        self,
+        limit: int = 3,
+        ttl: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """빈 알림 목록을 만든다.
+
+        Parameters
+        ----------
+        limit : int, optional
+            동시에 보관할 알림 수. 넘으면 가장 오래된 알림부터 버린다.
+        ttl : Dict[str, float], optional
+            수준별 표시 시간(초). 생략하면 :data:`DEFAULT_TTL`.
+        clock : Callable[[], float], optional
+            현재 시각(초)을 반환하는 함수.
+        """
+        self.limit = limit
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.clock = clock
+        self._notices: List[Notice] = []
+
+    def __len__(self) -> int:
+        return len(self._notices)
+
+    def push(self, title: str, message: str, level: str = INFO, ttl: Optional[float] = None) -> Notice:
+        """알림을 추가하거나 같은 알림의 반복 수를 늘리고 그 알림을 반환한다."""
+        expires = self.clock() + (self.ttl[level] if ttl is None else ttl)
+        for index, notice in enumerate(self._notices):
+            if (notice.title, notice.message, notice.level) == (title, message, level):
+                # 가장 최근 위치로 옮겨 먼저 사라지지 않게 한다
+                del self._notices[index]
+                notice.count += 1
+                notice.expires = max(notice.expires, expires)
+                self._notices.append(notice)
+                return notice
+        notice = Notice(title, message, level, expires)
+        self._notices.append(notice)
+        # limit이 0이면 [:-0]이 빈 구간이 되므로 남길 수를 직접 계산한다
+        del self._notices[:max(0, len(self._notices) - self.limit)]
+        return notice
+
+    def expire(self, now: Optional[float] = None) -> bool:
+        """표시 시간이 지난 알림을 지우고, 지운 것이 있는지 반환한다."""
+        if now is None:
+            now = self.clock()
+        kept = [notice for notice in self._notices if notice.expires > now]
+        changed = len(kept) != len(self._notices)
+        self._notices = kept
+        return changed
+
+    def visible(self) -> List[Notice]:
+        """남아 있는 알림을 오래된 것부터 반환한다."""
+        return list(self._notices)
+
+    def next_expiry(self) -> Optional[float]:
+        """가장 먼저 사라질 알림의 시각. 알림이 없으면 ``None``."""
+        return min((notice.expires for notice in self._notices), default=None)
+
+    def clear(self) -> None:
+        """모든 알림을 지운다."""
+        self._notices.clear()
@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import cProfile
+
+# 시간을 따로 집계할 Machine 콜백
+CALLBACKS = (
+    "select_drink", "insert_cash", "refund", "complete_card_payment", "checkout", "complete_cart_payment", "admin_menu",
+)
+
+# 프로파일러 종류
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+BOTH = "both"
+MODES = (SAMPLE, CPROFILE, BOTH)
+
+# 환경 변수로 켤 때 사용하는 이름
+ENV_DIRECTORY = "VENDING_PROFILE"
+ENV_MODE = "VENDING_PROFILE_MODE"
+
+
+class SessionProfiler:
+    """한 번의 실행(세션) 동안 화면 스레드를 프로파일링한다.
+
+    ``sample`` 모드는 작업 스레드가 ``interval``마다 화면 스레드의 호출 스택을
+    읽어 flame graph 도구가 읽는 collapsed stack 파일(``.folded``)로 남기고,
+    ``cprofile`` 모드는 :mod:`cProfile` 결과(``.prof``)를 남긴다. 어느 모드든
+    :py:meth:`instrument`로 감싼 콜백의 호출 수와 실행 시간을 ``.json`` 요약에
+    기록하며, 표본 스택의 맨 앞에는 실행 중이던 콜백 이름이 붙는다.
+
+    프로파일러를 만들지 않으면 어떤 코드도 감싸지 않으므로 비용이 없다.
+    """
+
+    def __init__(self, directory: str, mode: str = SAMPLE, interval: float = 0.005) -> None:
+        """프로파일 파일을 저장할 위치와 방식을 정한다.
+
+        Parameters
+        ----------
+        directory : str
+            세션별 프로파일 파일을 저장할 디렉터리.
+        mode : str, optional
+            ``sample``, ``cprofile`` 또는 ``both``.
+        interval : float, optional
+            표본 추출 주기(초).
+        """
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 프로파일 모드: {mode}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.session = f"session-{stamp}-{os.getpid()}"
+        # 콜백 이름 -> [호출 수, 합계(초), 최댓값(초)]
+        self.callbacks: Dict[str, List[float]] = {}
+        self.stacks: Counter = Counter()
+        self._active: Optional[str] = None
+        self._profile: Optional["cProfile.Profile"] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._target: Optional[int] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionProfiler"]:
+        """``VENDING_PROFILE``이 설정되어 있으면 그 디렉터리로 프로파일러를 만든다."""
+        directory = os.environ.get(ENV_DIRECTORY)
+        if not directory:
+            return None
+        return cls(directory, os.environ.get(ENV_MODE, SAMPLE))
+
+    def instrument(self, obj: Any, names: Sequence[str] = CALLBACKS) -> None:
+        """``obj``의 메서드 ``names``를 실행 시간을 재는 래퍼로 바꾼다.
+
+        인스턴스 속성으로 덮어쓰므로 이후에 만들어지는 위젯의 ``command``와
+        ``self.메서드`` 호출이 모두 래퍼를 거친다.
+        """
+        for name in names:
+            setattr(obj, name, self._wrap(name, getattr(obj, name)))
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        stats = self.callbacks.setdefault(name, [0, 0.0, 0.0])
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            outer, self._active = self._active, name
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._active = outer
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+        return wrapper
+
+    def start(self) -> None:
+        """현재 스레드의 프로파일링을 시작한다."""
+        self._started = time.perf_counter()
+        self._target = threading.get_ident()
+        if self.mode in (CPROFILE, BOTH):
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if self.mode in (SAMPLE, BOTH):
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """프로파일링을 멈춘다."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        self._elapsed = time.perf_counter() - self._started
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        """``func``를 프로파일링하며 실행하고 끝나면 파일을 저장한다."""
+        self.start()
+        try:
+            return func()
+        finally:
+            self.stop()
+            self.write()
+
+    def _sample_loop(self) -> None:
+        frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack.reverse()
+            active = self._active
+            if active is not None:
+                stack.insert(0, f"[{active}]")
+            self.stacks[";".join(stack)] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """콜백별 실행 시간과 표본 수를 요약한다."""
+        return {
+            "session": self.session,
+            "mode": self.mode,
+            "wall_time": self._elapsed,
+            "samples": sum(self.stacks.values()),
+            "interval": self.interval,
+            "callbacks": {
+                name: {
+                    "calls": int(calls),
+                    "total": total,
+                    "mean": total / calls if calls else 0.0,
+                    "max": peak,
+                }
+                for name, (calls, total, peak) in sorted(self.callbacks.items())
+            },
+        }
+
+    def write(self) -> Dict[str, str]:
+        """세션 파일을 저장하고 ``{종류: 경로}``를 반환한다."""
+        base = os.path.join(self.directory, self.session)
+        paths = {"summary": base + ".json"}
+        with open(paths["summary"], "w", encoding="utf-8") as fp:
+            json.dump(self.summary(), fp, ensure_ascii=False, indent=2)
+        if self.stacks:
+            paths["folded"] = base + ".folded"
+            with open(paths["folded"], "w", encoding="utf-8") as fp:
+                for stack, count in self.stacks.most_common():
+                    fp.write(f"{stack} {count}\n")
+        if self._profile is not None:
+            paths["prof"] = base + ".prof"
+            self._profile.dump_stats(paths["prof"])
+        return paths
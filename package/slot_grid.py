@@ -0,0 +1,194 @@
+import base64
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .atlas import SpriteAtlas
+from .image_cache import ImageCache
+
+# 음료 칸 렌더러 종류
+BUTTONS = "buttons"
+CANVAS = "canvas"
+RENDERERS = (BUTTONS, CANVAS)
+
+# 캔버스 렌더러의 칸 크기 (픽셀). 100x100 버튼에 테두리를 더한 크기와 같다
+CELL_SIZE = (106, 106)
+
+
+class ButtonGrid:
+    """음료 칸마다 ``tk.Button``을 하나씩 두는 렌더러.
+
+    칸 ``k``의 버튼을 누르면 ``on_select(k)``를 호출한다. 칸의 이미지는
+    ``image_cache``에서 가져오고, 화면에 쓰이는 참조는 ``images``에 보관한다.
+    """
+
+    def __init__(self, parent: tk.Widget, rows: int, columns: int, on_select: Callable[[int], None],
+                 image_cache: ImageCache) -> None:
+        """한 페이지 분량(``rows`` x ``columns``)의 버튼을 만든다. 배치는 :py:meth:`draw`에서 한다."""
+        self.columns = columns
+        self.image_cache = image_cache
+        self.images: List[Optional[tk.PhotoImage]] = [None] * (rows * columns)
+        self.buttons = [
+            tk.Button(
+                parent,
+                compound="top",
+                bg="black",
+                width=100,
+                height=100,
+                command=lambda k=cell: on_select(k),
+                relief="groove",
+            )
+            for cell in range(rows * columns)
+        ]
+        # disable_widgets/enable_widgets가 함께 다룰 위젯
+        self.widgets: List[tk.Widget] = list(self.buttons)
+
+    def draw(self, cell: int, text: str, fg: str, image_path: str) -> None:
+        """``cell`` 칸에 음료 문구, 글자색과 이미지를 그리고 격자에 배치한다."""
+        image = self.image_cache.get(image_path)
+        self.images[cell] = image
+        btn = self.buttons[cell]
+        btn.config(text=text, fg=fg, image=image)
+        btn.grid(row=cell // self.columns, column=cell % self.columns)
+
+    def relabel(self, cell: int, text: str, fg: str) -> None:
+        """``cell`` 칸의 문구와 글자색만 바꾼다."""
+        self.buttons[cell].config(text=text, fg=fg)
+
+    def hide(self, cell: int) -> None:
+        """슬롯이 없는 ``cell`` 칸을 숨긴다."""
+        self.buttons[cell].grid_remove()
+        self.images[cell] = None
+
+    def set_state(self, state: str) -> None:
+        """모든 칸을 ``tk.NORMAL`` 또는 ``tk.DISABLED`` 상태로 바꾼다."""
+        for btn in self.buttons:
+            btn.config(state=state)
+
+
+class CanvasGrid:
+    """음료 칸 전체를 한 ``tk.Canvas``에 그리는 렌더러.
+
+    칸마다 테두리, 이미지, 문구 항목을 한 번만 만들어 두고, 바뀐 항목만
+    ``itemconfigure``로 고치므로 Tk는 그 항목이 차지한 영역만 다시 그린다.
+    클릭은 좌표로 칸을 계산하여 ``on_select(k)``를 호출하며, 캔버스가
+    ``tk.DISABLED``이면 무시한다.
+
+    이미지는 ``atlas``의 PNG를 한 번만 디코딩한 뒤 경로별로 처음 쓰일 때 한 번
+    잘라 재사용한다. Tk 캔버스 항목은 이미지의 일부 영역을 가리킬 수 없기
+    때문이다. 아틀라스에 없는 경로는 ``image_cache``에서 가져온다.
+    """
+
+    def __init__(self, parent: tk.Widget, rows: int, columns: int, on_select: Callable[[int], None],
+                 image_cache: ImageCache, atlas: Optional[SpriteAtlas] = None,
+                 cell_size: Tuple[int, int] = CELL_SIZE) -> None:
+        """캔버스와 칸별 항목을 만든다. 모든 칸은 숨긴 상태로 시작한다."""
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.image_cache = image_cache
+        self.atlas = atlas
+        self._on_select = on_select
+        width, height = cell_size
+        self.canvas = tk.Canvas(
+            parent, width=columns * width, height=rows * height, bg="black", highlightthickness=0
+        )
+        self.canvas.grid(row=0, column=0)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.widgets: List[tk.Widget] = [self.canvas]
+
+        self._sheet: Optional[tk.PhotoImage] = None
+        if atlas is not None and len(atlas):
+            self._sheet = tk.PhotoImage(data=base64.b64encode(atlas.png), format="png")
+        self._sprites: Dict[str, tk.PhotoImage] = {}
+
+        cells = rows * columns
+        self.images: List[Optional[tk.PhotoImage]] = [None] * cells
+        self._paths: List[Optional[str]] = [None] * cells
+        self._labels: List[Tuple[str, str]] = [("", "")] * cells
+        self._visible = [False] * cells
+        # 칸별 (테두리, 이미지, 문구) 항목 번호
+        self._items: List[Tuple[int, int, int]] = []
+        for cell in range(cells):
+            x = cell % columns * width
+            y = cell // columns * height
+            self._items.append((
+                self.canvas.create_rectangle(
+                    x + 2, y + 2, x + width - 2, y + height - 2, outline="gray40", state=tk.HIDDEN
+                ),
+                self.canvas.create_image(x + width // 2, y + 8, anchor="n", state=tk.HIDDEN),
+                self.canvas.create_text(
+                    x + width // 2, y + height - 6, anchor="s", justify="center",
+                    fill="white", disabledfill="gray50", state=tk.HIDDEN,
+                ),
+            ))
+
+    def sprite(self, path: str) -> tk.PhotoImage:
+        """``path`` 이미지를 아틀라스에서 잘라 반환한다. 한 번 자른 이미지는 재사용한다."""
+        photo = self._sprites.get(path)
+        if photo is not None:
+            return photo
+        region = self.atlas.regions.get(path) if self._sheet is not None else None
+        if region is None:
+            return self.image_cache.get(path)
+        photo = tk.PhotoImage(width=region[2] - region[0], height=region[3] - region[1])
+        photo.tk.call(photo, "copy", self._sheet, "-from", *region)
+        self._sprites[path] = photo
+        return photo
+
+    def draw(self, cell: int, text: str, fg: str, image_path: str) -> None:
+        """``cell`` 칸을 그린다. 이전과 같은 이미지와 문구는 다시 설정하지 않는다."""
+        _, image, _ = self._items[cell]
+        if self._paths[cell] != image_path:
+            photo = self.sprite(image_path)
+            self.canvas.itemconfigure(image, image=photo)
+            self.images[cell] = photo
+            self._paths[cell] = image_path
+        self.relabel(cell, text, fg)
+        if not self._visible[cell]:
+            # 빈 상태는 캔버스의 state를 따르므로 비활성화도 함께 반영된다
+            for item in self._items[cell]:
+                self.canvas.itemconfigure(item, state="")
+            self._visible[cell] = True
+
+    def relabel(self, cell: int, text: str, fg: str) -> None:
+        """``cell`` 칸의 문구 항목만 바꾼다."""
+        if self._labels[cell] != (text, fg):
+            self.canvas.itemconfigure(self._items[cell][2], text=text, fill=fg)
+            self._labels[cell] = (text, fg)
+
+    def hide(self, cell: int) -> None:
+        """슬롯이 없는 ``cell`` 칸의 항목을 숨긴다."""
+        if self._visible[cell]:
+            for item in self._items[cell]:
+                self.canvas.itemconfigure(item, state=tk.HIDDEN)
+            self._visible[cell] = False
+
+    def set_state(self, state: str) -> None:
+        """캔버스를 ``tk.NORMAL`` 또는 ``tk.DISABLED`` 상태로 바꾼다."""
+        self.canvas.config(state=state)
+
+    def cell_at(self, x: int, y: int) -> Optional[int]:
+        """캔버스 좌표 ``(x, y)``에 보이는 칸 번호를 반환한다. 없으면 ``None``."""
+        width, height = self.cell_size
+        column, row = x // width, y // height
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        cell = row * self.columns + column
+        return cell if self._visible[cell] else None
+
+    def _on_click(self, event: tk.Event) -> None:
+        if str(self.canvas.cget("state")) == tk.DISABLED:
+            return
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self._on_select(cell)
+
+
+def make_grid(renderer: str, parent: tk.Widget, rows: int, columns: int, on_select: Callable[[int], None],
+              image_cache: ImageCache, atlas: Optional[SpriteAtlas] = None) -> Union[ButtonGrid, CanvasGrid]:
+    """``renderer`` 이름(``buttons`` 또는 ``canvas``)에 맞는 음료 칸 렌더러를 만든다."""
+    if renderer == BUTTONS:
+        return ButtonGrid(parent, rows, columns, on_select, image_cache)
+    if renderer == CANVAS:
+        return CanvasGrid(parent, rows, columns, on_select, image_cache, atlas)
+    raise ValueError(f"알 수 없는 렌더러: {renderer}")
@@ -0,0 +1,322 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Union
+
+from .card import Card
+from .card_index import RECORD_SIZE, OverlayCardIndex, SetCardIndex, SortedCardIndex, sorted_records
+from .controller import Controller
+from .inventory import TYPECODE, Inventory, ProductIndex
+
+# 현재 스냅샷 형식 버전
+FORMAT_VERSION = 2
+
+_MAGIC = b"VSNP"
+# 매직, 형식 버전, 예약, 슬롯 수, 메타데이터 길이, 투입 금액
+_HEADER = struct.Struct("<4sHHIIq")
+# 슬롯 배열은 모두 리틀 엔디언 64비트 정수로 저장한다
+_ITEM = struct.calcsize("<q")
+_SWAP = sys.byteorder != "little"
+# 이름·이미지 번호 배열("l")을 디스크 바이트에서 바로 채울 수 있는지 여부
+_NATIVE_IDS = array("l").itemsize == _ITEM
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _pad(size: int) -> int:
+    return -size % _ITEM
+
+
+def _to_disk(values: array) -> bytes:
+    if values.typecode != TYPECODE or _SWAP:
+        values = array(TYPECODE, values)
+        if _SWAP:
+            values.byteswap()
+    return values.tobytes()
+
+
+class Snapshot:
+    """컨트롤러 전체 상태(시재, 투입 금액, 슬롯, 가격, 재고, 카드 설정)의 이진 스냅샷.
+
+    파일은 고정 길이 헤더, JSON 메타데이터(화폐 단위별 시재, 이름·이미지 표,
+    카드 번호 수), 8바이트 경계에 맞춘 슬롯 배열(재고, 가격, 이름 번호, 이미지
+    번호)과 카드 번호 구역 순으로 이루어진다. 슬롯 배열은 :class:`Inventory`가
+    쓰는 ``array``와 같은 배치이므로 :py:meth:`load`는 파일을 메모리 매핑하고
+    헤더와 메타데이터만 해석하며, :py:meth:`clone`과 :py:meth:`restore`는
+    슬롯마다 음료 객체를 만들지 않고 배열을 한 번에 복사한다. 같은 스냅샷으로
+    여러 컨트롤러를 만들 때는 상품 인덱스도 한 번만 만들고 복사해 쓴다.
+
+    카드 번호 목록은 :class:`SetCardIndex`인 경우에만 기록하며, 정렬된 고정 길이
+    레코드로 저장하여 복원할 때 문자열로 바꾸지 않고 :class:`SortedCardIndex`로
+    바로 매핑한다. 정렬 인덱스처럼 파일에 있는 인덱스는 기록하지 않고 복원할 때
+    대상의 인덱스를 그대로 두며, 그 위에 실행 중 차단한 번호
+    (:class:`OverlayCardIndex`)만 메타데이터에 기록했다가 다시 얹는다.
+    삽입된 카드와 승인 상태처럼 거래 중에만 의미가 있는 값은 기록하지 않고,
+    장바구니에 잡아 둔 재고는 슬롯에 되돌린 값으로 기록한다.
+    """
+
+    def __init__(self, data: Buffer, source: Optional[mmap.mmap] = None, path: Optional[str] = None) -> None:
+        """스냅샷 바이트의 헤더와 메타데이터를 해석한다.
+
+        Parameters
+        ----------
+        data : bytes-like
+            :py:meth:`to_bytes`로 만든 바이트. 복사하지 않고 참조한다.
+        source : mmap.mmap, optional
+            ``data``가 가리키는 메모리 매핑. :py:meth:`close`에서 닫는다.
+        path : str, optional
+            ``data``를 읽은 파일. 주어지면 카드 번호 구역을 이 파일에서 따로
+            매핑하므로 스냅샷을 닫은 뒤에도 복원한 인덱스를 쓸 수 있다.
+
+        형식이 다르거나 잘린 데이터면 ``ValueError``를 일으킨다.
+        """
+        self._source = source
+        view = memoryview(data)
+        try:
+            magic, version, _, slots, length, inserted = _HEADER.unpack_from(view)
+            if magic != _MAGIC:
+                raise ValueError("스냅샷 파일이 아닙니다")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 스냅샷 형식 버전입니다: {version}")
+            start = _HEADER.size + length
+            start += _pad(start)
+            if len(view) < start + 4 * _ITEM * slots:
+                raise ValueError("스냅샷 슬롯 배열이 잘렸습니다")
+            meta = json.loads(bytes(view[_HEADER.size:_HEADER.size + length]).decode("utf-8"))
+            self.cashes: Dict[int, int] = {int(currency): count for currency, count in meta["cashes"]}
+            self.names: List[str] = meta["names"]
+            self.images: List[str] = meta["images"]
+            self.allowed: Optional[int] = meta["card"]["allowed"]
+            self.denied: Optional[int] = meta["card"]["denied"]
+            self.denied_added: List[str] = meta["card"]["denied_added"]
+            # 카드 번호 구역의 시작 위치
+            self._allowed_at = start + 4 * _ITEM * slots
+            self._denied_at = self._allowed_at + _section(self.allowed)
+            if len(view) < self._denied_at + _section(self.denied):
+                raise ValueError("스냅샷 카드 번호 구역이 잘렸습니다")
+        except (ValueError, struct.error, KeyError, TypeError) as error:
+            # 매핑을 닫을 수 있도록 뷰를 먼저 놓는다
+            view.release()
+            if isinstance(error, ValueError):
+                raise
+            raise ValueError(f"손상된 스냅샷입니다: {error}") from None
+        self.slots: int = slots
+        self.inserted_cash: int = inserted
+        self._view = view
+        self._start = start
+        self._path = path
+        self._products: Optional[ProductIndex] = None
+        self._restored = False
+        # 여러 번 복원해도 카드 번호 인덱스는 한 번만 열어 함께 쓴다(읽기 전용)
+        self._indexes: Dict[int, SortedCardIndex] = {}
+
+    @classmethod
+    def of(cls, controller: Controller) -> "Snapshot":
+        """``controller``의 현재 상태로 스냅샷을 만든다."""
+        return cls(cls.dump(controller))
+
+    @staticmethod
+    def dump(controller: Controller) -> bytes:
+        """``controller``의 현재 상태를 스냅샷 바이트로 직렬화한다.
+
+        컨트롤러의 ``lock``을 잡은 채로 읽으므로 모든 값이 같은 시점의 것이다.
+        """
+        with controller.lock:
+            inventory = controller.drinks
+            counts = array(TYPECODE, inventory.counts)
+            for reservation in controller.cart:
+                counts[reservation.source.index] += 1
+            card = controller.card
+            denied, added = card.denied, []
+            if isinstance(denied, OverlayCardIndex):
+                denied, added = denied.base, sorted(denied.added)
+            allowed_records = _records(card.allowed)
+            denied_records = _records(denied)
+            meta = {
+                "cashes": [[currency, count] for currency, count in controller.cashes.items()],
+                "names": inventory._names.values,
+                "images": inventory._images.values,
+                "card": {
+                    "allowed": _count(allowed_records),
+                    "denied": _count(denied_records),
+                    "denied_added": added,
+                },
+            }
+            encoded = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            parts = [
+                _HEADER.pack(_MAGIC, FORMAT_VERSION, 0, len(inventory), len(encoded), controller.inserted_cash),
+                encoded,
+                bytes(_pad(_HEADER.size + len(encoded))),
+                _to_disk(counts),
+                _to_disk(inventory.prices),
+                _to_disk(inventory._name_ids),
+                _to_disk(inventory._image_ids),
+            ]
+            for records in (allowed_records, denied_records):
+                if records is not None:
+                    parts += [records, bytes(_pad(len(records)))]
+        return b"".join(parts)
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """``path``의 스냅샷 파일을 메모리 매핑하여 연다.
+
+        슬롯 배열은 읽지 않고 매핑된 채로 두었다가 복원할 때 바로 복사한다.
+        다 쓰면 :py:meth:`close`를 호출하거나 ``with`` 문으로 연다.
+        """
+        with open(path, "rb") as fp:
+            if not fp.seek(0, 2):
+                raise ValueError(f"빈 스냅샷 파일입니다: {path}")
+            source = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(source, source, path)
+        except ValueError:
+            source.close()
+            raise
+
+    @classmethod
+    def save(cls, controller: Controller, path: str) -> int:
+        """``controller`` 상태를 임시 파일에 쓴 뒤 교체하여 ``path``에 저장하고 크기를 반환한다."""
+        data = cls.dump(controller)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = path + ".tmp"
+        with open(temp, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp, path)
+        return len(data)
+
+    def to_bytes(self) -> bytes:
+        """스냅샷 바이트 전체를 반환한다."""
+        return self._view.tobytes()
+
+    def close(self) -> None:
+        """메모리 매핑을 닫는다. 이후에는 복원할 수 없다."""
+        self._view.release()
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def inventory(self) -> Inventory:
+        """스냅샷의 슬롯 배열을 복사한 새 :class:`Inventory`를 만든다."""
+        step = _ITEM * self.slots
+        start = self._start
+        return Inventory.from_arrays(
+            self.names,
+            self.images,
+            self._array("l", start + 2 * step, step),
+            self._array("l", start + 3 * step, step),
+            self._array(TYPECODE, start, step),
+            self._array(TYPECODE, start + step, step),
+        )
+
+    def products(self, inventory: Optional[Inventory] = None) -> ProductIndex:
+        """스냅샷 슬롯과 맞는 새 :class:`ProductIndex`를 반환한다.
+
+        ``inventory``를 주면 슬롯을 다시 읽지 않고 그 저장소로 만든다. 같은
+        스냅샷을 두 번 이상 복원하면 그때 만든 인덱스를 보관해 두고 이후에는
+        복사만 한다.
+        """
+        if self._products is not None:
+            return self._products.copy()
+        products = ProductIndex.build(inventory if inventory is not None else self.inventory())
+        if self._restored:
+            self._products = products.copy()
+        # 한 번만 복원하는 경우에는 복사하지 않는다
+        self._restored = True
+        return products
+
+    def card(self) -> Optional[Card]:
+        """기록된 카드 번호로 새 :class:`Card`를 만든다. 기록이 없으면 ``None``.
+
+        기록된 목록은 :class:`SortedCardIndex`로 매핑하며, 실행 중 차단한 번호는
+        :py:meth:`Card.deny`로 다시 얹는다.
+        """
+        if self.allowed is None and self.denied is None and not self.denied_added:
+            return None
+        card = Card(
+            allowed=self._index(self._allowed_at, self.allowed),
+            denied=self._index(self._denied_at, self.denied),
+        )
+        for number in self.denied_added:
+            card.deny(number)
+        return card
+
+    def restore(self, controller: Controller) -> None:
+        """``controller``의 슬롯, 시재, 투입 금액과 카드 설정을 스냅샷 상태로 바꾼다.
+
+        기록된 허용 목록이나 차단 목록이 없으면 ``controller``의 인덱스를 그대로
+        쓰고, 실행 중 차단한 번호는 그 위에 얹는다. 변경은
+        :py:meth:`Controller.load_state`로 한 번에 반영된다.
+        """
+        card = self.card()
+        if card is not None and self.allowed is None:
+            card.allowed = controller.card.allowed
+        if card is not None and self.denied is None:
+            card.denied = controller.card.denied
+            for number in self.denied_added:
+                card.deny(number)
+        inventory = self.inventory()
+        controller.load_state(inventory, self.products(inventory), self.cashes, self.inserted_cash, card)
+
+    def clone(self) -> Controller:
+        """스냅샷 상태를 가진 새 :class:`Controller`를 만든다."""
+        controller = Controller()
+        self.restore(controller)
+        return controller
+
+    def _index(self, offset: int, count: Optional[int]) -> Optional[SortedCardIndex]:
+        if count is None:
+            return None
+        index = self._indexes.get(offset)
+        if index is None:
+            if self._path is not None:
+                # 스냅샷 파일을 따로 매핑하므로 close() 뒤에도 인덱스가 유효하다
+                index = SortedCardIndex(self._path, offset=offset, count=count)
+            else:
+                index = SortedCardIndex.from_buffer(self._view[offset:offset + count * RECORD_SIZE].tobytes())
+            self._indexes[offset] = index
+        return index
+
+    def _array(self, typecode: str, offset: int, size: int) -> array:
+        values = array(typecode)
+        with self._view[offset:offset + size] as part:
+            if typecode == TYPECODE or _NATIVE_IDS:
+                values.frombytes(part)
+                if _SWAP:
+                    values.byteswap()
+            else:
+                values.extend(struct.unpack(f"<{size // _ITEM}q", part))
+        return values
+
+
+def _records(index: Any) -> Optional[bytes]:
+    # 실행 중에 바꿀 수 있는 집합 인덱스만 기록한다. 형식이 다른 번호는 어차피
+    # 삽입할 수 없으므로 빼고 기록한다.
+    if not isinstance(index, SetCardIndex):
+        return None
+    return sorted_records(number for number in index if len(number) == RECORD_SIZE and number.isascii())
+
+
+def _count(records: Optional[bytes]) -> Optional[int]:
+    return None if records is None else len(records) // RECORD_SIZE
+
+
+def _section(count: Optional[int]) -> int:
+    # 카드 번호 구역의 크기(8바이트 경계까지 채운 길이)
+    if count is None:
+        return 0
+    size = count * RECORD_SIZE
+    return size + _pad(size)
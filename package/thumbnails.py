@@ -0,0 +1,150 @@
+import json
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+# 화면에서 쓰는 이미지 크기: 음료 버튼, 관리자 메뉴, 관리자 버튼
+SIZES = ((70, 70), (40, 40), (15, 15))
+# 기본 썸네일 묶음 파일 경로
+DEFAULT_PATH = "src/thumbnails.pack"
+
+_MAGIC = b"THM1"
+_HEADER = struct.Struct("<4sI")
+
+Key = Tuple[str, int, int]
+
+
+class ThumbnailStore:
+    """크기를 줄인 PNG 이미지를 한 파일에 묶어 보관하는 디스크 캐시.
+
+    파일은 헤더, JSON 목차, PNG 바이트 순으로 이루어지며 시작할 때 한 번에
+    읽는다. 항목은 ``(원본 경로, 너비, 높이)``로 찾고, 원본 파일의 수정 시각과
+    크기가 기록과 다르면 없는 것으로 본다. 변경은 :py:meth:`save`에서 임시
+    파일에 쓴 뒤 교체하므로 저장 도중 종료되어도 이전 파일이 남는다.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """``path``의 묶음 파일을 읽는다. 없거나 손상되었으면 빈 상태로 시작한다."""
+        self.path = path
+        # 키 -> (원본 수정 시각(ns), 원본 크기, PNG 바이트)
+        self._entries: Dict[Key, Tuple[int, int, bytes]] = {}
+        self._dirty = False
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            return
+        try:
+            self._entries = _unpack(data)
+        except (ValueError, struct.error, KeyError, IndexError):
+            self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, source: str, size: Tuple[int, int]) -> Optional[bytes]:
+        """원본이 바뀌지 않았으면 ``source``를 ``size``로 줄인 PNG 바이트를 반환한다."""
+        entry = self._entries.get((source, size[0], size[1]))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        if entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+        return entry[2]
+
+    def put(self, source: str, size: Tuple[int, int], data: bytes) -> None:
+        """``source``를 ``size``로 줄인 PNG 바이트를 저장 대기 상태로 추가한다."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return
+        self._entries[(source, size[0], size[1])] = (stat.st_mtime_ns, stat.st_size, data)
+        self._dirty = True
+
+    def save(self) -> bool:
+        """변경 사항이 있으면 파일에 저장하고 저장 여부를 반환한다."""
+        if not self._dirty:
+            return False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as fp:
+            fp.write(_pack(self._entries))
+        os.replace(temp, self.path)
+        self._dirty = False
+        return True
+
+
+def _pack(entries: Dict[Key, Tuple[int, int, bytes]]) -> bytes:
+    index = []
+    blobs = []
+    offset = 0
+    for (source, width, height), (mtime, size, data) in entries.items():
+        index.append([source, width, height, mtime, size, offset, len(data)])
+        blobs.append(data)
+        offset += len(data)
+    header = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(_MAGIC, len(header)) + header + b"".join(blobs)
+
+
+def _unpack(data: bytes) -> Dict[Key, Tuple[int, int, bytes]]:
+    magic, length = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("썸네일 파일이 아닙니다")
+    start = _HEADER.size + length
+    index = json.loads(data[_HEADER.size:start].decode("utf-8"))
+    entries = {}
+    for source, width, height, mtime, size, offset, count in index:
+        blob = data[start + offset:start + offset + count]
+        if len(blob) != count:
+            raise ValueError("썸네일 파일이 잘렸습니다")
+        entries[(source, width, height)] = (mtime, size, blob)
+    return entries
+
+
+def render(source: str, size: Tuple[int, int]) -> bytes:
+    """``source`` 이미지를 ``size``로 줄여 PNG 바이트로 반환한다.
+
+    PIL은 썸네일을 새로 만들 때만 필요하므로 여기서 가져온다.
+    """
+    import io
+
+    from PIL import Image
+
+    with Image.open(source) as src:
+        resized = src.resize(size)
+    buffer = io.BytesIO()
+    resized.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def main() -> None:
+    """이미지 디렉터리의 PNG 파일로 모든 크기의 썸네일을 미리 만든다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="썸네일 묶음 파일 생성기")
+    parser.add_argument("directory", nargs="?", default="src/drinks")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    store = ThumbnailStore(args.output)
+    count = 0
+    for name in sorted(os.listdir(args.directory)):
+        if not name.lower().endswith(".png"):
+            continue
+        # 화면 코드와 같은 경로 표기("src/drinks/cider.png")를 키로 쓴다
+        source = f"{args.directory.rstrip('/')}/{name}"
+        for size in SIZES:
+            if store.get(source, size) is None:
+                store.put(source, size, render(source, size))
+                count += 1
+    store.save()
+    print(f"{count}개의 썸네일을 만들었습니다: {args.output} (전체 {len(store)}개)")
+
+
+if __name__ == "__main__":
+    main()
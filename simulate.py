@@ -0,0 +1,57 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.engine import Engine, read_sessions
+from package.fleet import MachineJob, run_fleet
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """헤드리스 엔진으로 기록된 세션을 재생하는 명령행 진입점.
+
+    기본 음료 구성으로 :class:`Controller`를 만든 뒤 입력 파일(생략 시 표준
+    입력)의 세션을 재생하고, 결과별 건수와 최종 상태를 JSON으로 출력한다.
+    ``--fleet`` 또는 ``--machines``를 주면 자판기마다 별도의 컨트롤러로 여러
+    프로세스에서 재생하고 합친 함대 보고서를 출력한다.
+    """
+    parser = argparse.ArgumentParser(description="자판기 세션 재생기")
+    parser.add_argument("files", nargs="*", help="세션 기록 파일 (JSON Lines). 생략하면 표준 입력")
+    parser.add_argument("--slots", type=int, default=24, help="음료 슬롯 수")
+    parser.add_argument("--stock", type=int, default=10, help="슬롯별 초기 재고")
+    parser.add_argument("--batch-size", type=int, default=1024, help="한 번에 적용할 이벤트 수")
+    parser.add_argument("--fleet", action="store_true", help="파일마다 별도의 자판기로 재생")
+    parser.add_argument("--machines", type=int, default=0, help="가상 세션으로 재생할 자판기 수")
+    parser.add_argument("--sessions", type=int, default=1000, help="자판기별 가상 세션 수")
+    parser.add_argument("--processes", type=int, default=None, help="함대 재생에 사용할 프로세스 수")
+    args = parser.parse_args(argv)
+
+    if args.fleet or args.machines:
+        if args.machines:
+            jobs = [MachineJob(i, sessions=args.sessions, seed=i) for i in range(args.machines)]
+        else:
+            jobs = [MachineJob(i, events_path=path) for i, path in enumerate(args.files)]
+        report = run_fleet(jobs, args.processes, args.slots, args.stock)
+        json.dump(report.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    controller = Controller()
+    controller.extend_drinks(default_drinks(args.slots, args.stock))
+    engine = Engine(controller)
+
+    outcomes: dict = {}
+    streams = [open(path, encoding="utf-8") for path in args.files] or [sys.stdin]
+    for stream in streams:
+        with stream:
+            for outcome, count in engine.replay(read_sessions(stream), args.batch_size).items():
+                outcomes[outcome] = outcomes.get(outcome, 0) + count
+
+    json.dump({"outcomes": outcomes, "state": engine.state()}, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
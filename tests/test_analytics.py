@@ -0,0 +1,107 @@
+import json
+
+from package.analytics import DEPOSIT, SALE, RollingWindow, SalesAnalytics, aggregate_file, build_report
+from package.catalog import default_drinks
+from package.controller import Controller
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def write_history(path, sales):
+    analytics = SalesAnalytics(history=str(path), clock=lambda: 1000.0)
+    for price in sales:
+        analytics.record(SALE, price, slot=0, product="콜라")
+    analytics.close()
+
+
+def test_machines_with_same_file_name_stay_separate(tmp_path):
+    first = tmp_path / "lobby" / "sales.jsonl"
+    second = tmp_path / "gym" / "sales.jsonl"
+    write_history(first, [1000, 1000])
+    write_history(second, [1500])
+
+    report = build_report([str(first), str(second)], processes=1)
+
+    assert report.machines == {str(first): [2, 2000], str(second): [1, 1500]}
+    assert [report.sales, report.revenue] == [3, 3500]
+
+
+def test_rolling_window_expires_old_buckets():
+    window = RollingWindow(span=60, buckets=6)
+    for now in (0, 15, 59):
+        report = window.bucket(now)
+        report.add_sale(0, "콜라", 1000)
+        report.events += 1
+        window.total.add_sale(0, "콜라", 1000)
+        window.total.events += 1
+
+    window.bucket(59.9)
+    assert window.total.sales == 3
+    # 버킷 너비(10초) 단위로 가장 오래된 버킷부터 빠진다
+    window.bucket(60)
+    assert window.total.sales == 2
+    window.bucket(70)
+    assert window.total.sales == 1
+    window.bucket(1000)
+    assert window.total.to_dict() == RollingWindow(60, 6).total.to_dict()
+
+
+def test_report_follows_controller_events_per_window():
+    clock = Clock(10_000)
+    controller = Controller()
+    controller.extend_drinks(default_drinks(2, stock=5))
+    analytics = SalesAnalytics(controller, windows={"minute": (60, 6), "hour": (3600, 60)}, clock=clock)
+    drink = controller.drinks[0]
+
+    controller.input_cash({1000: 2})
+    controller.dispense(drink)
+    clock.now += 120
+    controller.dispense(drink)
+    controller.refund_cash()
+
+    minute = analytics.report("minute")
+    hour = analytics.report("hour")
+    assert (minute.sales, minute.cash_in, minute.cash_out) == (1, 0, 2000 - 2 * drink.price)
+    assert (hour.sales, hour.revenue, hour.cash_in) == (2, 2 * drink.price, 2000)
+    assert hour.products == {drink.name: [2, 2 * drink.price]}
+
+    clock.now += 3600
+    assert analytics.report("hour").events == 0
+    analytics.close()
+
+
+def test_aggregate_file_respects_start_and_end(tmp_path):
+    path = tmp_path / "sales.jsonl"
+    analytics = SalesAnalytics(history=str(path))
+    for now in (100, 200, 300, 400):
+        analytics.record(SALE, now, slot=1, product="물", now=now)
+    analytics.record(DEPOSIT, 5000, now=250)
+    analytics.close()
+
+    report = aggregate_file(str(path), start=200, end=400)
+
+    assert (report.sales, report.revenue, report.cash_in) == (2, 500, 5000)
+    assert report.slots == {1: [2, 500]}
+    assert aggregate_file(str(path), end=100).events == 0
+
+
+def test_torn_history_line_is_repaired_before_appending(tmp_path):
+    path = tmp_path / "sales.jsonl"
+    write_history(path, [1000, 1200])
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+    write_history(path, [1500])
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)[4] for line in lines] == [1000, 1500]
+
+    # 줄바꿈만 빠진 레코드는 그대로 살린다
+    path.write_bytes(path.read_bytes()[:-1])
+    write_history(path, [800])
+    assert aggregate_file(str(path)).revenue == 3300
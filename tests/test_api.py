@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+
+from package.api import ControlServer, _read_frame
+from package.catalog import default_drinks
+from package.controller import Controller
+
+TOKEN = "secret"
+
+
+def make_server():
+    controller = Controller()
+    controller.extend_drinks(default_drinks(4))
+    return ControlServer(controller, port=0, token=TOKEN)
+
+
+async def serving(server, client):
+    task = asyncio.ensure_future(server.serve_forever())
+    while server._server is None:
+        await asyncio.sleep(0.001)
+    try:
+        return await asyncio.wait_for(client(), 5)
+    finally:
+        server._stopped.set()
+        await task
+
+
+async def request(server, authorization):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    writer.write(f"GET /state HTTP/1.1\r\nAuthorization: {authorization}\r\nConnection: close\r\n\r\n".encode())
+    status = (await reader.readline()).split()[1]
+    writer.close()
+    return int(status)
+
+
+def test_token_is_required():
+    server = make_server()
+
+    async def client():
+        return [await request(server, f"Bearer {TOKEN}"), await request(server, "Bearer secreT"),
+                await request(server, "")]
+
+    assert asyncio.run(serving(server, client)) == [200, 401, 401]
+
+
+def test_card_denied_is_pushed_to_subscribers():
+    server = make_server()
+
+    async def client():
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(
+            f"GET /ws HTTP/1.1\r\nAuthorization: Bearer {TOKEN}\r\nUpgrade: websocket\r\n"
+            "Connection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n\r\n".encode()
+        )
+        await reader.readuntil(b"\r\n\r\n")
+        _, state = await _read_frame(reader)
+        server.controller.deny_card("A1B2C3D4E5")
+        _, denied = await _read_frame(reader)
+        writer.close()
+        return json.loads(state)["event"], json.loads(denied)
+
+    assert asyncio.run(serving(server, client)) == ("state", {"event": "deny", "number": "A1B2C3D4E5"})
+
+
+def test_lock_held_by_another_thread_does_not_stall_other_requests():
+    server = make_server()
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        # 화면 스레드가 긴 작업 중에 컨트롤러 잠금을 잡고 있다
+        with server.controller.lock:
+            held.set()
+            release.wait(5)
+
+    async def client():
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            while not held.is_set():
+                await asyncio.sleep(0.001)
+            pending = asyncio.ensure_future(request(server, f"Bearer {TOKEN}"))
+            await asyncio.sleep(0.05)
+            unauthorized = await request(server, "")
+            waiting = not pending.done()
+        finally:
+            release.set()
+        return unauthorized, waiting, await pending
+
+    assert asyncio.run(serving(server, client)) == (401, True, 200)
+
+
+async def put(server, path, values):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    body = json.dumps(values).encode()
+    writer.write(
+        f"PUT {path} HTTP/1.1\r\nAuthorization: Bearer {TOKEN}\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    status = int((await reader.readline()).split()[1])
+    await reader.readuntil(b"\r\n\r\n")
+    result = json.loads(await reader.read())
+    writer.close()
+    return status, result
+
+
+def test_value_beyond_slot_array_is_rejected():
+    server = make_server()
+
+    async def client():
+        return await put(server, "/slots/0", {"price": 10**30})
+
+    status, result = asyncio.run(serving(server, client))
+    assert status == 400
+    assert "price" in result["error"]
+    assert server.controller.drinks[0].price < 10**30
+
+
+def test_unexpected_error_gets_a_json_response():
+    server = make_server()
+
+    def broken(drink, count):
+        raise RuntimeError("boom")
+
+    server.controller.set_stock = broken
+
+    async def client():
+        return await put(server, "/slots/0", {"count": 3})
+
+    assert asyncio.run(serving(server, client)) == (500, {"error": "서버 오류: RuntimeError"})
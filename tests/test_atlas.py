@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from package.atlas import SpriteAtlas, sources_in
+
+
+def make_sources(directory, count):
+    directory.mkdir()
+    for index in range(count):
+        (directory / f"{index}.png").write_bytes(b"png" * (index + 1))
+    (directory / "notes.txt").write_text("무시", encoding="utf-8")
+    return sources_in(str(directory))
+
+
+def stamps_of(sources):
+    return {source: (os.stat(source).st_mtime_ns, os.stat(source).st_size) for source in sources}
+
+
+def test_saved_atlas_loads_with_same_regions(tmp_path):
+    sources = make_sources(tmp_path / "drinks", 2)
+    regions = {sources[0]: (0, 0, 70, 70), sources[1]: (70, 0, 140, 70)}
+    path = str(tmp_path / "drinks.atlas")
+    SpriteAtlas(b"\x89PNG sheet", (70, 70), regions, stamps_of(sources)).save(path)
+
+    atlas = SpriteAtlas.load(path)
+
+    assert (atlas.png, atlas.size, atlas.regions) == (b"\x89PNG sheet", (70, 70), regions)
+    assert atlas.is_fresh(sources)
+
+
+def test_changed_or_missing_sources_are_stale(tmp_path):
+    sources = make_sources(tmp_path / "drinks", 2)
+    atlas = SpriteAtlas(b"", (70, 70), {source: (0, 0, 70, 70) for source in sources}, stamps_of(sources))
+
+    assert not atlas.is_fresh(sources[:1])
+    with open(sources[1], "ab") as fp:
+        fp.write(b"changed")
+    assert not atlas.is_fresh(sources)
+
+
+def test_corrupt_atlas_is_ignored(tmp_path):
+    path = tmp_path / "drinks.atlas"
+    path.write_bytes(b"ATL1\xff\xff")
+
+    assert SpriteAtlas.load(str(path)) is None
+    assert SpriteAtlas.load(str(tmp_path / "missing.atlas")) is None
+
+
+def test_build_packs_sprites_in_a_near_square_grid(tmp_path):
+    image = pytest.importorskip("PIL.Image")
+    directory = tmp_path / "drinks"
+    directory.mkdir()
+    for index in range(5):
+        image.new("RGB", (120, 90), (index * 40, 0, 0)).save(directory / f"{index}.png")
+    sources = sources_in(str(directory))
+
+    atlas = SpriteAtlas.build(sources, (10, 10))
+
+    assert [atlas.regions[source] for source in sources] == [
+        (0, 0, 10, 10), (10, 0, 20, 10), (20, 0, 30, 10), (0, 10, 10, 20), (10, 10, 20, 20),
+    ]
+    assert atlas.is_fresh(sources)
@@ -0,0 +1,97 @@
+from package.auth import ApprovalCache
+from package.controller import Controller
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_refund_restores_spend_after_failed_charge():
+    cache = ApprovalCache(ttl=60, spend_limit=2000, clock=Clock())
+    cache.store("ABCDE12345", 1500)
+    assert not cache.lookup("ABCDE12345", 1000)
+
+    # 승인은 받았지만 품절로 결제하지 못했다
+    cache.refund("ABCDE12345", 1500)
+
+    assert cache.lookup("ABCDE12345", 1000)
+    assert cache.lookup("ABCDE12345", 1000)
+    assert not cache.lookup("ABCDE12345", 1)
+
+
+def test_refund_never_exceeds_spend_limit():
+    cache = ApprovalCache(ttl=60, spend_limit=2000, clock=Clock())
+    cache.store("ABCDE12345", 500)
+    cache.refund("ABCDE12345", 500)
+    cache.refund("ABCDE12345", 500)
+
+    assert not cache.lookup("ABCDE12345", 2001)
+    assert cache.lookup("ABCDE12345", 2000)
+
+
+def test_refund_ignores_expired_entry():
+    clock = Clock()
+    cache = ApprovalCache(ttl=60, spend_limit=2000, clock=clock)
+    cache.store("ABCDE12345", 2000)
+    clock.now = 61
+    cache.refund("ABCDE12345", 2000)
+
+    assert not cache.lookup("ABCDE12345", 100)
+    assert len(cache) == 0
+
+
+def test_approval_expires_after_ttl():
+    clock = Clock()
+    cache = ApprovalCache(ttl=60, spend_limit=5000, clock=clock)
+    cache.store("ABCDE12345", 1000)
+
+    clock.now = 59.9
+    assert cache.lookup("ABCDE12345", 1000)
+    clock.now = 60
+    assert not cache.lookup("ABCDE12345", 1000)
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 0}
+
+
+def test_spend_limit_includes_first_charge():
+    cache = ApprovalCache(ttl=60, spend_limit=3000, clock=Clock())
+    cache.store("ABCDE12345", 1200)
+
+    assert cache.lookup("ABCDE12345", 1200)
+    assert not cache.lookup("ABCDE12345", 700)
+    assert cache.lookup("ABCDE12345", 600)
+
+
+def test_least_recently_used_card_is_evicted():
+    cache = ApprovalCache(ttl=60, max_entries=2, clock=Clock())
+    cache.store("AAAAA11111", 100)
+    cache.store("BBBBB22222", 100)
+    cache.lookup("AAAAA11111", 100)
+    cache.store("CCCCC33333", 100)
+
+    assert len(cache) == 2
+    assert cache.lookup("AAAAA11111", 100)
+    assert not cache.lookup("BBBBB22222", 100)
+
+
+def test_denied_card_is_invalidated():
+    controller = Controller()
+    cache = ApprovalCache(ttl=60, clock=Clock())
+    cache.watch(controller)
+    cache.store("ABCDE12345", 100)
+    cache.store("FGHIJ67890", 100)
+
+    controller.deny_card("ABCDE12345")
+
+    assert not cache.lookup("ABCDE12345", 100)
+    assert cache.lookup("FGHIJ67890", 100)
+
+
+def test_zero_ttl_disables_cache():
+    cache = ApprovalCache(ttl=0, clock=Clock())
+    cache.store("ABCDE12345", 100)
+
+    assert len(cache) == 0
@@ -0,0 +1,99 @@
+import pytest
+
+from package.card import Card
+from package.card_index import (
+    BloomFilter, OverlayCardIndex, SetCardIndex, SortedCardIndex, open_sorted_index, write_sorted_index,
+)
+from package.catalog import default_drinks
+from package.controller import Controller
+
+
+def sorted_denied(tmp_path):
+    path = str(tmp_path / "denied.idx")
+    write_sorted_index(["12345ABCDE"], path)
+    return open_sorted_index(path)
+
+
+def test_deny_layers_over_sorted_index(tmp_path):
+    card = Card(denied=sorted_denied(tmp_path))
+
+    card.deny("A1B2C3D4E5")
+
+    assert isinstance(card.denied, OverlayCardIndex)
+    assert not card.insert_card("12345ABCDE")
+    assert not card.insert_card("A1B2C3D4E5")
+    assert card.insert_card("ABCDE12345")
+
+
+def test_controller_denies_inserted_card_with_sorted_index(tmp_path):
+    controller = Controller()
+    controller.extend_drinks(default_drinks(4))
+    controller.card.denied = sorted_denied(tmp_path)
+    events = []
+    controller.subscribe(lambda event, payload: events.append(event))
+    assert controller.insert_card("ABCDE12345")
+
+    controller.deny_card("ABCDE12345")
+    controller.deny_card("A1B2C3D4E5")
+
+    assert not controller.card.inserted
+    assert events.count("deny") == 2
+    assert not controller.insert_card("ABCDE12345")
+    assert not controller.insert_card("12345ABCDE")
+
+
+NUMBERS = ["ZZZZZ99999", "12345ABCDE", "A1B2C3D4E5", "12345ABCDE", "00000AAAAA"]
+
+
+def test_sorted_index_round_trip_with_bloom(tmp_path):
+    path, bloom_path = str(tmp_path / "allowed.idx"), str(tmp_path / "allowed.bloom")
+
+    assert write_sorted_index(NUMBERS, path, bloom_path) == 4
+    index = open_sorted_index(path, bloom_path)
+
+    assert len(index) == 4
+    assert all(number in index for number in NUMBERS)
+    assert "12345ABCDF" not in index
+    assert "00000AAAA" not in index
+    assert "카드번호카드번호카드" not in index
+    with open(path, "rb") as fp:
+        assert fp.read() == b"00000AAAAA12345ABCDEA1B2C3D4E5ZZZZZ99999"
+
+
+def test_bloom_filter_rejects_before_searching():
+    records = b"AAAAA11111BBBBB22222"
+    bloom = BloomFilter.build([b"AAAAA11111"], 1)
+
+    assert "BBBBB22222" in SortedCardIndex.from_buffer(records)
+    # 필터에 없는 번호는 레코드에 있어도 탐색하지 않고 거절한다
+    assert "BBBBB22222" not in SortedCardIndex.from_buffer(records, bloom)
+    assert "AAAAA11111" in SortedCardIndex.from_buffer(records, bloom)
+
+
+def test_index_file_must_hold_whole_records(tmp_path):
+    path = tmp_path / "broken.idx"
+    path.write_bytes(b"12345ABCDE" + b"123")
+
+    with pytest.raises(ValueError):
+        SortedCardIndex(str(path))
+    with pytest.raises(ValueError):
+        SortedCardIndex.from_buffer(b"12345ABCDE", count=2)
+    with pytest.raises(ValueError):
+        write_sorted_index(["123"], str(tmp_path / "short.idx"))
+
+
+def test_empty_sorted_index(tmp_path):
+    path = str(tmp_path / "empty.idx")
+    write_sorted_index([], path)
+
+    assert "12345ABCDE" not in open_sorted_index(path)
+
+
+def test_set_index_from_file_skips_blank_lines(tmp_path):
+    path = tmp_path / "denied.txt"
+    path.write_text("12345ABCDE\n\n  A1B2C3D4E5  \n", encoding="ascii")
+
+    index = SetCardIndex.from_file(str(path))
+
+    assert sorted(index) == ["12345ABCDE", "A1B2C3D4E5"]
+    assert "A1B2C3D4E5" in index
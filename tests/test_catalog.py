@@ -0,0 +1,91 @@
+import os
+
+from package.catalog import CatalogWatcher, load_catalog, read_catalog
+from package.controller import Controller
+
+
+def write_catalog(path, rows):
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("name,price,count,image_path\n")
+        for row in rows:
+            fp.write(",".join(str(value) for value in row) + "\n")
+    # 같은 크기로 다시 써도 감시자가 바뀐 것을 알 수 있도록 수정 시각을 민다
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_reload_with_bad_row_keeps_slots(tmp_path):
+    image = str(tmp_path / "drink.png")
+    open(image, "wb").close()
+    path = str(tmp_path / "catalog.csv")
+    write_catalog(path, [("물", 800, 5, image), ("콜라", 1200, 5, image), ("사이다", 1100, 5, image)])
+    controller = Controller()
+    controller.extend_drinks(load_catalog(path))
+    watcher = CatalogWatcher(path, controller)
+
+    # 가운데 행의 가격이 잘못되었고 마지막 행의 가격이 바뀌었다
+    write_catalog(path, [("물", 800, 5, image), ("콜라", "abc", 5, image), ("사이다", 1300, 5, image)])
+    assert watcher.poll() is None
+    assert len(watcher.errors) == 1
+    assert [(d.name, d.price, d.count) for d in controller.drinks] == [
+        ("물", 800, 5), ("콜라", 1200, 5), ("사이다", 1100, 5),
+    ]
+
+    # 고친 파일은 다음 poll에서 반영된다
+    write_catalog(path, [("물", 800, 5, image), ("콜라", 1200, 5, image), ("사이다", 1300, 5, image)])
+    diff = watcher.poll()
+    assert diff is not None and diff.repriced == [2]
+    assert not watcher.errors
+
+
+def test_startup_with_bad_row_loads_nothing(tmp_path):
+    image = str(tmp_path / "drink.png")
+    open(image, "wb").close()
+    path = str(tmp_path / "catalog.csv")
+    write_catalog(path, [("물", 800, 5, image), ("콜라", -1, 5, image), ("사이다", 1100, 5, image)])
+    errors = []
+
+    # 시작할 때도 다시 읽을 때처럼 행을 건너뛰어 슬롯을 밀지 않는다
+    assert read_catalog(path, errors) is None
+    assert [error.line for error in errors] == [3]
+
+    write_catalog(path, [("물", 800, 5, image), ("콜라", 1200, 5, image)])
+    errors = []
+    assert [d.name for d in read_catalog(path, errors)] == ["물", "콜라"]
+    assert errors == []
+
+
+def test_unreadable_catalog_is_reported(tmp_path):
+    errors = []
+
+    assert read_catalog(str(tmp_path / "missing.csv"), errors) is None
+    assert len(errors) == 1
+
+
+def test_large_catalog_is_validated_then_added_at_once(tmp_path):
+    image = str(tmp_path / "drink.png")
+    open(image, "wb").close()
+    path = str(tmp_path / "catalog.jsonl")
+    rows = 20_000
+    with open(path, "w", encoding="utf-8") as fp:
+        for slot in range(rows):
+            price = slot % 20 * 100 + 500
+            fp.write(f'{{"name": "음료 {slot}", "price": {price}, "count": 5, "image_path": "{image}"}}\n')
+
+    controller = Controller()
+    events = []
+    controller.subscribe(lambda event, payload: events.append(event))
+    errors = []
+    controller.extend_drinks(read_catalog(path, errors))
+
+    assert errors == []
+    assert len(controller.drinks) == rows
+    assert controller.drinks[rows - 1].name == f"음료 {rows - 1}"
+    assert events.count("layout") == 1
+
+    # 마지막 행 하나만 잘못되어도 앞의 행을 반영하지 않는다
+    with open(path, "a", encoding="utf-8") as fp:
+        fp.write(f'{{"name": "불량", "price": -1, "count": 5, "image_path": "{image}"}}\n')
+    errors = []
+    assert read_catalog(path, errors) is None
+    assert [error.line for error in errors] == [rows + 1]
@@ -0,0 +1,59 @@
+import itertools
+import random
+from typing import Dict, Tuple
+
+from package.change import ChangeIndex, make_change
+
+CURRENCY_POOL = [10, 50, 100, 200, 300, 500, 700, 1000]
+
+
+def brute_force(amount: int, cashes: Dict[int, int]) -> Tuple[int, int]:
+    """모든 조합을 탐색하여 ``(미지급액, 화폐 개수)``의 최솟값을 구한다."""
+    currencies = sorted(cashes)
+    ranges = [range(min(cashes[c], amount // c) + 1) for c in currencies]
+    best = (amount, 0)
+    for combo in itertools.product(*ranges):
+        total = sum(n * c for n, c in zip(combo, currencies))
+        if total <= amount:
+            best = min(best, (amount - total, sum(combo)))
+    return best
+
+
+def random_cases(trials: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(trials):
+        currencies = rng.sample(CURRENCY_POOL, rng.randint(1, 4))
+        cashes = {c: rng.randint(0, 8) for c in currencies}
+        yield rng.randrange(0, 3000, 10), cashes
+
+
+def test_make_change_matches_brute_force():
+    for amount, cashes in random_cases(500):
+        change = make_change(amount, cashes)
+        paid = sum(c * n for c, n in change.coins.items())
+        assert paid + change.shortfall == amount, (amount, cashes, change)
+        assert all(change.coins[c] <= cashes[c] for c in change.coins), (cashes, change)
+        assert (change.shortfall, sum(change.coins.values())) == brute_force(amount, cashes), (amount, cashes)
+
+
+def test_change_index_matches_brute_force():
+    for amount, cashes in random_cases(300, seed=1):
+        index = ChangeIndex(cashes, horizon=3000)
+        assert index.can_make(amount) == (brute_force(amount, cashes)[0] == 0), (amount, cashes)
+
+
+def brute_force_covers(offset: int, cashes: Dict[int, int], memo: Dict[int, bool]) -> bool:
+    """화폐를 하나씩 넣는 모든 순서를 따라가며 마지막 거스름돈을 확인한다."""
+    if offset >= 0:
+        return brute_force(offset, cashes)[0] == 0
+    if offset not in memo:
+        memo[offset] = all(brute_force_covers(offset + currency, cashes, memo) for currency in cashes)
+    return memo[offset]
+
+
+def test_covers_next_coin_matches_brute_force():
+    for _, cashes in random_cases(100, seed=2):
+        index = ChangeIndex(cashes, horizon=3000)
+        memo: Dict[int, bool] = {}
+        for offset in range(-1500, 0, index.unit):
+            assert index.covers_next_coin(offset) == brute_force_covers(offset, cashes, memo), (offset, cashes)
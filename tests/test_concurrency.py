@@ -0,0 +1,24 @@
+import sys
+
+import pytest
+
+from benchmarks.bench_concurrency import make_controller, run, violations
+
+
+@pytest.fixture
+def fast_switching():
+    # 경쟁 상태가 잘 드러나도록 스레드 전환 간격을 줄인다
+    default_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(default_interval)
+
+
+def test_locked_controller_conserves_cash_and_stock(fast_switching):
+    stock = 10**6
+    controller = make_controller(stock, locked=True)
+    cash = sum(currency * count for currency, count in controller.cashes.items())
+    totals = run(controller, producers=3, operations=2000, seed=0)
+
+    assert totals["sold"] > 0
+    assert violations(controller, totals, cash, stock * len(controller.drinks)) == []
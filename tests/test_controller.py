@@ -0,0 +1,83 @@
+import threading
+
+from package.catalog import default_drinks
+from package.controller import Controller
+
+
+def make_controller(slots=4, stock=3):
+    controller = Controller()
+    controller.extend_drinks(default_drinks(slots, stock))
+    return controller
+
+
+def test_card_dispense_ignores_cash_inserted_during_auth():
+    controller = make_controller()
+    assert controller.insert_card("ABCDE12345")
+    # 승인을 기다리는 동안 음료 값 이상의 현금이 들어왔다
+    controller.input_cash({1000: 2})
+    controller.approve_card()
+
+    assert controller.dispense(controller.drinks[2], by_card=True) == "음료 제공"
+    assert controller.inserted_cash == 2000
+
+
+def test_card_checkout_ignores_inserted_cash():
+    controller = make_controller()
+    assert controller.insert_card("ABCDE12345")
+    assert controller.reserve([controller.drinks[0], controller.drinks[1]])
+    controller.input_cash({1000: 2})
+    controller.approve_card()
+
+    assert controller.checkout(by_card=True) == "음료 제공"
+    assert controller.inserted_cash == 2000
+    assert controller.cart == []
+
+
+def test_card_checkout_without_approval_fails():
+    controller = make_controller()
+    assert controller.reserve([controller.drinks[0]])
+    controller.input_cash({1000: 1})
+
+    assert controller.checkout(by_card=True) == "잔액 부족"
+    assert len(controller.cart) == 1
+
+
+def test_cart_total_waits_for_lock():
+    controller = make_controller()
+    assert controller.reserve([controller.drinks[0], controller.drinks[1]])
+    totals = []
+    reader = threading.Thread(target=lambda: totals.append(controller.cart_total()))
+    with controller.lock:
+        reader.start()
+        reader.join(0.05)
+        # 다른 스레드가 장바구니를 바꾸는 중에는 합계를 읽지 않는다
+        assert reader.is_alive()
+        controller.release_cart()
+    reader.join()
+
+    assert totals == [0]
+
+
+def test_changes_send_only_their_own_notifications():
+    controller = make_controller()
+    events = []
+    controller.subscribe(lambda event, payload: events.append((event, payload)))
+    drink = controller.drinks[1]
+    controller.input_cash({1000: 1})
+    del events[:]
+
+    # 화면은 이 알림만으로 바뀐 칸을 고쳐 그리므로 구매가 위젯을 새로 만들 일이 없다
+    controller.dispense(drink)
+    controller.set_stock(drink, 5)
+    controller.set_stock(drink, 5)
+    controller.set_price(drink, 900)
+    controller.set_cash(500, 3)
+
+    assert events == [
+        ("stock", {"slot": 1, "count": 2}),
+        ("cash", {"inserted": 200}),
+        ("sale", {"slot": 1, "product": "물", "price": 800, "payment": "cash"}),
+        ("stock", {"slot": 1, "count": 5}),
+        ("price", {"slot": 1, "price": 900}),
+        ("cash", {"inserted": 200}),
+    ]
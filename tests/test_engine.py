@@ -0,0 +1,50 @@
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.engine import CARD, COIN, REFUND, SELECT, Engine
+
+
+def make_engine():
+    controller = Controller()
+    # 0, 1번 슬롯은 같은 상품(물)이다
+    controller.extend_drinks(default_drinks(4, stock=2))
+    controller.set_stock(controller.drinks[0], 0)
+    return Engine(controller), controller
+
+
+def test_card_select_fails_over_to_sibling_slot():
+    engine, controller = make_engine()
+    engine.apply((CARD, "ABCDE12345"))
+
+    result = engine.apply((SELECT, 0))
+
+    assert result.outcome == "음료 제공"
+    assert controller.drinks[1].count == 1
+    assert not controller.card.inserted
+
+
+def test_card_select_matches_cash_select():
+    card_engine, card_controller = make_engine()
+    cash_engine, cash_controller = make_engine()
+    for _ in range(3):
+        card_engine.apply((CARD, "ABCDE12345"))
+        card_result = card_engine.apply((SELECT, 0))
+        cash_engine.apply((COIN, 1000))
+        cash_result = cash_engine.apply((SELECT, 0))
+        assert card_result.outcome == cash_result.outcome
+    assert list(card_controller.drinks.counts) == list(cash_controller.drinks.counts)
+
+
+def test_consecutive_coins_are_one_input_cash_call():
+    events = [(COIN, 1000), (COIN, 500), (COIN, 7), (COIN, 500), (SELECT, 2), (COIN, 100), (REFUND,)]
+    batched, controller = make_engine()
+    deposits = []
+    controller.subscribe(lambda event, payload: deposits.append(payload.get("deposited")))
+    one_by_one, _ = make_engine()
+
+    results = batched.apply_batch(events)
+
+    assert [deposit for deposit in deposits if deposit is not None] == [2000, 100]
+    assert [result.inserted for result in results[:4]] == [2000] * 4
+    assert results[2].outcome == "사용 불가 화폐"
+    assert [result.outcome for result in results] == [one_by_one.apply(event).outcome for event in events]
+    assert batched.state() == one_by_one.state()
@@ -0,0 +1,55 @@
+import json
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.fleet import FleetReport, MachineJob, MachineReport, run_fleet, run_machine
+from package.snapshot import Snapshot
+
+
+def test_sales_count_with_uneven_starting_stock(tmp_path):
+    controller = Controller()
+    controller.extend_drinks(default_drinks(4, stock=2))
+    controller.set_stock(controller.drinks[2], 5)
+    events = tmp_path / "events.jsonl"
+    sessions = [[["coin", 1000], ["select", slot], ["refund"]] for slot in (2, 2, 0)]
+    events.write_text("\n".join(json.dumps(session) for session in sessions), encoding="utf-8")
+
+    report = run_machine(MachineJob(0, str(events)), slots=4, stock=2, base=Snapshot.of(controller))
+
+    # 레몬에이드 두 개(1000원)와 물 하나(800원)
+    assert (report.sales, report.revenue) == (3, 2800)
+
+
+def test_fleet_revenue_matches_sales_outcomes():
+    report = run_fleet([MachineJob(i, sessions=200, seed=i) for i in range(3)], processes=1)
+
+    assert report.sales == report.outcomes.get("음료 제공", 0)
+    assert report.revenue > 0
+
+
+def test_sharded_fleet_matches_single_process():
+    jobs = [MachineJob(i, sessions=100, seed=i) for i in range(4)]
+
+    single = run_fleet(jobs, processes=1, slots=6, stock=3)
+    sharded = run_fleet(jobs, processes=2, slots=6, stock=3)
+
+    assert sharded.to_dict() == single.to_dict()
+    assert sharded.machines == 4
+
+
+def test_merge_equals_adding_every_machine():
+    reports = [
+        MachineReport(0, events=3, sales=1, revenue=1000, cashes={1000: 1}, stockouts=[2], outcomes={"음료 제공": 1}),
+        MachineReport(1, events=5, sales=2, revenue=1600, cashes={500: 2}, stockouts=[], outcomes={"음료 제공": 2}),
+    ]
+    whole = FleetReport()
+    for report in reports:
+        whole.add(report)
+    merged = FleetReport()
+    for report in reports:
+        part = FleetReport()
+        part.add(report)
+        merged.merge(part)
+
+    assert merged.to_dict() == whole.to_dict()
+    assert merged.stockouts == {0: [2]}
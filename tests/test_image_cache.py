@@ -0,0 +1,66 @@
+import pytest
+
+from package.image_cache import ImageCache
+
+
+class FakePhoto:
+    """크기만 알려주는 ``PhotoImage`` 대역."""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    # 화면 없이 돌 수 있도록 PhotoImage를 만드는 부분만 바꾼다
+    calls = []
+
+    def load(cache, path, size):
+        calls.append((path, size))
+        return FakePhoto(path, size)
+
+    monkeypatch.setattr(ImageCache, "_load", load)
+    return calls
+
+
+def test_hits_and_misses_are_counted(loads):
+    cache = ImageCache()
+    first = cache.get("a.png")
+    assert cache.get("a.png") is first
+    cache.get("a.png", (40, 40))
+
+    assert loads == [("a.png", (70, 70)), ("a.png", (40, 40))]
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2, "bytes": (70 * 70 + 40 * 40) * 4}
+
+
+def test_least_recently_used_entry_is_evicted_first(loads):
+    # 10x10 이미지 세 개(각 400바이트)만 들어가는 상한
+    cache = ImageCache(max_bytes=1200)
+    for name in ("a", "b", "c"):
+        cache.get(name, (10, 10))
+    cache.get("a", (10, 10))
+
+    cache.get("d", (10, 10))
+
+    assert len(cache) == 3 and cache.current_bytes == 1200
+    cache.get("a", (10, 10))
+    cache.get("c", (10, 10))
+    cache.get("b", (10, 10))
+    assert [path for path, _ in loads] == ["a", "b", "c", "d", "b"]
+
+
+def test_entry_larger_than_limit_is_kept_alone(loads):
+    cache = ImageCache(max_bytes=100)
+    cache.get("a", (10, 10))
+    cache.get("b", (10, 10))
+
+    assert len(cache) == 1 and cache.current_bytes == 400
+    cache.get("b", (10, 10))
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,60 @@
+from package.drink import Drink
+from package.inventory import Inventory, ProductIndex
+
+
+def make_inventory():
+    return Inventory([
+        Drink("물", 800, 2, "src/drinks/water.png"),
+        Drink("콜라", 1200, 0, "src/drinks/cola.png"),
+        Drink("물", 800, 3, "src/drinks/water.png"),
+    ])
+
+
+def test_slot_views_read_and_write_arrays():
+    inventory = make_inventory()
+    view = inventory[2]
+    view.count -= 1
+    view.price = 900
+
+    assert (inventory.counts[2], inventory.prices[2]) == (2, 900)
+    assert view.to_drink() == Drink("물", 900, 2, "src/drinks/water.png")
+    assert inventory.names() == ["물", "콜라", "물"]
+    assert inventory.empty_slots() == [1]
+
+
+def test_replace_keeps_the_slot_view():
+    inventory = make_inventory()
+    view = inventory[1]
+    inventory.replace(1, Drink("사이다", 1100, 4, "src/drinks/cider.png"))
+
+    assert inventory[1] is view
+    assert (view.name, view.price, view.count, view.image_path) == ("사이다", 1100, 4, "src/drinks/cider.png")
+
+
+def test_bulk_updates_report_changed_slots():
+    inventory = make_inventory()
+
+    assert inventory.restock_all(3) == [0, 1]
+    assert list(inventory.counts) == [3, 3, 3]
+    assert inventory.set_prices([0, 1, 2], 1200) == [0, 2]
+
+
+def test_product_index_updates_match_a_rebuild():
+    inventory = make_inventory()
+    index = ProductIndex.build(inventory)
+
+    assert index.siblings(2) == [0, 2]
+    assert index.stock("물") == 5
+
+    inventory.counts[0] -= 1
+    index.adjust(0, -1)
+    inventory.replace(0, Drink("콜라", 1200, 6, "src/drinks/cola.png"))
+    index.move(0, "콜라", 1, 6)
+    inventory.append(Drink("물", 800, 1, "src/drinks/water.png"))
+    index.add(3, "물", 1)
+
+    rebuilt = ProductIndex.build(inventory)
+    for product in ("물", "콜라"):
+        assert index.slots_of(product) == rebuilt.slots_of(product)
+        assert index.stock(product) == rebuilt.stock(product)
+    assert index.slots_of("콜라") == [0, 1]
@@ -0,0 +1,81 @@
+import os
+
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.journal import JOURNAL_FILE, SNAPSHOT_FILE, Journal
+
+
+def make_controller():
+    controller = Controller()
+    controller.extend_drinks(default_drinks(4, stock=5))
+    return controller
+
+
+def state(controller):
+    return (dict(controller.cashes), controller.inserted_cash,
+            [(d.name, d.price, d.count) for d in controller.drinks])
+
+
+def run_session(directory, actions, **options):
+    controller = make_controller()
+    journal = Journal.open(controller, str(directory), **options)
+    actions(controller)
+    journal.close()
+    return controller
+
+
+def recovered(directory):
+    controller = make_controller()
+    Journal.open(controller, str(directory)).close()
+    return controller
+
+
+def buy(controller):
+    controller.input_cash({1000: 2})
+    controller.dispense(controller.drinks[2])
+    controller.set_price(controller.drinks[3], 1700)
+
+
+def test_recover_replays_snapshot_and_log_tail(tmp_path):
+    def actions(controller):
+        for _ in range(3):
+            buy(controller)
+
+    source = run_session(tmp_path, actions, snapshot_every=4)
+
+    assert os.path.exists(tmp_path / SNAPSHOT_FILE)
+    assert os.path.getsize(tmp_path / JOURNAL_FILE) > 0
+    assert state(recovered(tmp_path)) == state(source)
+
+
+def test_torn_final_line_is_dropped_and_later_records_survive(tmp_path):
+    run_session(tmp_path, buy)
+    expected = state(recovered(tmp_path))
+    with open(tmp_path / JOURNAL_FILE, "ab") as fp:
+        fp.write(b'{"t":"s","s":0,"n":')
+
+    # 잘린 줄을 잘라낸 뒤 이어서 기록한 레코드도 다음 복구에서 읽혀야 한다
+    controller = make_controller()
+    journal = Journal.open(controller, str(tmp_path))
+    assert state(controller) == expected
+    controller.set_stock(controller.drinks[0], 1)
+    journal.close()
+
+    assert recovered(tmp_path).drinks[0].count == 1
+
+
+def test_record_torn_before_newline_keeps_next_record(tmp_path):
+    source = run_session(tmp_path, buy)
+    path = tmp_path / JOURNAL_FILE
+    with open(path, "rb+") as fp:
+        fp.truncate(os.path.getsize(path) - 1)
+
+    controller = make_controller()
+    journal = Journal.open(controller, str(tmp_path))
+    assert state(controller) == state(source)
+    controller.set_stock(controller.drinks[1], 2)
+    journal.close()
+
+    controller = recovered(tmp_path)
+    assert controller.drinks[1].count == 2
+    assert state(controller)[:2] == state(source)[:2]
@@ -0,0 +1,61 @@
+import urllib.request
+
+from package import metrics
+from package.catalog import default_drinks
+from package.controller import Controller
+
+
+def test_render_text_in_prometheus_format():
+    registry = metrics.Registry()
+    sales = registry.register(metrics.Counter("sales_total", "판매 수", ("outcome",)))
+    latency = registry.register(metrics.Histogram("auth_seconds", "승인 시간", buckets=(0.1, 1.0)))
+    sales.inc("cash")
+    sales.inc("cash", amount=2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3.0)
+
+    assert registry.render_text() == (
+        "# HELP sales_total 판매 수\n"
+        "# TYPE sales_total counter\n"
+        'sales_total{outcome="cash"} 3\n'
+        "# HELP auth_seconds 승인 시간\n"
+        "# TYPE auth_seconds histogram\n"
+        'auth_seconds_bucket{le="0.1"} 1\n'
+        'auth_seconds_bucket{le="1.0"} 2\n'
+        'auth_seconds_bucket{le="+Inf"} 3\n'
+        "auth_seconds_sum 3.55\n"
+        "auth_seconds_count 3\n"
+    )
+
+
+def test_http_exporter_serves_metrics_path():
+    registry = metrics.Registry()
+    registry.register(metrics.Callback("cache_hits_total", "캐시 적중 수", "counter", lambda: 7))
+    server = metrics.serve_http(0, registry=registry)
+    try:
+        url = "http://%s:%d" % server.server_address
+        with urllib.request.urlopen(url + "/metrics") as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "# TYPE cache_hits_total counter\ncache_hits_total 7\n" in body
+
+
+def test_controller_counts_purchases_only_when_enabled():
+    controller = Controller()
+    controller.extend_drinks(default_drinks(1, stock=5))
+    drink = controller.drinks[0]
+    before = metrics.PURCHASES.value("insufficient_funds")
+
+    controller.dispense(drink)
+    assert metrics.PURCHASES.value("insufficient_funds") == before
+
+    metrics.enable()
+    try:
+        controller.dispense(drink)
+    finally:
+        metrics.disable()
+    assert metrics.PURCHASES.value("insufficient_funds") == before + 1
@@ -0,0 +1,50 @@
+from package.notice import ERROR, INFO, NoticeQueue
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_notices_keep_order_and_trim_oldest():
+    queue = NoticeQueue(limit=2, clock=FakeClock())
+    for message in ("a", "b", "c"):
+        queue.push("알림", message)
+
+    assert [notice.message for notice in queue.visible()] == ["b", "c"]
+
+
+def test_zero_limit_keeps_no_notices():
+    queue = NoticeQueue(limit=0, clock=FakeClock())
+    queue.push("알림", "a")
+
+    assert len(queue) == 0
+
+
+def test_repeated_notice_moves_to_end_and_extends():
+    clock = FakeClock()
+    queue = NoticeQueue(ttl={INFO: 3.0, ERROR: 8.0}, clock=clock)
+    queue.push("알림", "a")
+    queue.push("알림", "b")
+    clock.now = 2.0
+    repeated = queue.push("알림", "a")
+
+    assert [notice.message for notice in queue.visible()] == ["b", "a"]
+    assert (repeated.count, repeated.expires) == (2, 5.0)
+    assert repeated.text() == "[알림] a (x2)"
+
+
+def test_expire_drops_notices_by_level_ttl():
+    clock = FakeClock()
+    queue = NoticeQueue(ttl={INFO: 3.0, ERROR: 8.0}, clock=clock)
+    queue.push("알림", "info")
+    queue.push("오류", "error", ERROR)
+
+    assert queue.next_expiry() == 3.0
+    assert not queue.expire(2.9)
+    assert queue.expire(3.0)
+    assert [notice.message for notice in queue.visible()] == ["error"]
+    assert queue.next_expiry() == 8.0
@@ -0,0 +1,58 @@
+import json
+import time
+
+import pytest
+
+from package.profiling import CPROFILE, ENV_DIRECTORY, ENV_MODE, SessionProfiler
+
+
+class Callbacks:
+    def select_drink(self, slot):
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return slot
+
+
+def test_profiler_is_off_without_environment(monkeypatch):
+    monkeypatch.delenv(ENV_DIRECTORY, raising=False)
+
+    assert SessionProfiler.from_env() is None
+
+
+def test_profiler_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv(ENV_DIRECTORY, str(tmp_path / "profiles"))
+    monkeypatch.setenv(ENV_MODE, CPROFILE)
+
+    profiler = SessionProfiler.from_env()
+
+    assert profiler.mode == CPROFILE
+    assert (tmp_path / "profiles").is_dir()
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SessionProfiler(str(tmp_path), mode="trace")
+
+
+def test_sampled_session_records_callbacks(tmp_path):
+    profiler = SessionProfiler(str(tmp_path), interval=0.001)
+    callbacks = Callbacks()
+    profiler.instrument(callbacks, ["select_drink"])
+
+    assert profiler.run(lambda: [callbacks.select_drink(slot) for slot in range(2)]) == [0, 1]
+
+    summary = json.loads((tmp_path / (profiler.session + ".json")).read_text(encoding="utf-8"))
+    assert summary["callbacks"]["select_drink"]["calls"] == 2
+    assert summary["samples"] > 0
+    folded = (tmp_path / (profiler.session + ".folded")).read_text(encoding="utf-8")
+    assert folded.startswith("[select_drink];")
+
+
+def test_cprofile_session_writes_stats(tmp_path):
+    profiler = SessionProfiler(str(tmp_path), mode=CPROFILE)
+
+    profiler.run(lambda: Callbacks().select_drink(0))
+
+    assert (tmp_path / (profiler.session + ".prof")).exists()
+    assert not (tmp_path / (profiler.session + ".folded")).exists()
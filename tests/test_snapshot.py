@@ -0,0 +1,60 @@
+from package.card_index import SortedCardIndex, open_sorted_index, write_sorted_index
+from package.catalog import default_drinks
+from package.controller import Controller
+from package.snapshot import Snapshot
+
+
+def test_round_trip_keeps_slots_and_cash(tmp_path):
+    controller = Controller()
+    controller.extend_drinks(default_drinks(30, stock=4))
+    controller.input_cash({500: 2})
+    path = str(tmp_path / "machine.snap")
+    Snapshot.save(controller, path)
+
+    with Snapshot.load(path) as snapshot:
+        clone = snapshot.clone()
+
+    assert [d.to_drink() for d in clone.drinks] == [d.to_drink() for d in controller.drinks]
+    assert clone.cashes == controller.cashes
+    assert clone.inserted_cash == controller.inserted_cash
+
+
+def test_restore_keeps_sorted_deny_index(tmp_path):
+    denied_path = str(tmp_path / "denied.idx")
+    write_sorted_index(["A1B2C3D4E5"], denied_path)
+    source = Controller()
+    source.extend_drinks(default_drinks(4))
+    source.card.denied = open_sorted_index(denied_path)
+    snapshot = Snapshot.of(source)
+    # 허용 목록은 집합이라 기록되고, 파일에 있는 차단 목록은 기록되지 않는다
+    assert snapshot.allowed == 3 and snapshot.denied is None
+
+    target = Controller()
+    target.card.denied = open_sorted_index(denied_path)
+    snapshot.restore(target)
+
+    assert isinstance(target.card.allowed, SortedCardIndex)
+    assert not target.insert_card("A1B2C3D4E5")
+    assert target.insert_card("ABCDE12345")
+
+
+def test_card_lists_are_mapped_from_the_file(tmp_path):
+    denied_path = str(tmp_path / "denied.idx")
+    write_sorted_index(["A1B2C3D4E5"], denied_path)
+    source = Controller()
+    source.card.denied = open_sorted_index(denied_path)
+    source.deny_card("12345ABCDE")
+    path = str(tmp_path / "machine.snap")
+    Snapshot.save(source, path)
+
+    with Snapshot.load(path) as snapshot:
+        first, second = snapshot.clone(), snapshot.clone()
+
+    # 매핑은 스냅샷을 닫은 뒤에도 유효하고, 복제본끼리 같은 인덱스를 쓴다
+    assert first.card.allowed is second.card.allowed
+    assert first.insert_card("ABCDE12345")
+    # 실행 중 차단한 번호는 기록되었다가 다시 얹히고, 파일 차단 목록은 복제본에 없다
+    assert not first.insert_card("12345ABCDE")
+    assert first.insert_card("A1B2C3D4E5")
+    first.deny_card("ABCDE12345")
+    assert second.insert_card("ABCDE12345")
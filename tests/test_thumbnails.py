@@ -0,0 +1,42 @@
+from package.thumbnails import ThumbnailStore
+
+
+def test_saved_thumbnails_reload_by_source_and_size(tmp_path):
+    source = tmp_path / "water.png"
+    source.write_bytes(b"original")
+    path = str(tmp_path / "thumbnails.pack")
+    store = ThumbnailStore(path)
+    store.put(str(source), (70, 70), b"large")
+    store.put(str(source), (15, 15), b"small")
+
+    assert store.save()
+    assert not store.save()
+
+    loaded = ThumbnailStore(path)
+    assert len(loaded) == 2
+    assert loaded.get(str(source), (70, 70)) == b"large"
+    assert loaded.get(str(source), (15, 15)) == b"small"
+    assert loaded.get(str(source), (40, 40)) is None
+
+
+def test_changed_source_misses(tmp_path):
+    source = tmp_path / "water.png"
+    source.write_bytes(b"original")
+    store = ThumbnailStore(str(tmp_path / "thumbnails.pack"))
+    store.put(str(source), (70, 70), b"large")
+
+    source.write_bytes(b"edited image")
+
+    assert store.get(str(source), (70, 70)) is None
+
+
+def test_truncated_pack_starts_empty(tmp_path):
+    source = tmp_path / "water.png"
+    source.write_bytes(b"original")
+    path = tmp_path / "thumbnails.pack"
+    store = ThumbnailStore(str(path))
+    store.put(str(source), (70, 70), b"large")
+    store.save()
+    path.write_bytes(path.read_bytes()[:-2])
+
+    assert len(ThumbnailStore(str(path))) == 0
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.run import compare, count_purchase_widgets, virtual_display
+from package.catalog import default_drinks
+
+
+@pytest.fixture
+def machine():
+    tk = pytest.importorskip("tkinter")
+    from package.machine import Machine
+
+    with virtual_display() as display:
+        if not display:
+            pytest.skip("화면이 없음 (Xvfb 또는 DISPLAY 필요)")
+        root = tk.Tk(screenName=display)
+        try:
+            machine = Machine(root)
+            machine.controller.extend_drinks(default_drinks(24, stock=10**9))
+            machine.refresh_gui()
+            root.update()
+            yield machine
+        finally:
+            root.destroy()
+
+
+def test_purchases_create_no_widgets(machine):
+    assert count_purchase_widgets(machine, 1000) == 0
+
+
+def test_compare_flags_increase_over_zero_baseline():
+    assert compare({"widgets": 1.0}, {"widgets": 0.0}, 0.25)
+    assert not compare({"widgets": 0.0}, {"widgets": 0.0}, 0.25)
+
+
+def test_coins_are_inserted_in_one_batch(machine):
+    for currency in (100, 100, 500):
+        machine.accept_coin(currency)
+
+    assert machine.controller.inserted_cash == 0
+    assert machine.flush_coins() == 700
+    assert machine.controller.inserted_cash == 700
+    assert machine.flush_coins() == 0
+
+
+def test_pages_cover_every_slot(machine):
+    machine.controller.extend_drinks(default_drinks(6, stock=1))
+    assert machine.page_count() == 2
+
+    machine.show_page(5)
+
+    assert machine.page == 1
+    assert machine.visible_slots() == range(24, 30)
+
+
+def test_machine_registers_no_global_metrics(machine):
+    from package import metrics
+
+    # 전역 지표가 화면을 닫은 Machine을 붙잡지 않아야 한다
+    assert not any(metric.name.startswith("vending_image_cache") for metric in metrics.REGISTRY.collect())